@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Reasoning Loop Worker Benchmark
+Times plan generation over a synthetic backlog for increasing --workers counts
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'skills'))
+sys.path.append(str(Path(__file__).parent))
+from reasoning_loop import run_reasoning_loop
+from synthetic_vault import generate_vault, parse_count
+
+
+def time_run(vault_path: Path, workers: int) -> float:
+    """Time one full planning run (registry and plans reset first)"""
+    shutil.rmtree(vault_path / 'Plans', ignore_errors=True)
+    shutil.rmtree(vault_path / '.state', ignore_errors=True)
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        stats = run_reasoning_loop(vault_path, workers=workers)
+    elapsed = time.perf_counter() - start
+    assert stats['created'] == stats['found'], stats
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark reasoning_loop --workers scaling')
+    parser.add_argument('--items', type=parse_count, default=5000, help='Synthetic backlog size')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault_path = Path(tmp)
+        third = args.items // 3
+        generate_vault(vault_path, emails=third, files=third, posts=args.items - 2 * third)
+
+        print(f"Reasoning loop: {args.items} items, cores available: {os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>9} {'items/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts:
+            elapsed = time_run(vault_path, workers)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.3f} {args.items / elapsed:>10.0f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
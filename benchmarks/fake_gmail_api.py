@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Fake Gmail API - Local stand-in for users.messages.send
+Accepts the same JSON requests as the real endpoint, decodes and parses
+each raw MIME message, and answers like Gmail does. Point the reply
+handler at it to test the API backend without a Google account:
+
+    python3 benchmarks/fake_gmail_api.py --port 8765
+    python3 skills/gmail_reply_handler.py --backend gmail-api --endpoint http://127.0.0.1:8765
+"""
+
+import json
+import base64
+import argparse
+import threading
+from email import message_from_bytes
+from email.policy import default as default_policy
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SEND_PATH = '/gmail/v1/users/me/messages/send'
+
+
+class FakeGmailApi(ThreadingHTTPServer):
+    """
+    Server keeping every accepted message in .messages.
+
+    fail_first answers the first N sends with 503 (to exercise retries);
+    .connections counts TCP connections, so tests can check reuse.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, fail_first: int = 0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.messages = []
+        self.connections = 0
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def endpoint(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.split('?')[0] != SEND_PATH:
+            self._reply(404, {'error': {'code': 404, 'message': 'Not found'}})
+            return
+
+        with self.server.lock:
+            if self.server.fail_first > 0:
+                self.server.fail_first -= 1
+                self._reply(503, {'error': {'code': 503, 'message': 'Backend Error'}})
+                return
+
+        try:
+            request = json.loads(body)
+            raw = base64.urlsafe_b64decode(request['raw'])
+            message = message_from_bytes(raw, policy=default_policy)
+        except (ValueError, KeyError) as e:
+            self._reply(400, {'error': {'code': 400, 'message': f'Invalid request: {e}'}})
+            return
+        if not message['To']:
+            self._reply(400, {'error': {'code': 400, 'message': 'Recipient address required'}})
+            return
+
+        with self.server.lock:
+            message_id = f'{len(self.server.messages) + 1:016x}'
+            thread_id = request.get('threadId') or message_id
+            self.server.messages.append({'id': message_id, 'threadId': thread_id, 'message': message})
+        self._reply(200, {'id': message_id, 'threadId': thread_id, 'labelIds': ['SENT']})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local fake Gmail API send endpoint')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-first', type=int, default=0, help='Answer the first N sends with 503')
+    args = parser.parse_args()
+
+    server = FakeGmailApi(args.port, fail_first=args.fail_first)
+    print(f"Fake Gmail API on {server.endpoint} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{len(server.messages)} message(s) received over {server.connections} connection(s)")
+
+
+if __name__ == '__main__':
+    main()
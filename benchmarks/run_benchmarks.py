@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Skill Benchmark Suite - Times every skill and watcher ingest path on a synthetic vault
+Writes machine-readable JSON results and compares them against a stored baseline
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+from datetime import datetime
+
+BENCH_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCH_DIR.parent
+sys.path.append(str(PROJECT_ROOT / 'skills'))
+sys.path.append(str(PROJECT_ROOT / 'watchers'))
+sys.path.append(str(BENCH_DIR))
+
+from synthetic_vault import generate_vault, parse_count, SUBJECTS, PHRASES, SENDERS
+
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+
+
+class FakeGmailService:
+    """Stands in for the Gmail API: serves synthetic messages from memory"""
+
+    def __init__(self, count: int):
+        self.messages = [{'id': f'synthetic{i:08x}'} for i in range(count)]
+
+    def list_messages(self, query: str = ''):
+        return self.messages
+
+    def get_message(self, message_id: str):
+        return {
+            'id': message_id,
+            'snippet': 'Following up on our conversation, can we schedule a call?',
+            'payload': {'headers': [
+                {'name': 'From', 'value': f'client-{message_id}@example.com'},
+                {'name': 'Subject', 'value': f'Project update {message_id}'},
+            ]}
+        }
+
+
+def bench_reasoning_loop(vault_path: Path, args) -> int:
+    from reasoning_loop import run_reasoning_loop
+    return run_reasoning_loop(vault_path, workers=args.workers)['found']
+
+
+def bench_reasoning_loop_incremental(vault_path: Path, args) -> int:
+    """Second run over an unchanged queue (plan registry warm)"""
+    from reasoning_loop import run_reasoning_loop
+    with quiet():
+        run_reasoning_loop(vault_path, workers=args.workers)
+    return timed_section(lambda: run_reasoning_loop(vault_path, workers=args.workers)['found'])
+
+
+def bench_process_needs_action(vault_path: Path, args) -> int:
+    from process_needs_action import process_needs_action
+    count = count_files(vault_path / 'Needs_Action')
+    process_needs_action(str(vault_path))
+    return count
+
+
+def bench_read_vault_status(vault_path: Path, args) -> int:
+    from read_vault_status import read_vault_status
+    read_vault_status(str(vault_path))
+    return count_files(vault_path / 'Needs_Action')
+
+
+def bench_status_snapshot(vault_path: Path, args) -> int:
+    """Cached --json/--env snapshot polled again with no folder changes"""
+    from vault_status import StatusSnapshot, STATUS_FOLDERS
+    # Backdate folders past the coarse-mtime guard, as on a vault at rest
+    for name in STATUS_FOLDERS:
+        folder = vault_path / name
+        if folder.exists():
+            os.utime(folder, (time.time() - 60, time.time() - 60))
+    StatusSnapshot(vault_path).refresh()
+    return timed_section(
+        lambda: StatusSnapshot(vault_path).refresh()['folders']['Needs_Action']['count'])
+
+
+def bench_reply_retrieval(vault_path: Path, args) -> int:
+    """Top-3 similar-reply queries against the sent-reply index (index build not timed)"""
+    from reply_retrieval import ReplyIndex
+    index = ReplyIndex(vault_path)
+    index.refresh()
+    index.query(['warm up'], 3)
+    texts = [f"{subject} {phrase}" for subject, phrase in zip(SUBJECTS * 13, PHRASES * 13)][:100]
+    return timed_section(lambda: len(index.query(texts, 3)))
+
+
+def bench_email_drafter(vault_path: Path, args) -> int:
+    from email_drafter import EmailDrafter
+    count = sum(1 for f in os.scandir(vault_path / 'Needs_Action') if f.name.startswith('EMAIL_'))
+    EmailDrafter(str(vault_path)).process_emails()
+    return count
+
+
+def bench_filesystem_watcher(vault_path: Path, args) -> int:
+    from filesystem_watcher import FileSystemWatcher
+    watcher = FileSystemWatcher(str(vault_path), str(vault_path / 'Inbox'), check_interval=0)
+    watcher.logger.setLevel(logging.WARNING)
+    items = watcher.check_for_updates()
+    for item in items:
+        watcher.create_action_file(item)
+    return len(items)
+
+
+def bench_gmail_watcher(vault_path: Path, args) -> int:
+    from gmail_watcher import GmailWatcher
+    watcher = GmailWatcher(str(vault_path), credentials_path=str(vault_path / 'missing.json'))
+    watcher.logger.setLevel(logging.WARNING)
+    watcher.service = FakeGmailService(args.gmail_messages)
+    watcher.processed_ids = set()
+    watcher.state_file = vault_path / '.gmail_watcher_state.json'
+    items = watcher.check_for_updates()
+    watcher.process_items(items)
+    return len(items)
+
+
+def bench_email_triage(vault_path: Path, args) -> int:
+    """Scoring --gmail-messages emails in one batch (model trained on 2k synthetic labels)"""
+    import random
+    from email_triage import EmailTriage
+    rng = random.Random(args.seed)
+    examples = [(f"{rng.choice(SENDERS)}{i % 50}@example.com", rng.choice(SUBJECTS),
+                 rng.choice(PHRASES), rng.randint(0, 1)) for i in range(2000)]
+    model = EmailTriage.fit(examples)
+    emails = [(f"{rng.choice(SENDERS)}{i % 50}@example.com", f"{rng.choice(SUBJECTS)} {i}",
+               f"{rng.choice(PHRASES)}. {rng.choice(PHRASES)}") for i in range(args.gmail_messages)]
+    return timed_section(lambda: len(model.triage(emails)))
+
+
+def bench_post_dedup(vault_path: Path, args) -> int:
+    """1000 near-duplicate checks against an index of --posts past posts (index build not timed)"""
+    import random
+    from post_dedup import PostIndex
+    rng = random.Random(args.seed)
+    index = PostIndex(vault_path)
+    for i in range(args.posts):
+        index.add(f"LINKEDIN_POST_{i:08d}", ' '.join(f"{rng.choice(SUBJECTS)} {rng.choice(PHRASES)}."
+                                                     for _ in range(8)))
+    drafts = [' '.join(f"{rng.choice(SUBJECTS)} {rng.choice(PHRASES)}." for _ in range(8))
+              for _ in range(1000)]
+    return timed_section(lambda: sum(1 for draft in drafts if index.check(draft) is not None))
+
+
+def write_approved_replies(vault_path: Path, count: int, seed: int):
+    """count approved EMAIL_REPLY_ drafts in the layout email_drafter writes"""
+    import random
+    rng = random.Random(seed)
+    approved = vault_path / 'Approved'
+    approved.mkdir(exist_ok=True)
+    for i in range(count):
+        (approved / f'EMAIL_REPLY_{i:08d}.md').write_text(f"""---
+type: email_reply
+to: {rng.choice(SENDERS)}{i}@example.com
+subject: Re: {rng.choice(SUBJECTS)}
+thread_id: thread{i:08x}
+in_reply_to: <msg{i:08x}@mail.example.com>
+references: <msg{i:08x}@mail.example.com>
+---
+
+# Email Reply Draft
+
+## Draft Reply
+
+{rng.choice(PHRASES)}. {rng.choice(PHRASES)}.
+
+Best regards
+""", encoding='utf-8')
+
+
+def bench_gmail_api_send(vault_path: Path, args) -> int:
+    """Sending --emails approved replies through the Gmail API backend (local fake API)"""
+    from fake_gmail_api import FakeGmailApi
+    from gmail_api_sender import GmailApiSender
+    from gmail_reply_handler import GmailReplyHandler
+    write_approved_replies(vault_path, args.emails, args.seed)
+    server = FakeGmailApi().start()
+    try:
+        handler = GmailReplyHandler(str(vault_path), backend=GmailApiSender(server.endpoint))
+        timed_section(lambda: handler.process_approved_emails(batch_size=args.emails,
+                                                              rate_per_minute=float('inf')))
+        return len(server.messages)
+    finally:
+        server.stop()
+
+
+def bench_smtp_send(vault_path: Path, args) -> int:
+    """Sending --emails approved replies through the SMTP backend (local sink, one connection)"""
+    from smtp_sink import SmtpSink
+    from smtp_sender import SmtpSender
+    from gmail_reply_handler import GmailReplyHandler
+    write_approved_replies(vault_path, args.emails, args.seed)
+    server = SmtpSink().start()
+    try:
+        handler = GmailReplyHandler(str(vault_path), backend=SmtpSender(server.settings()))
+        timed_section(lambda: handler.process_approved_emails(batch_size=args.emails,
+                                                              rate_per_minute=float('inf')))
+        return len(server.messages)
+    finally:
+        server.stop()
+
+
+def bench_smtp_send_pooled(vault_path: Path, args) -> int:
+    """SmtpSender.send_many of --emails replies over a pool of 4 connections (no vault I/O)"""
+    import random
+    from smtp_sink import SmtpSink
+    from smtp_sender import SmtpSender
+    rng = random.Random(args.seed)
+    batch = [{'to': f"{rng.choice(SENDERS)}{i}@example.com", 'subject': f"Re: {rng.choice(SUBJECTS)}",
+              'body': f"{rng.choice(PHRASES)}.\n\nBest regards", 'in_reply_to': f"<msg{i:08x}@example.com>"}
+             for i in range(args.emails)]
+    server = SmtpSink().start()
+    try:
+        sender = SmtpSender(server.settings(), pool_size=4)
+        timed_section(lambda: sender.send_many(batch))
+        sender.close()
+        return len(server.messages)
+    finally:
+        server.stop()
+
+
+# name -> (function, synthetic vault contents needed)
+BENCHMARKS = {
+    'reasoning_loop': (bench_reasoning_loop, ('emails', 'files', 'posts')),
+    'reasoning_loop_incremental': (bench_reasoning_loop_incremental, ('emails', 'files', 'posts')),
+    'process_needs_action': (bench_process_needs_action, ('emails', 'files', 'posts')),
+    'read_vault_status': (bench_read_vault_status, ('emails', 'files', 'posts')),
+    'status_snapshot_cached': (bench_status_snapshot, ('emails', 'files', 'posts')),
+    'email_drafter': (bench_email_drafter, ('emails',)),
+    'reply_retrieval_query': (bench_reply_retrieval, ('sent_replies',)),
+    'filesystem_watcher_ingest': (bench_filesystem_watcher, ('inbox_files',)),
+    'gmail_watcher_ingest': (bench_gmail_watcher, ()),
+    'email_triage_score': (bench_email_triage, ()),
+    'post_dedup_check': (bench_post_dedup, ()),
+    'gmail_api_send': (bench_gmail_api_send, ()),
+    'smtp_send': (bench_smtp_send, ()),
+    'smtp_send_pooled': (bench_smtp_send_pooled, ()),
+}
+
+_section_time = None
+
+
+def timed_section(fn):
+    """Time only part of a benchmark (overrides the whole-function timing)"""
+    global _section_time
+    start = time.perf_counter()
+    with quiet():
+        result = fn()
+    _section_time = time.perf_counter() - start
+    return result
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence skill output while timing"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def count_files(folder: Path) -> int:
+    with os.scandir(folder) as entries:
+        return sum(1 for _ in entries)
+
+
+def run_benchmark(name: str, args) -> dict:
+    """Generate a fresh vault, run one benchmark and time it"""
+    global _section_time
+    fn, needs = BENCHMARKS[name]
+    counts = {key: getattr(args, key) if key in needs else 0
+              for key in ('emails', 'files', 'posts', 'inbox_files', 'sent_replies')}
+
+    with tempfile.TemporaryDirectory(prefix='ai_employee_bench_') as tmp:
+        vault_path = generate_vault(Path(tmp) / 'vault', seed=args.seed, **counts)
+        _section_time = None
+        start = time.perf_counter()
+        with quiet():
+            items = fn(vault_path, args)
+        elapsed = _section_time if _section_time is not None else time.perf_counter() - start
+
+    return {
+        'seconds': round(elapsed, 6),
+        'items': items,
+        'items_per_sec': round(items / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def scale_key(args) -> str:
+    """Identifies a benchmark scale, so baselines are only compared like for like"""
+    return (f"emails={args.emails},files={args.files},posts={args.posts},"
+            f"inbox={args.inbox_files},gmail={args.gmail_messages},sent={args.sent_replies}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return (name, ratio, status) rows comparing seconds with the baseline"""
+    rows = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get('seconds'):
+            rows.append((name, None, 'new'))
+            continue
+        ratio = result['seconds'] / base['seconds']
+        if ratio > 1 + tolerance:
+            status = 'REGRESSION'
+        elif ratio < 1 - tolerance:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, ratio, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AI Employee skills on a synthetic vault')
+    parser.add_argument('--emails', type=parse_count, default=1000)
+    parser.add_argument('--files', type=parse_count, default=1000)
+    parser.add_argument('--posts', type=parse_count, default=1000)
+    parser.add_argument('--inbox-files', type=parse_count, default=1000)
+    parser.add_argument('--gmail-messages', type=parse_count, default=1000)
+    parser.add_argument('--sent-replies', type=parse_count, default=1000)
+    parser.add_argument('--workers', type=int, default=1, help='reasoning_loop --workers')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Run a subset')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_output.json', help='Results JSON path')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON path')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the baseline for this scale')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown vs baseline before flagging (default: 0.25)')
+    args = parser.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    print(f"Benchmark scale: {scale_key(args)}\n")
+    print(f"{'benchmark':30} {'items':>9} {'seconds':>10} {'items/s':>11}")
+
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(name, args)
+        r = results[name]
+        print(f"{name:30} {r['items']:>9} {r['seconds']:>10.3f} {r['items_per_sec'] or 0:>11.0f}")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'scale': scale_key(args),
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\n✓ Results written to {args.output}")
+
+    baseline_path = Path(args.baseline)
+    baselines = json.loads(baseline_path.read_text(encoding='utf-8')) if baseline_path.exists() else {}
+
+    regressions = 0
+    if scale_key(args) in baselines:
+        print(f"\nComparison with baseline ({baseline_path.name}):")
+        for name, ratio, status in compare(results, baselines[scale_key(args)]['results'], args.tolerance):
+            ratio_text = f"{ratio:.2f}x" if ratio is not None else '-'
+            print(f"  {name:30} {ratio_text:>7}  {status}")
+            regressions += status == 'REGRESSION'
+    else:
+        print(f"\nNo baseline stored for this scale in {baseline_path}")
+
+    if args.save_baseline:
+        baselines[scale_key(args)] = report
+        baseline_path.write_text(json.dumps(baselines, indent=2) + '\n', encoding='utf-8')
+        print(f"✓ Baseline saved for this scale")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+SMTP Sink - Local SMTP server that accepts and keeps every message
+Stand-in for a real mail server when testing the SMTP send backend.
+Speaks enough ESMTP for smtplib (EHLO, PIPELINING, AUTH PLAIN/LOGIN,
+MAIL/RCPT/DATA, RSET, NOOP, QUIT) and can time idle connections out like
+real servers do:
+
+    python3 benchmarks/smtp_sink.py --port 8025
+    SMTP_HOST=127.0.0.1 SMTP_PORT=8025 SMTP_STARTTLS=false EMAIL_FROM=me@example.com \\
+        python3 skills/gmail_reply_handler.py --backend smtp
+"""
+
+import socket
+import argparse
+import threading
+import socketserver
+from email import message_from_bytes
+from email.policy import default as default_policy
+
+
+class SmtpSink(socketserver.ThreadingTCPServer):
+    """
+    Server keeping accepted messages in .messages as (envelope, message).
+
+    idle_timeout closes connections that sit idle that long with a 421,
+    reject_domain refuses recipients at that domain; .connections counts
+    TCP connections, so tests can check reuse.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0, idle_timeout: float = None, reject_domain: str = None):
+        super().__init__(('127.0.0.1', port), _SmtpHandler)
+        self.idle_timeout = idle_timeout
+        self.reject_domain = reject_domain
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def settings(self, sender: str = 'ai-employee@example.com') -> dict:
+        """SmtpSender settings pointing at this sink"""
+        return {'SMTP_HOST': '127.0.0.1', 'SMTP_PORT': str(self.port), 'SMTP_STARTTLS': 'false',
+                'EMAIL_FROM': sender}
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.connection.settimeout(self.server.idle_timeout)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        self.reply('220 localhost SMTP sink ready')
+        sender, recipients = None, []
+        while True:
+            try:
+                line = self.rfile.readline()
+            except socket.timeout:
+                self.reply('421 4.4.2 localhost Idle timeout, closing connection')
+                return
+            if not line:
+                return
+            command, _, argument = line.decode('utf-8', errors='replace').strip().partition(' ')
+            command = command.upper()
+
+            if command == 'EHLO':
+                self.wfile.write(b'250-localhost\r\n250-PIPELINING\r\n250-8BITMIME\r\n'
+                                 b'250-AUTH PLAIN LOGIN\r\n250 SMTPUTF8\r\n')
+            elif command == 'HELO':
+                self.reply('250 localhost')
+            elif command == 'AUTH':
+                if argument.upper().startswith('LOGIN'):
+                    # Username and password prompts (anything is accepted)
+                    for _ in range(2 - len(argument.split()[1:])):
+                        self.reply('334 VXNlcm5hbWU6')
+                        self.rfile.readline()
+                self.reply('235 2.7.0 Authentication successful')
+            elif command == 'MAIL':
+                sender, recipients = argument[5:].strip('<>'), []
+                self.reply('250 2.1.0 OK')
+            elif command == 'RCPT':
+                recipient = argument[3:].strip('<>')
+                if self.server.reject_domain and recipient.endswith('@' + self.server.reject_domain):
+                    self.reply('550 5.1.1 No such user')
+                else:
+                    recipients.append(recipient)
+                    self.reply('250 2.1.5 OK')
+            elif command == 'DATA':
+                if sender is None or not recipients:
+                    self.reply('554 5.5.1 No valid recipients')
+                    continue
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line == b'.\r\n':
+                        break
+                    lines.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                message = message_from_bytes(b''.join(lines), policy=default_policy)
+                with self.server.lock:
+                    self.server.messages.append(({'from': sender, 'to': recipients}, message))
+                    queued = len(self.server.messages)
+                sender, recipients = None, []
+                self.reply(f'250 2.0.0 OK queued as {queued:08x}')
+            elif command == 'RSET':
+                sender, recipients = None, []
+                self.reply('250 2.0.0 OK')
+            elif command == 'NOOP':
+                self.reply('250 2.0.0 OK')
+            elif command == 'QUIT':
+                self.reply('221 2.0.0 Bye')
+                return
+            else:
+                self.reply('502 5.5.2 Command not recognized')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local SMTP sink')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help='Close connections idle this many seconds (like real servers)')
+    args = parser.parse_args()
+
+    server = SmtpSink(args.port, idle_timeout=args.idle_timeout)
+    print(f"SMTP sink on 127.0.0.1:{server.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n{len(server.messages)} message(s) received over {server.connections} connection(s)")
+
+
+if __name__ == '__main__':
+    main()
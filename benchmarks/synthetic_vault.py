@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Synthetic Vault Generator - Builds AI Employee vaults of any size for benchmarks
+Writes EMAIL_, FILE_ and LINKEDIN_POST_ action items in the same format the
+watchers produce, plus optional Inbox drops and sent-reply history
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+
+VAULT_FOLDERS = ['Inbox', 'Needs_Action', 'Done', 'Plans', 'Pending_Approval',
+                 'Approved', 'Rejected', 'Logs']
+PRIORITIES = ['high', 'medium', 'medium', 'low']
+
+SUBJECTS = ['Project update', 'Invoice question', 'Meeting request', 'Proposal review',
+            'Contract renewal', 'Support ticket', 'Quarterly report', 'Partnership idea']
+SENDERS = ['client', 'billing', 'ops', 'ceo', 'support', 'partner', 'vendor', 'sales']
+PHRASES = ['please review the attached', 'can we schedule a call', 'the deadline is friday',
+           'following up on our conversation', 'thanks for the quick turnaround',
+           'we need an updated quote', 'the invoice is overdue', 'looking forward to working together']
+
+DASHBOARD = """# AI Employee Dashboard
+
+---
+last_updated: {date}
+status: active
+---
+
+## System Status
+- **AI Employee**: Active
+- **Watchers Running**: File System Watcher
+- **Pending Actions**: 0
+
+## Today's Summary
+- Tasks Completed: 0
+- Messages Processed: 0
+- Approvals Pending: 0
+
+## Recent Activity
+_No activity yet_
+
+## Quick Stats
+- **This Week**: 0 tasks completed
+- **This Month**: 0 tasks completed
+
+## Alerts
+_No alerts_
+
+---
+*Last updated by AI Employee*
+"""
+
+
+def _snippet(rng: random.Random, words: int = 3) -> str:
+    return '. '.join(rng.choice(PHRASES) for _ in range(words)).capitalize() + '.'
+
+
+def email_item(i: int, rng: random.Random, when: datetime) -> tuple:
+    """Action file in GmailWatcher format"""
+    subject = f"{rng.choice(SUBJECTS)} {i % 97}"
+    sender = f"{rng.choice(SENDERS)}{i % 50}@example.com"
+    content = f"""---
+type: email
+source: gmail
+from: {sender}
+subject: {subject}
+received: {when.isoformat()}
+priority: {rng.choice(PRIORITIES)}
+status: pending
+message_id: synthetic{i:08x}
+---
+
+## Email Content
+
+{_snippet(rng)}
+
+## Suggested Actions
+
+- [ ] Read and understand the email
+- [ ] Draft a reply if needed
+- [ ] Forward to relevant party if needed
+- [ ] Archive after processing
+
+## Notes
+
+This email was flagged as important. Review and take appropriate action.
+"""
+    safe_subject = subject.replace(' ', '_')
+    return f"EMAIL_{when.strftime('%Y%m%d_%H%M%S')}_{i:07d}_{safe_subject}.md", content
+
+
+def file_item(i: int, rng: random.Random, when: datetime) -> tuple:
+    """Action file in FileSystemWatcher format"""
+    size = rng.randint(1_000, 5_000_000)
+    content = f"""---
+type: file_drop
+original_name: document_{i}.pdf
+original_path: /synthetic/Inbox/document_{i}.pdf
+size_bytes: {size}
+size_kb: {size / 1024:.2f}
+detected: {when.isoformat()}
+status: pending
+priority: {rng.choice(PRIORITIES)}
+---
+
+## New File Detected
+
+A new file has been dropped into the Inbox folder and requires processing.
+
+### File Details
+- **Name**: document_{i}.pdf
+- **Size**: {size / 1024:.2f} KB
+- **Type**: .pdf
+
+---
+*Created by File System Watcher*
+"""
+    return f"FILE_{when.strftime('%Y%m%d_%H%M%S')}_{i:07d}_document.md", content
+
+
+def linkedin_item(i: int, rng: random.Random, when: datetime) -> tuple:
+    """Action file in LinkedInWatcher format"""
+    content = f"""---
+type: linkedin_post
+source: linkedin_watcher
+created: {when.isoformat()}
+priority: medium
+status: pending
+requires_approval: true
+---
+
+## LinkedIn Post Opportunity
+
+It's time to create a LinkedIn post to generate business and sales leads.
+"""
+    return f"LINKEDIN_POST_{when.strftime('%Y%m%d_%H%M%S')}_{i:07d}.md", content
+
+
+def sent_reply(i: int, rng: random.Random, when: datetime) -> tuple:
+    """Sent-reply execution log in Done, as written by the Gmail handlers"""
+    subject = f"Re: {rng.choice(SUBJECTS)} {i % 97}"
+    content = f"""---
+type: email_reply
+status: sent
+sent_at: {when.isoformat()}
+original_file: EMAIL_REPLY_{i:07d}.md
+to: {rng.choice(SENDERS)}{i % 50}@example.com
+subject: {subject}
+---
+
+# Email Reply Execution Log
+
+## Status
+✅ Successfully sent via Gmail
+
+## Content Sent
+Thank you for your email. {_snippet(rng, 4)}
+Best regards
+"""
+    return f"SENT_EMAIL_REPLY_{when.strftime('%Y%m%d_%H%M%S')}_{i:07d}.md", content
+
+
+def _write_all(folder: Path, factory, count: int, rng: random.Random, now: datetime, start: int = 0):
+    """Write `count` files produced by factory into folder"""
+    for i in range(start, start + count):
+        when = now - timedelta(minutes=rng.randint(0, 60 * 24 * 7))
+        name, content = factory(i, rng, when)
+        with open(folder / name, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def generate_vault(vault_path: Path, emails: int = 0, files: int = 0, posts: int = 0,
+                   inbox_files: int = 0, sent_replies: int = 0, seed: int = 42) -> Path:
+    """
+    Create a synthetic vault
+
+    Args:
+        vault_path: Where to create the vault (created if missing)
+        emails, files, posts: Needs_Action item counts per type
+        inbox_files: Raw files dropped in Inbox (filesystem watcher input)
+        sent_replies: SENT_EMAIL_REPLY_ history files in Done
+        seed: Random seed, so runs with the same counts are identical
+
+    Returns: vault_path
+    """
+    vault_path = Path(vault_path)
+    rng = random.Random(seed)
+    now = datetime.now()
+
+    for folder in VAULT_FOLDERS:
+        (vault_path / folder).mkdir(parents=True, exist_ok=True)
+
+    (vault_path / 'Dashboard.md').write_text(
+        DASHBOARD.format(date=now.strftime('%Y-%m-%d')), encoding='utf-8')
+    handbook = Path(__file__).parent.parent / 'AI_Employee_Vault' / 'Company_Handbook.md'
+    if handbook.exists():
+        (vault_path / 'Company_Handbook.md').write_text(
+            handbook.read_text(encoding='utf-8'), encoding='utf-8')
+
+    needs_action = vault_path / 'Needs_Action'
+    _write_all(needs_action, email_item, emails, rng, now)
+    _write_all(needs_action, file_item, files, rng, now, start=emails)
+    _write_all(needs_action, linkedin_item, posts, rng, now, start=emails + files)
+    _write_all(vault_path / 'Done', sent_reply, sent_replies, rng, now)
+
+    inbox = vault_path / 'Inbox'
+    for i in range(inbox_files):
+        with open(inbox / f'drop_{i:07d}.txt', 'w', encoding='utf-8') as f:
+            f.write(_snippet(rng, 2))
+
+    return vault_path
+
+
+def parse_count(value: str) -> int:
+    """Parse counts like 1000, 10k or 1M"""
+    value = value.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    if multiplier > 1:
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic AI Employee vault')
+    parser.add_argument('vault_path', help='Directory to create the vault in')
+    parser.add_argument('--emails', type=parse_count, default=1000)
+    parser.add_argument('--files', type=parse_count, default=1000)
+    parser.add_argument('--posts', type=parse_count, default=100)
+    parser.add_argument('--inbox-files', type=parse_count, default=0)
+    parser.add_argument('--sent-replies', type=parse_count, default=0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if Path(args.vault_path).exists() and any(Path(args.vault_path).iterdir()):
+        print(f"Error: {args.vault_path} exists and is not empty")
+        sys.exit(1)
+
+    generate_vault(Path(args.vault_path), args.emails, args.files, args.posts,
+                   args.inbox_files, args.sent_replies, args.seed)
+    print(f"✓ Synthetic vault created at {args.vault_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ echo "Installing systemd services..."
 # Copy service files
 sudo cp gmail-watcher.service /etc/systemd/system/
 sudo cp linkedin-watcher.service /etc/systemd/system/
+sudo cp reasoning-loop.service /etc/systemd/system/
 
 # Reload systemd
 sudo systemctl daemon-reload
@@ -13,10 +14,19 @@ sudo systemctl daemon-reload
 # Enable services to start on boot
 sudo systemctl enable gmail-watcher.service
 sudo systemctl enable linkedin-watcher.service
+sudo systemctl enable reasoning-loop.service
+
+# The reasoning-loop daemon replaces the */30 reasoning_loop.py cron job
+# (cron_schedule.txt); running both plans the same items twice
+if crontab -l 2>/dev/null | grep -q 'skills/reasoning_loop.py'; then
+    crontab -l | grep -v 'skills/reasoning_loop.py' | crontab -
+    echo "✓ Removed the reasoning_loop.py cron job (reasoning-loop.service replaces it)"
+fi
 
 # Start services
 sudo systemctl start gmail-watcher.service
 sudo systemctl start linkedin-watcher.service
+sudo systemctl start reasoning-loop.service
 
 echo ""
 echo "✓ Services installed and started!"
@@ -24,6 +34,7 @@ echo ""
 echo "Useful commands:"
 echo "  Status:  sudo systemctl status gmail-watcher"
 echo "  Status:  sudo systemctl status linkedin-watcher"
+echo "  Status:  sudo systemctl status reasoning-loop"
 echo "  Stop:    sudo systemctl stop gmail-watcher"
 echo "  Start:   sudo systemctl start gmail-watcher"
 echo "  Logs:    sudo journalctl -u gmail-watcher -f"
@@ -11,13 +11,31 @@ echo ""
 PROJECT_DIR="/mnt/c/Users/Admin/Documents/GitHub/Hackathon_0_Personal_AI_Employee_FTE"
 cd "$PROJECT_DIR"
 
+# Unattended mode (cron/systemd): ./orchestrator.sh --unattended, or UNATTENDED=1.
+# Moving a file to Approved/ is the approval; senders never prompt and only
+# run with a signed-in browser session. EMAIL_BACKEND picks how replies go
+# out: browser (default), gmail-api or smtp.
+if [ "$1" = "--unattended" ]; then
+    UNATTENDED=1
+fi
+UNATTENDED=${UNATTENDED:-0}
+EMAIL_BACKEND=${EMAIL_BACKEND:-browser}
+
+# Load queue sizes (VAULT_<FOLDER>, VAULT_<FOLDER>_<TYPE>) from the cached
+# status snapshot; only folders that changed since the last call are rescanned.
+# Previous values are cleared first: a type that has emptied is not printed
+load_vault_status() {
+    unset $(compgen -v VAULT_)
+    eval "$(./venv/bin/python3 skills/read_vault_status.py --env)"
+}
+
 # Function to process pending approvals
 process_approvals() {
     echo ""
     echo "🔍 Checking for pending approvals..."
 
     # Check Pending_Approval folder
-    PENDING_COUNT=$(ls -1 AI_Employee_Vault/Pending_Approval/*.md 2>/dev/null | wc -l)
+    PENDING_COUNT=${VAULT_PENDING_APPROVAL:-0}
     if [ $PENDING_COUNT -gt 0 ]; then
         echo "📋 Found $PENDING_COUNT item(s) pending approval"
         ls -lh AI_Employee_Vault/Pending_Approval/*.md
@@ -26,23 +44,33 @@ process_approvals() {
     fi
 
     # Check Approved folder
-    APPROVED_COUNT=$(ls -1 AI_Employee_Vault/Approved/*.md 2>/dev/null | wc -l)
+    APPROVED_COUNT=${VAULT_APPROVED:-0}
     if [ $APPROVED_COUNT -gt 0 ]; then
         echo ""
         echo "✅ Found $APPROVED_COUNT approved item(s) - processing..."
 
         # Process LinkedIn posts
-        LINKEDIN_COUNT=$(ls -1 AI_Employee_Vault/Approved/LINKEDIN_POST_*.md 2>/dev/null | wc -l)
+        LINKEDIN_COUNT=${VAULT_APPROVED_LINKEDIN_POST:-0}
         if [ $LINKEDIN_COUNT -gt 0 ]; then
             echo "📱 Processing LinkedIn posts..."
-            ./venv/bin/python3 skills/linkedin_poster.py
+            if [ "$UNATTENDED" = "1" ]; then
+                ./venv/bin/python3 skills/automated_linkedin_poster.py --unattended
+            else
+                ./venv/bin/python3 skills/linkedin_poster.py
+            fi
         fi
 
         # Process Email replies
-        EMAIL_COUNT=$(ls -1 AI_Employee_Vault/Approved/EMAIL_REPLY_*.md 2>/dev/null | wc -l)
+        EMAIL_COUNT=${VAULT_APPROVED_EMAIL_REPLY:-0}
         if [ $EMAIL_COUNT -gt 0 ]; then
             echo "📧 Processing email replies..."
-            ./venv/bin/python3 skills/gmail_reply_handler.py
+            if [ "$UNATTENDED" != "1" ]; then
+                ./venv/bin/python3 skills/gmail_reply_handler.py
+            elif [ "$EMAIL_BACKEND" = "browser" ]; then
+                ./venv/bin/python3 skills/automated_gmail_handler.py --unattended
+            else
+                ./venv/bin/python3 skills/gmail_reply_handler.py --backend "$EMAIL_BACKEND" --unattended
+            fi
         fi
     fi
 }
@@ -53,14 +81,14 @@ process_needs_action() {
     echo "🔍 Checking for action items..."
 
     # Check for emails
-    EMAIL_COUNT=$(ls -1 AI_Employee_Vault/Needs_Action/EMAIL_*.md 2>/dev/null | wc -l)
+    EMAIL_COUNT=${VAULT_NEEDS_ACTION_EMAIL:-0}
     if [ $EMAIL_COUNT -gt 0 ]; then
         echo "📧 Found $EMAIL_COUNT email(s) - drafting replies..."
         ./venv/bin/python3 skills/email_drafter.py
     fi
 
     # Check for LinkedIn opportunities
-    LINKEDIN_COUNT=$(ls -1 AI_Employee_Vault/Needs_Action/LINKEDIN_POST_*.md 2>/dev/null | wc -l)
+    LINKEDIN_COUNT=${VAULT_NEEDS_ACTION_LINKEDIN_POST:-0}
     if [ $LINKEDIN_COUNT -gt 0 ]; then
         echo "📱 Found $LINKEDIN_COUNT LinkedIn opportunity(ies) - drafting posts..."
         ./venv/bin/python3 skills/linkedin_drafter.py
@@ -68,6 +96,9 @@ process_needs_action() {
 }
 
 echo "Starting orchestrator..."
+if [ "$UNATTENDED" = "1" ]; then
+    echo "Mode: unattended (Approved/ = approval, email backend: $EMAIL_BACKEND)"
+fi
 echo "Press Ctrl+C to stop"
 echo ""
 
@@ -81,9 +112,11 @@ while true; do
     echo "=========================================="
 
     # Process action items
+    load_vault_status
     process_needs_action
 
-    # Process approvals
+    # Process approvals (drafting above may have added some)
+    load_vault_status
     process_approvals
 
     echo ""
@@ -6,16 +6,45 @@ Part of Silver Tier - Same experience as LinkedIn automation
 """
 
 import sys
+import argparse
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-import time
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+sys.path.insert(0, str(Path(__file__).parent))
+from browser_session import attach, check_signed_in, Pacing
+from send_queue import (SendQueue, SendError, UnconfirmedSend, print_summary, DEFAULT_BATCH_SIZE,
+                        DEFAULT_RATE_PER_MINUTE)
+from selector_cache import SelectorCache, SelectorNotFound
+
+# Candidate selectors per compose control, most specific first
+GMAIL_SELECTORS = {
+    'compose': ['div[role="button"]:has-text("Compose")', '.T-I.T-I-KE.L3', '[aria-label*="Compose"]'],
+    'to': ['input[name="to"]', 'textarea[name="to"]', 'input[aria-label*="To"]'],
+    'subject': ['input[name="subjectbox"]', 'input[aria-label*="Subject"]'],
+    'body': ['div[role="textbox"][aria-label*="Message"]',
+             'div[contenteditable="true"][aria-label*="Message"]'],
+    'send': ['div[role="button"]:has-text("Send")', '.T-I.J-J5-Ji.aoO.v7.T-I-atl.L3',
+             '[aria-label*="Send"]'],
+}
+COMPOSE_DIALOG = 'div[role="dialog"]'
 
 class AutomatedGmailHandler:
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, demo: bool = False, unattended: bool = False):
+        """
+        Args:
+            vault_path: Vault root
+            demo: Slow, paced automation for someone watching
+            unattended: No prompts: moving a reply to Approved/ is the
+                        approval, and a step that would need a person
+                        fails the send instead
+        """
         self.vault_path = Path(vault_path)
+        self.demo = demo
+        self.unattended = unattended
         self.approved_folder = self.vault_path / 'Approved'
         self.done_folder = self.vault_path / 'Done'
+        self.selectors = SelectorCache('gmail')
 
     def find_approved_emails(self):
         """Find approved email replies"""
@@ -59,9 +88,19 @@ class AutomatedGmailHandler:
         return {
             'to': frontmatter.get('to', ''),
             'subject': frontmatter.get('subject', 'Re: Your email'),
-            'body': '\n'.join(reply_content).strip()
+            'body': '\n'.join(reply_content).strip(),
+            'in_reply_to': frontmatter.get('in_reply_to', ''),
+            'references': frontmatter.get('references', '')
         }
 
+    def _manual_step(self, *lines):
+        """Have the user do a step by hand, or give up on this email when unattended"""
+        if self.unattended:
+            raise SendError(f"needs a manual step: {lines[0]}")
+        for line in lines:
+            print(line)
+        input()
+
     def send_email_automated(self, to: str, subject: str, body: str):
         """
         Automated Gmail sending with Playwright
@@ -76,313 +115,188 @@ class AutomatedGmailHandler:
         print(body)
         print("-" * 70)
 
-        try:
-            with sync_playwright() as p:
-                print("\n🚀 Launching Chromium browser...")
-
-                # Use persistent context to save login session
-                user_data_dir = Path(__file__).parent.parent / '.browser_data' / 'gmail'
-                user_data_dir.mkdir(parents=True, exist_ok=True)
+        pacing = Pacing(demo=self.demo, slow_mo=1000)  # Demo: slow down for visibility
 
-                print(f"📁 Using persistent browser profile: {user_data_dir}")
-                print("   (Your sign-in will be saved for next time)")
-
-                # Launch persistent context (saves cookies, login, etc.)
-                context = p.chromium.launch_persistent_context(
-                    str(user_data_dir),
-                    headless=False,
-                    slow_mo=1000,  # Slow down for visibility
-                    args=['--start-maximized']
-                )
+        try:
+            # Warm session from the browser session daemon if one is running,
+            # otherwise the persistent profile is launched for this email
+            with attach('gmail', slow_mo=pacing.slow_mo, headless=self.unattended) as session:
+                page = session.page
 
-                page = context.pages[0] if context.pages else context.new_page()
+                if session.warm:
+                    print("\n♻️  Using warm Gmail session (browser session daemon)")
+                else:
+                    print("\n🚀 Launched Chromium with persistent profile (.browser_data/gmail)")
+                    print("   (Your sign-in will be saved for next time)")
+                    print("   Tip: python3 skills/browser_session.py start gmail keeps it warm")
 
                 # Navigate to Gmail
                 print("📧 Opening Gmail...")
-                page.goto('https://mail.google.com/mail/u/0/#inbox', timeout=60000)
-
-                # Wait for user to sign in if needed
-                print("\n" + "="*70)
-                print("👤 SIGN IN TO GMAIL")
-                print("="*70)
-                print("If you see a sign-in page, please sign in now.")
-                print("Press ENTER after you see your Gmail inbox...")
-                print("="*70)
-                input()
+                with pacing.step('open gmail'):
+                    session.open_home()
+
+                if self.unattended:
+                    if not session.signed_in():
+                        raise SendError("Gmail is signed out - sign in once with an interactive run")
+                elif not (session.warm and session.signed_in()):
+                    # Wait for user to sign in if needed
+                    print("\n" + "="*70)
+                    print("👤 SIGN IN TO GMAIL")
+                    print("="*70)
+                    print("If you see a sign-in page, please sign in now.")
+                    print("Press ENTER after you see your Gmail inbox...")
+                    print("="*70)
+                    input()
 
-                print("\n✅ Signed in! Starting automation...")
-                time.sleep(3)
+                    print("\n✅ Signed in! Starting automation...")
+                    pacing.pause(3)
 
-                # Click Compose button
+                # Click Compose button (all candidate selectors raced, learned one preferred);
+                # the lookup itself waits for the inbox to render it
                 print("🤖 Clicking 'Compose' button...")
-                try:
-                    # Try multiple selectors for Compose button
-                    compose_clicked = False
-
-                    # Method 1: Text-based
+                with pacing.step('compose'):
                     try:
-                        page.click('div[role="button"]:has-text("Compose")', timeout=5000)
-                        compose_clicked = True
-                    except:
-                        pass
-
-                    # Method 2: Class-based (Gmail's compose button class)
-                    if not compose_clicked:
-                        try:
-                            page.click('.T-I.T-I-KE.L3', timeout=5000)
-                            compose_clicked = True
-                        except:
-                            pass
-
-                    # Method 3: Aria label
-                    if not compose_clicked:
-                        try:
-                            page.click('[aria-label*="Compose"]', timeout=5000)
-                            compose_clicked = True
-                        except:
-                            pass
-
-                    if not compose_clicked:
-                        print("⚠️  Could not find Compose button automatically")
-                        print("Please click 'Compose' manually, then press ENTER...")
-                        input()
-
-                except Exception as e:
-                    print(f"⚠️  Compose button error: {e}")
-                    print("Please click 'Compose' manually, then press ENTER...")
-                    input()
+                        self.selectors.locate(page, 'compose', GMAIL_SELECTORS['compose'],
+                                              timeout=15000).click()
+                        page.locator(COMPOSE_DIALOG).first.wait_for(state='attached', timeout=10000)
+                    except Exception as e:
+                        print(f"⚠️  Could not find Compose button automatically ({e})")
+                        self._manual_step("Please click 'Compose' manually, then press ENTER...")
 
-                time.sleep(3)
+                pacing.pause(3)
 
-                # Fill To field
+                # Fill To field (the lookup waits for the compose window)
                 print(f"🤖 Filling 'To' field: {to}")
-                try:
-                    # Wait for compose window to appear
-                    page.wait_for_selector('input[name="to"], textarea[name="to"], input[aria-label*="To"]', timeout=10000)
-
-                    # Try different selectors for To field
-                    to_filled = False
-
-                    # Method 1: name attribute
+                with pacing.step('to'):
                     try:
-                        page.fill('input[name="to"]', to, timeout=3000)
-                        to_filled = True
-                    except:
-                        pass
-
-                    # Method 2: textarea
-                    if not to_filled:
-                        try:
-                            page.fill('textarea[name="to"]', to, timeout=3000)
-                            to_filled = True
-                        except:
-                            pass
-
-                    # Method 3: aria-label
-                    if not to_filled:
-                        try:
-                            page.fill('input[aria-label*="To"]', to, timeout=3000)
-                            to_filled = True
-                        except:
-                            pass
-
-                    if not to_filled:
-                        print(f"⚠️  Could not auto-fill To field")
-                        print(f"Please type: {to}")
-                        print("Then press ENTER...")
-                        input()
-
-                    time.sleep(1)
-                    page.keyboard.press('Tab')
+                        self.selectors.locate(page, 'to', GMAIL_SELECTORS['to'], timeout=10000).fill(to)
+                        pacing.pause(1)
+                        page.keyboard.press('Tab')
 
-                except Exception as e:
-                    print(f"⚠️  To field error: {e}")
-                    print(f"Please type: {to}")
-                    print("Then press ENTER...")
-                    input()
+                    except Exception as e:
+                        print(f"⚠️  Could not auto-fill To field ({e})")
+                        self._manual_step(f"Please type: {to}", "Then press ENTER...")
 
                 # Fill Subject field
                 print(f"🤖 Filling 'Subject' field: {subject}")
-                try:
-                    subject_filled = False
-
-                    # Method 1: name attribute
+                with pacing.step('subject'):
                     try:
-                        page.fill('input[name="subjectbox"]', subject, timeout=3000)
-                        subject_filled = True
-                    except:
-                        pass
-
-                    # Method 2: aria-label
-                    if not subject_filled:
                         try:
-                            page.fill('input[aria-label*="Subject"]', subject, timeout=3000)
-                            subject_filled = True
-                        except:
-                            pass
-
-                    # Method 3: Just type it (we're already in subject field after Tab)
-                    if not subject_filled:
-                        page.keyboard.type(subject)
-                        subject_filled = True
-
-                    time.sleep(1)
-                    page.keyboard.press('Tab')
-
-                except Exception as e:
-                    print(f"⚠️  Subject field error: {e}")
-                    print(f"Please type: {subject}")
-                    print("Then press ENTER...")
-                    input()
+                            self.selectors.locate(page, 'subject', GMAIL_SELECTORS['subject'],
+                                                  timeout=3000).fill(subject)
+                        except SelectorNotFound:
+                            # Just type it (we're already in subject field after Tab)
+                            page.keyboard.type(subject)
+
+                        pacing.pause(1)
+                        page.keyboard.press('Tab')
+
+                    except Exception as e:
+                        print(f"⚠️  Subject field error: {e}")
+                        self._manual_step(f"Please type: {subject}", "Then press ENTER...")
 
                 # Fill Body
                 print("🤖 Filling email body...")
-                try:
-                    body_filled = False
-
-                    # Method 1: role=textbox
+                with pacing.step('body'):
                     try:
-                        page.fill('div[role="textbox"][aria-label*="Message"]', body, timeout=3000)
-                        body_filled = True
-                    except:
-                        pass
-
-                    # Method 2: contenteditable
-                    if not body_filled:
                         try:
-                            page.fill('div[contenteditable="true"][aria-label*="Message"]', body, timeout=3000)
-                            body_filled = True
-                        except:
-                            pass
-
-                    # Method 3: Just type it (we're in body after Tab)
-                    if not body_filled:
-                        page.keyboard.type(body)
-                        body_filled = True
-
-                    time.sleep(2)
-
-                except Exception as e:
-                    print(f"⚠️  Body field error: {e}")
-                    print("Please type the email body manually")
-                    print("Then press ENTER...")
-                    input()
+                            self.selectors.locate(page, 'body', GMAIL_SELECTORS['body'],
+                                                  timeout=3000).fill(body)
+                        except SelectorNotFound:
+                            # Just type it (we're in body after Tab)
+                            page.keyboard.type(body)
+
+                        pacing.pause(2)
 
-                # Final review before sending
+                    except Exception as e:
+                        print(f"⚠️  Body field error: {e}")
+                        self._manual_step("Please type the email body manually", "Then press ENTER...")
+
+                # Final review before sending (unattended: approved by the move to Approved/)
                 print("\n" + "="*70)
                 print("✅ EMAIL COMPOSED - READY TO SEND")
                 print("="*70)
-                print("Review the email in the browser window.")
-                print("Type 'SEND' to send, or 'CANCEL' to abort: ", end='')
-                approval = input().strip().upper()
+                if self.unattended:
+                    print("Approved in Approved/ - sending (unattended)")
+                    approval = 'SEND'
+                else:
+                    print("Review the email in the browser window.")
+                    print("Type 'SEND' to send, or 'CANCEL' to abort: ", end='')
+                    approval = input().strip().upper()
                 print("="*70)
 
                 if approval == 'SEND':
                     # Click Send button
                     print("\n🤖 Clicking 'Send' button...")
                     try:
-                        send_clicked = False
-
-                        # Method 1: Text-based
-                        try:
-                            page.click('div[role="button"]:has-text("Send")', timeout=5000)
-                            send_clicked = True
-                        except:
-                            pass
-
-                        # Method 2: Gmail's send button class
-                        if not send_clicked:
+                        with pacing.step('send'):
                             try:
-                                page.click('.T-I.J-J5-Ji.aoO.v7.T-I-atl.L3', timeout=5000)
-                                send_clicked = True
-                            except:
-                                pass
-
-                        # Method 3: Aria label
-                        if not send_clicked:
+                                self.selectors.locate(page, 'send', GMAIL_SELECTORS['send']).click()
+                            except SelectorNotFound:
+                                print("Using keyboard shortcut Ctrl+Enter...")
+                                page.keyboard.press('Control+Enter')
+
+                            pacing.pause(3)
+                            # Sent once the compose window closes; let the request
+                            # finish before a cold browser is closed
                             try:
-                                page.click('[aria-label*="Send"]', timeout=5000)
-                                send_clicked = True
-                            except:
-                                pass
-
-                        # Method 4: Keyboard shortcut
-                        if not send_clicked:
-                            print("Using keyboard shortcut Ctrl+Enter...")
-                            page.keyboard.press('Control+Enter')
-                            send_clicked = True
-
-                        time.sleep(3)
+                                page.locator(COMPOSE_DIALOG).first.wait_for(state='hidden', timeout=15000)
+                            except PlaywrightTimeout:
+                                if self.unattended:
+                                    raise UnconfirmedSend("compose window still open after Send")
+                                print("⚠️  Compose window still open - check that the email went out")
+                            pacing.settle(page)
                         print("\n✅ Email sent successfully!")
+                        self._print_timing(pacing)
+
+                        if not (session.warm or self.unattended):
+                            # Keep browser open for verification
+                            print("\n" + "="*70)
+                            print("✅ EMAIL SENT - Browser will stay open")
+                            print("="*70)
+                            print("You can verify the email was sent in Gmail.")
+                            print("Press ENTER to close browser and continue...")
+                            print("="*70)
+                            input()
 
-                        # Keep browser open for verification
-                        print("\n" + "="*70)
-                        print("✅ EMAIL SENT - Browser will stay open")
-                        print("="*70)
-                        print("You can verify the email was sent in Gmail.")
-                        print("Press ENTER to close browser and continue...")
-                        print("="*70)
-                        input()
-
-                        context.close()
                         return True
 
+                    except UnconfirmedSend:
+                        raise
                     except Exception as e:
                         print(f"⚠️  Send button error: {e}")
+                        if self.unattended:
+                            # Send may or may not have been clicked
+                            raise UnconfirmedSend(f"send step failed ({e})") from e
                         print("Please click 'Send' manually, then press ENTER...")
                         input()
-                        context.close()
                         return True
                 else:
                     print("\n❌ Email cancelled by user")
-                    context.close()
                     return False
 
+        except UnconfirmedSend:
+            raise
         except Exception as e:
             print(f"\n❌ Error: {e}")
             print("\nTroubleshooting:")
             print("1. Make sure Chromium is installed: playwright install chromium")
             print("2. Check your internet connection")
             print("3. Try running: ./install_browser_deps.sh")
-            return False
-
-    def process_approved_emails(self):
-        """Process ONE approved email reply (prevents infinite loops)"""
-        emails = self.find_approved_emails()
-
-        if not emails:
-            print("\n📭 No approved email replies found in Approved folder.")
-            print(f"   Looking in: {self.approved_folder}")
-            return
-
-        print(f"\n📋 Found {len(emails)} approved email(s) to send")
-        print("   Processing FIRST email only (to prevent loops)\n")
-
-        # Process only the FIRST email
-        email_file = emails[0]
+            raise SendError(str(e)) from e
 
-        print(f"{'='*70}")
-        print(f"Processing: {email_file.name}")
-        print(f"{'='*70}\n")
+    def _print_timing(self, pacing: Pacing):
+        print("\n⏱️  Step timing:")
+        for line in pacing.report_lines():
+            print(f"   {line}")
 
-        email_data = self.extract_email_data(email_file)
+    def send(self, email_data: dict) -> bool:
+        """Send one reply (SendQueue callback)"""
+        return self.send_email_automated(email_data['to'], email_data['subject'], email_data['body'])
 
-        if not email_data['to']:
-            print(f"⚠️  ERROR: No recipient email found")
-            return
-
-        if not email_data['body']:
-            print(f"⚠️  ERROR: No email body found")
-            return
-
-        success = self.send_email_automated(
-            email_data['to'],
-            email_data['subject'],
-            email_data['body']
-        )
-
-        if success:
-            log_content = f"""---
+    def log_sent(self, email_file: Path, email_data: dict, key: str) -> Path:
+        """Write the Done log for a sent reply and move the approval file to Done"""
+        log_content = f"""---
 type: email_reply
 status: sent
 sent_at: {datetime.now().isoformat()}
@@ -390,6 +304,7 @@ original_file: {email_file.name}
 to: {email_data['to']}
 subject: {email_data['subject']}
 method: browser_automation
+idempotency_key: {key}
 ---
 
 # Email Reply Execution Log
@@ -410,25 +325,66 @@ method: browser_automation
 - Browser: Chromium (Playwright)
 - User sign-in: Saved in persistent profile
 - Auto-compose: Yes
-- Auto-send: Yes (with HITL approval)
+- Auto-send: Yes ({'approved via Approved/ folder, unattended' if self.unattended else 'with HITL approval'})
 - Original file: {email_file.name}
 
 ---
 *Sent by AI Employee - Silver Tier Gmail Automation*
 """
 
-            log_file = self.done_folder / f'SENT_{email_file.name}'
-            log_file.write_text(log_content, encoding='utf-8')
+        log_file = self.done_folder / f'SENT_{email_file.name}'
+        log_file.write_text(log_content, encoding='utf-8')
+
+        done_file = self.done_folder / email_file.name
+        email_file.rename(done_file)
+
+        print(f"\n✅ Execution log saved: {log_file.name}")
+        print(f"✅ Original moved to Done: {done_file.name}")
+        print(f"\n{'='*70}\n")
+        return log_file
+
+    def process_approved_emails(self, batch_size: int = DEFAULT_BATCH_SIZE,
+                                rate_per_minute: float = DEFAULT_RATE_PER_MINUTE,
+                                retry_unconfirmed: bool = False):
+        """
+        Send approved email replies through the send queue.
+
+        At most batch_size emails per run, rate limited, each retried on
+        browser errors; idempotency keys in the Done logs make sure a reply
+        is never sent twice, so re-running cannot loop on the same email.
+        """
+        queue = SendQueue(self.vault_path, self.extract_email_data, self.send, self.log_sent,
+                          batch_size=batch_size, rate_per_minute=rate_per_minute,
+                          retry_unconfirmed=retry_unconfirmed)
+        emails = queue.pending()
+
+        if not emails:
+            print("\n📭 No approved email replies found in Approved folder.")
+            print(f"   Looking in: {self.approved_folder}")
+            return
+
+        if self.unattended:
+            # Session-validity precheck instead of the sign-in prompt
+            try:
+                signed_in = check_signed_in('gmail')
+            except Exception as e:
+                print(f"\n❌ Could not open the Gmail session: {e}")
+                return
+            if not signed_in:
+                print("\n❌ Gmail session is signed out - nothing sent.")
+                print("   Sign in once with an interactive run (or browser_session.py start gmail)")
+                return
+
+        print(f"\n📋 Found {len(emails)} approved email(s) to send")
+        print(f"   Sending up to {batch_size} this run ({rate_per_minute:g}/min)\n")
 
-            done_file = self.done_folder / email_file.name
-            email_file.rename(done_file)
+        print_summary(queue.run())
 
-            print(f"\n✅ Execution log saved: {log_file.name}")
-            print(f"✅ Original moved to Done: {done_file.name}")
-            print(f"\n{'='*70}\n")
-        else:
-            print(f"\n⚠️  Email not sent. File remains in Approved folder.")
-            print(f"{'='*70}\n")
+        report = self.selectors.report_lines()
+        if report:
+            print("\n🎯 Selector cache (gmail):")
+            for line in report:
+                print(f"   {line}")
 
 
 def main():
@@ -438,15 +394,33 @@ def main():
     print("Browser automation with Chromium (like LinkedIn)")
     print("="*70)
 
-    vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
+    parser = argparse.ArgumentParser(description='Send approved email replies through Gmail in the browser')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Most emails to send per run (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_PER_MINUTE,
+                        help=f'Most sends per minute (default: {DEFAULT_RATE_PER_MINUTE})')
+    parser.add_argument('--retry-unconfirmed', action='store_true',
+                        help='Send emails whose earlier send was interrupted (check Sent first)')
+    parser.add_argument('--demo', action='store_true',
+                        help='Slow, paced automation for demos (default waits only on the page)')
+    parser.add_argument('--unattended', action='store_true',
+                        help='No prompts (cron/systemd): Approved/ is the approval, signed-in session required')
+    args = parser.parse_args()
+    if args.demo and args.unattended:
+        parser.error('--demo and --unattended cannot be combined')
+
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
 
     if not vault_path.exists():
         print(f"\n❌ ERROR: Vault not found at {vault_path}")
         sys.exit(1)
 
     try:
-        handler = AutomatedGmailHandler(str(vault_path))
-        handler.process_approved_emails()
+        handler = AutomatedGmailHandler(str(vault_path), demo=args.demo, unattended=args.unattended)
+        handler.process_approved_emails(batch_size=args.batch_size, rate_per_minute=args.rate,
+                                        retry_unconfirmed=args.retry_unconfirmed)
 
         print("\n" + "="*70)
         print("✅ AUTOMATED GMAIL HANDLER COMPLETE")
@@ -5,20 +5,39 @@ Only manual steps: Sign-in and final approval
 """
 
 import sys
+import argparse
+import contextlib
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import sync_playwright
-import time
+
+sys.path.insert(0, str(Path(__file__).parent))
+from post_schedule import due_posts
+from send_queue import UnconfirmedSend
+from browser_session import attach, check_signed_in, Pacing, PlaywrightTimeout
+from selector_cache import SelectorCache, SelectorNotFound
+
+# Candidate selectors per post control, most specific first
+LINKEDIN_SELECTORS = {
+    'start_post': ['button:has-text("Start a post")', '[aria-label*="Start a post"]'],
+    'editor': ['div[role="textbox"]', 'div[contenteditable="true"]'],
+    'post': ['button:has-text("Post"):not(:has-text("Start"))', 'button.share-actions__primary-action',
+             'button[type="submit"]'],
+}
+SHARE_DIALOG = 'div[role="dialog"]'
 
 class AutomatedLinkedInPoster:
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, demo: bool = False, unattended: bool = False):
         self.vault_path = Path(vault_path)
+        self.demo = demo
+        self.unattended = unattended  # No prompts: the move to Approved/ is the approval
         self.approved_folder = self.vault_path / 'Approved'
         self.done_folder = self.vault_path / 'Done'
+        self.pending_approval = self.vault_path / 'Pending_Approval'
+        self.selectors = SelectorCache('linkedin')
 
     def find_approved_posts(self):
-        """Find approved LinkedIn posts"""
-        return list(self.approved_folder.glob('LINKEDIN_POST_*.md'))
+        """Find approved LinkedIn posts that are due (scheduled ones wait for their slot)"""
+        return due_posts(self.approved_folder)
 
     def extract_post_content(self, filepath: Path):
         """Extract clean post content"""
@@ -45,6 +64,9 @@ class AutomatedLinkedInPoster:
         """
         Automated LinkedIn posting with Playwright
         Uses persistent context to save sign-in
+
+        Raises UnconfirmedSend when Post was clicked but the share dialog
+        never closed (or the step failed), so the post may be live
         """
         print("\n" + "="*70)
         print("AUTOMATED LINKEDIN POSTING")
@@ -54,114 +76,127 @@ class AutomatedLinkedInPoster:
         print(content)
         print("-" * 70)
 
-        try:
-            with sync_playwright() as p:
-                print("\n🚀 Launching browser...")
-
-                # Use persistent context to save login session
-                user_data_dir = Path(__file__).parent.parent / '.browser_data' / 'linkedin'
-                user_data_dir.mkdir(parents=True, exist_ok=True)
-
-                print(f"📁 Using persistent browser profile: {user_data_dir}")
-                print("   (Your sign-in will be saved for next time)")
+        pacing = Pacing(demo=self.demo, slow_mo=500)
 
-                # Launch persistent context (saves cookies, login, etc.)
-                context = p.chromium.launch_persistent_context(
-                    str(user_data_dir),
-                    headless=False,
-                    slow_mo=500,
-                    args=['--start-maximized']
-                )
+        try:
+            # Warm session from the browser session daemon if one is running,
+            # otherwise the persistent profile is launched for this post
+            with attach('linkedin', slow_mo=pacing.slow_mo, headless=self.unattended) as session:
+                page = session.page
 
-                page = context.pages[0] if context.pages else context.new_page()
+                if session.warm:
+                    print("\n♻️  Using warm LinkedIn session (browser session daemon)")
+                else:
+                    print("\n🚀 Launched browser with persistent profile (.browser_data/linkedin)")
+                    print("   (Your sign-in will be saved for next time)")
+                    print("   Tip: python3 skills/browser_session.py start linkedin keeps it warm")
 
                 # Navigate to LinkedIn
                 print("📱 Opening LinkedIn...")
-                page.goto('https://www.linkedin.com/feed/')
-
-                print("\n" + "="*70)
-                print("⏸️  MANUAL STEP 1: SIGN IN")
-                print("="*70)
-                print("Please sign in to LinkedIn in the browser window")
-                print("Press ENTER here after you're signed in and see your feed...")
-                print("="*70)
-                input()
+                with pacing.step('open linkedin'):
+                    session.open_home()
+
+                if self.unattended:
+                    if not session.signed_in():
+                        print("\n❌ LinkedIn is signed out - sign in once with an interactive run")
+                        return False
+                elif not (session.warm and session.signed_in()):
+                    print("\n" + "="*70)
+                    print("⏸️  MANUAL STEP 1: SIGN IN")
+                    print("="*70)
+                    print("Please sign in to LinkedIn in the browser window")
+                    print("Press ENTER here after you're signed in and see your feed...")
+                    print("="*70)
+                    input()
 
-                print("\n✅ Signed in! Starting automation...")
-                time.sleep(2)
+                    print("\n✅ Signed in! Starting automation...")
+                    pacing.pause(2)
 
                 # Automated: Click "Start a post"
                 print("🤖 Clicking 'Start a post' button...")
-                try:
-                    # Try multiple selectors
-                    page.click('button:has-text("Start a post")', timeout=5000)
-                except:
+                with pacing.step('start post'):
                     try:
-                        page.click('[aria-label*="Start a post"]', timeout=5000)
-                    except:
+                        # All candidate selectors raced, learned one preferred; the
+                        # lookup waits for the feed to render the button
+                        self.selectors.locate(page, 'start_post', LINKEDIN_SELECTORS['start_post'],
+                                              timeout=15000).click()
+                    except SelectorNotFound:
                         # Force click using JavaScript
                         page.evaluate('document.querySelector(\'[aria-label*="Start a post"]\').click()')
+                    with contextlib.suppress(PlaywrightTimeout):
+                        page.locator(SHARE_DIALOG).first.wait_for(state='attached', timeout=10000)
 
-                time.sleep(3)
+                pacing.pause(3)
 
-                # Automated: Fill in the post content
+                # Automated: Fill in the post content (the lookup waits for the editor)
                 print("🤖 Filling in post content...")
-                try:
-                    page.fill('div[role="textbox"]', content)
-                except:
+                with pacing.step('editor'):
                     try:
-                        page.fill('div[contenteditable="true"]', content)
-                    except:
+                        self.selectors.locate(page, 'editor', LINKEDIN_SELECTORS['editor']).fill(content)
+                    except SelectorNotFound:
                         # Use keyboard to type
                         page.keyboard.type(content)
 
-                time.sleep(2)
+                pacing.pause(2)
 
                 print("\n" + "="*70)
                 print("⏸️  MANUAL STEP 2: FINAL APPROVAL")
                 print("="*70)
-                print("Review the post in the browser window")
-                print("Type 'POST' to publish, or 'CANCEL' to abort: ", end='')
-                approval = input().strip().upper()
+                if self.unattended:
+                    print("Approved in Approved/ - publishing (unattended)")
+                    approval = 'POST'
+                else:
+                    print("Review the post in the browser window")
+                    print("Type 'POST' to publish, or 'CANCEL' to abort: ", end='')
+                    approval = input().strip().upper()
                 print("="*70)
 
                 if approval == 'POST':
                     # Automated: Click Post button
                     print("\n🤖 Clicking 'Post' button...")
                     try:
-                        # Try text-based selector first
-                        page.click('button:has-text("Post"):not(:has-text("Start"))', timeout=5000)
-                    except:
-                        try:
-                            # Try finding by class
-                            page.click('button.share-actions__primary-action', timeout=5000)
-                        except:
+                        with pacing.step('post'):
                             try:
-                                # Try generic button near bottom
-                                page.click('button[type="submit"]', timeout=5000)
-                            except:
+                                self.selectors.locate(page, 'post', LINKEDIN_SELECTORS['post']).click()
+                            except SelectorNotFound:
                                 # Last resort: find any button with "Post" text
                                 page.evaluate('Array.from(document.querySelectorAll("button")).find(b => b.textContent.includes("Post") && !b.textContent.includes("Start")).click()')
 
-                    time.sleep(3)
+                            pacing.pause(3)
+                            # Published once the share dialog closes; let the request
+                            # finish before a cold browser is closed
+                            try:
+                                page.locator(SHARE_DIALOG).first.wait_for(state='hidden', timeout=15000)
+                            except PlaywrightTimeout:
+                                raise UnconfirmedSend("share dialog still open after Post")
+                            pacing.settle(page)
+                    except UnconfirmedSend:
+                        raise
+                    except Exception as e:
+                        # Post may or may not have been clicked
+                        raise UnconfirmedSend(f"post step failed ({e})") from e
                     print("\n✅ Post published successfully!")
+                    print("\n⏱️  Step timing:")
+                    for line in pacing.report_lines():
+                        print(f"   {line}")
+
+                    if not (session.warm or self.unattended):
+                        # Keep browser open for verification
+                        print("\n" + "="*70)
+                        print("✅ POST PUBLISHED - Browser will stay open")
+                        print("="*70)
+                        print("You can verify the post on LinkedIn.")
+                        print("Press ENTER to close browser and continue...")
+                        print("="*70)
+                        input()
 
-                    # Keep browser open for verification
-                    print("\n" + "="*70)
-                    print("✅ POST PUBLISHED - Browser will stay open")
-                    print("="*70)
-                    print("You can verify the post on LinkedIn.")
-                    print("Press ENTER to close browser and continue...")
-                    print("="*70)
-                    input()
-
-                    context.close()
                     return True
                 else:
                     print("\n❌ Post cancelled by user")
-                    context.close()
                     return False
 
+        except UnconfirmedSend:
+            raise
         except Exception as e:
             print(f"\n❌ Error: {e}")
             print("\nTroubleshooting:")
@@ -175,9 +210,21 @@ class AutomatedLinkedInPoster:
         posts = self.find_approved_posts()
 
         if not posts:
-            print("No approved LinkedIn posts found.")
+            print("No approved LinkedIn posts due.")
             return
 
+        if self.unattended:
+            # Session-validity precheck instead of the sign-in prompt
+            try:
+                signed_in = check_signed_in('linkedin')
+            except Exception as e:
+                print(f"\n❌ Could not open the LinkedIn session: {e}")
+                return
+            if not signed_in:
+                print("\n❌ LinkedIn session is signed out - nothing posted.")
+                print("   Sign in once with an interactive run (or browser_session.py start linkedin)")
+                return
+
         print(f"\n📋 Found {len(posts)} approved post(s)")
         print("   Processing FIRST post only (to prevent loops)\n")
 
@@ -189,7 +236,11 @@ class AutomatedLinkedInPoster:
         print(f"{'='*70}\n")
 
         content = self.extract_post_content(post_file)
-        success = self.post_to_linkedin_automated(content)
+        try:
+            success = self.post_to_linkedin_automated(content)
+        except UnconfirmedSend as e:
+            self.hold_unconfirmed(post_file, content, str(e))
+            success = None
 
         if success:
             log_content = f"""---
@@ -211,7 +262,7 @@ original_file: {post_file.name}
 - Timestamp: {datetime.now().isoformat()}
 - Method: Automated browser posting with HITL approval
 - User sign-in: Saved in persistent profile
-- Final approval: Obtained
+- Final approval: {'Approved/ folder (unattended run)' if self.unattended else 'Obtained'}
 
 ## Original File
 {post_file.name}
@@ -225,12 +276,66 @@ original_file: {post_file.name}
 
             print(f"\n✅ Execution log saved: {log_file.name}")
             print(f"✅ Original moved to Done: {done_file.name}")
-        else:
+        elif success is False:
             print(f"\n⚠️ Post not published. File remains in Approved folder.")
 
+        report = self.selectors.report_lines()
+        if report:
+            print("\n🎯 Selector cache (linkedin):")
+            for line in report:
+                print(f"   {line}")
+
+    def hold_unconfirmed(self, post_file: Path, content: str, reason: str):
+        """
+        Take a post that may have gone out back to Pending_Approval.
+
+        Publishing it again from Approved/ could post it twice, and logging
+        it as executed could lose it; a person checks LinkedIn first.
+        """
+        self.pending_approval.mkdir(exist_ok=True)
+        note = f"""---
+type: linkedin_post_unconfirmed
+status: needs_checking
+held_at: {datetime.now().isoformat()}
+original_file: {post_file.name}
+---
+
+# LinkedIn Post Needs Checking
+
+## Status
+⚠️ Post was clicked but could not be confirmed: {reason}
+
+## What to do
+- Check your LinkedIn activity for this post
+- Posted: move {post_file.name} to Done/
+- Not posted: move {post_file.name} back to Approved/ to publish it
+- Then delete this note
+
+## Content
+{content}
+"""
+        note_file = self.pending_approval / f'UNCONFIRMED_{post_file.name}'
+        note_file.write_text(note, encoding='utf-8')
+        post_file.rename(self.pending_approval / post_file.name)
+
+        print(f"\n⚠️  Post may have gone out ({reason})")
+        print(f"   Moved to Pending_Approval so it is not published twice: {post_file.name}")
+        print(f"   Check LinkedIn, then see {note_file.name}")
+
 def main():
-    vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
-    poster = AutomatedLinkedInPoster(str(vault_path))
+    parser = argparse.ArgumentParser(description='Publish the next due approved LinkedIn post in the browser')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--demo', action='store_true',
+                        help='Slow, paced automation for demos (default waits only on the page)')
+    parser.add_argument('--unattended', action='store_true',
+                        help='No prompts (cron/systemd): Approved/ is the approval, signed-in session required')
+    args = parser.parse_args()
+    if args.demo and args.unattended:
+        parser.error('--demo and --unattended cannot be combined')
+
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
+    poster = AutomatedLinkedInPoster(str(vault_path), demo=args.demo, unattended=args.unattended)
     poster.process_approved_posts()
 
 if __name__ == '__main__':
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Browser Session - Warm Chromium sessions shared by the browser senders
+A daemon keeps one persistent Chromium profile per service open, signed in
+and on the service's page, with a local CDP endpoint. Senders attach over
+CDP and drive the loaded page instead of launching a browser per item
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import contextlib
+from pathlib import Path
+from datetime import datetime
+
+# Playwright is only needed to launch or attach; status/stop work without it
+try:
+    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+    PlaywrightTimeout = TimeoutError
+
+try:
+    import fcntl
+except ImportError:  # Windows: jobs on a profile are not serialized
+    fcntl = None
+
+
+BROWSER_DATA = Path(__file__).parent.parent / '.browser_data'
+
+# Per service: home page, local CDP port, a URL fragment that means signed
+# in, and the dialogs a job opens (compose window, share dialog)
+SERVICES = {
+    'gmail': {
+        'url': 'https://mail.google.com/mail/u/0/#inbox',
+        'port': 9301,
+        'signed_in': 'mail.google.com/mail/',
+        'dialog': 'div[role="dialog"]',
+    },
+    'linkedin': {
+        'url': 'https://www.linkedin.com/feed/',
+        'port': 9302,
+        'signed_in': 'linkedin.com/feed',
+        'dialog': 'div[role="dialog"]',
+    },
+}
+
+CHECK_INTERVAL = 2
+
+# Longest wait for the network to go quiet; long-polling pages such as
+# Gmail may never get there, so a settle gives up after this
+SETTLE_TIMEOUT = 5000
+
+
+def profile_dir(service: str) -> Path:
+    """Persistent Chromium profile (cookies, sign-in) of a service"""
+    return BROWSER_DATA / service
+
+
+def session_file(service: str) -> Path:
+    return BROWSER_DATA / f'{service}.session.json'
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_session(service: str):
+    """Running daemon session of a service ({pid, port, ...}), or None"""
+    try:
+        with open(session_file(service), 'r') as f:
+            session = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return session if _pid_alive(session.get('pid', 0)) else None
+
+
+def _write_session(service: str, port: int):
+    path = session_file(service)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump({'pid': os.getpid(), 'port': port, 'started_at': datetime.now().isoformat()}, f)
+    os.replace(tmp_path, path)
+
+
+class BrowserSession:
+    """
+    A page of a service's browser profile, warm or cold.
+
+    Warm sessions are attached over CDP to the daemon's browser and leave
+    it running on exit; cold sessions launch the persistent profile for
+    this one job and close it afterwards, as the senders always did.
+    """
+
+    def __init__(self, service: str, context, page, warm: bool):
+        self.service = service
+        self.context = context
+        self.page = page
+        self.warm = warm
+
+    def signed_in(self) -> bool:
+        """Whether the page is on the service itself (not a sign-in page)"""
+        return SERVICES[self.service]['signed_in'] in self.page.url
+
+    def open_home(self, timeout: int = 60000):
+        """Load the service's home page unless the page is already there"""
+        if not self.signed_in():
+            self.page.goto(SERVICES[self.service]['url'], timeout=timeout)
+
+    def reset(self, force: bool = False, timeout: int = 60000) -> bool:
+        """
+        Discard what an earlier job left on the shared page.
+
+        A failed or cancelled job can leave its compose window or share
+        dialog open, half filled; the next job would fill that one. The home
+        page is reloaded when a dialog is open (or always with force).
+
+        Returns: whether the page was reloaded
+        """
+        if not force and not self.page.locator(f"{SERVICES[self.service]['dialog']}:visible").count():
+            return False
+
+        def accept(dialog):
+            dialog.accept()  # "Leave site?" for an unsent draft would block the reload
+
+        self.page.on('dialog', accept)
+        try:
+            self.page.goto(SERVICES[self.service]['url'], timeout=timeout)
+        finally:
+            self.page.remove_listener('dialog', accept)
+        return True
+
+
+class Pacing:
+    """
+    How a job waits between UI steps, and how long each step took.
+
+    Fast (default): no slow_mo and no fixed pauses; steps wait on page
+    conditions (a control visible, a dialog attached or gone, the network
+    idle). Demo: the original fixed pauses and slow_mo, so someone watching
+    the window can follow along.
+    """
+
+    def __init__(self, demo: bool = False, slow_mo: int = 0):
+        self.demo = demo
+        self.slow_mo = slow_mo if demo else 0
+        self.steps = []
+
+    def pause(self, seconds: float):
+        """Fixed pause, only in demo mode"""
+        if self.demo:
+            time.sleep(seconds)
+
+    def settle(self, page, timeout: int = SETTLE_TIMEOUT):
+        """Wait until the page's network is idle (or timeout, whichever first)"""
+        with contextlib.suppress(PlaywrightTimeout):
+            page.wait_for_load_state('networkidle', timeout=timeout)
+
+    @contextlib.contextmanager
+    def step(self, name: str):
+        """Time a step; its duration is kept even if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - started))
+
+    def report_lines(self) -> list:
+        total = sum(seconds for _, seconds in self.steps)
+        lines = [f"{name:18} {seconds * 1000:>8.0f} ms" for name, seconds in self.steps]
+        if self.steps:
+            lines.append(f"{'total':18} {total * 1000:>8.0f} ms ({'demo' if self.demo else 'fast'} mode)")
+        return lines
+
+
+@contextlib.contextmanager
+def _job_lock(service: str):
+    """One job at a time per service profile (jobs share the daemon's page)"""
+    BROWSER_DATA.mkdir(parents=True, exist_ok=True)
+    with open(BROWSER_DATA / f'{service}.lock', 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _service_page(context, service: str):
+    """The context's page on the service, else its first page, else a new one"""
+    for page in context.pages:
+        if SERVICES[service]['signed_in'] in page.url:
+            return page
+    return context.pages[0] if context.pages else context.new_page()
+
+
+@contextlib.contextmanager
+def attach(service: str, slow_mo: int = 0, headless: bool = False):
+    """
+    Browser session for one job.
+
+    Attaches to the daemon's warm browser when one is running, otherwise
+    launches the service's persistent profile (cold). Yields a
+    BrowserSession; warm browsers are left running on exit.
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        raise ImportError("playwright is required for browser sessions (pip install playwright)")
+
+    with _job_lock(service), sync_playwright() as p:
+        session = read_session(service)
+        browser = None
+        if session:
+            try:
+                browser = p.chromium.connect_over_cdp(f"http://127.0.0.1:{session['port']}",
+                                                      slow_mo=slow_mo, timeout=5000)
+            except Exception as e:
+                print(f"⚠️  Browser session daemon not reachable ({e}), launching a browser")
+
+        if browser is not None:
+            context = browser.contexts[0]
+            try:
+                warm = BrowserSession(service, context, _service_page(context, service), warm=True)
+                if warm.reset():
+                    print("♻️  Closed a compose/share dialog left open by an earlier job")
+                try:
+                    yield warm
+                except BaseException:
+                    # Leave the daemon's page clean for the retry or the next job
+                    with contextlib.suppress(Exception):
+                        warm.reset(force=True)
+                    raise
+            finally:
+                browser.close()  # Disconnects; the daemon's browser keeps running
+            return
+
+        user_data_dir = profile_dir(service)
+        user_data_dir.mkdir(parents=True, exist_ok=True)
+        context = p.chromium.launch_persistent_context(
+            str(user_data_dir),
+            headless=headless,
+            slow_mo=slow_mo,
+            args=['--start-maximized']
+        )
+        try:
+            yield BrowserSession(service, context, _service_page(context, service), warm=False)
+        finally:
+            with contextlib.suppress(Exception):
+                context.close()
+
+
+def check_signed_in(service: str, headless: bool = True) -> bool:
+    """
+    Whether the service's warm session (or saved profile) is signed in.
+
+    The unattended senders run this before a batch instead of asking the
+    user to sign in; a signed-out profile needs one interactive run.
+    """
+    with attach(service, headless=headless) as session:
+        session.open_home()
+        return session.signed_in()
+
+
+def serve(services: list, headless: bool = False):
+    """
+    Run the session daemon: open each service's profile and keep it warm.
+
+    Each browser listens for CDP on 127.0.0.1:<port> and its session file
+    records the daemon pid and port. Runs until SIGTERM/SIGINT or until
+    every browser window is closed.
+    """
+    if not PLAYWRIGHT_AVAILABLE:
+        print("Error: playwright is not installed. Install with: pip install playwright")
+        sys.exit(1)
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+
+    with sync_playwright() as p:
+        contexts = {}
+        closed = set()
+        try:
+            for service in services:
+                if read_session(service):
+                    print(f"⚠️  {service}: a session daemon is already running, skipping")
+                    continue
+                port = SERVICES[service]['port']
+                user_data_dir = profile_dir(service)
+                user_data_dir.mkdir(parents=True, exist_ok=True)
+
+                context = p.chromium.launch_persistent_context(
+                    str(user_data_dir),
+                    headless=headless,
+                    args=['--start-maximized', f'--remote-debugging-port={port}',
+                          '--remote-debugging-address=127.0.0.1']
+                )
+                context.on('close', lambda _, service=service: closed.add(service))
+                page = context.pages[0] if context.pages else context.new_page()
+                page.goto(SERVICES[service]['url'], timeout=60000)
+
+                contexts[service] = context
+                _write_session(service, port)
+                print(f"✅ {service}: warm on CDP port {port} ({page.url})")
+
+            if not contexts:
+                return
+            print("\nSign in once in each window if asked; senders will reuse these sessions.")
+            print("Stop with Ctrl+C or: python3 skills/browser_session.py stop")
+
+            while not stopping and len(closed) < len(contexts):
+                for context in contexts.values():
+                    context.pages  # Lets Playwright process pending browser events
+                time.sleep(CHECK_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for service, context in contexts.items():
+                with contextlib.suppress(Exception):
+                    context.close()
+                with contextlib.suppress(FileNotFoundError):
+                    session_file(service).unlink()
+            print("\n🛑 Browser sessions closed")
+
+
+def stop(services: list):
+    """Stop running session daemons"""
+    sessions = [read_session(service) for service in services]
+    pids = {session['pid'] for session in sessions if session}
+    for pid in pids:
+        os.kill(pid, signal.SIGTERM)
+    print(f"Stopped {len(pids)} session daemon(s)" if pids else "No session daemon running")
+
+
+def status(services: list):
+    for service in services:
+        session = read_session(service)
+        if session:
+            print(f"{service}: warm (pid {session['pid']}, CDP port {session['port']}, "
+                  f"since {session['started_at']})")
+        else:
+            print(f"{service}: not running (senders launch a browser per job)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep Gmail/LinkedIn browser sessions warm for the senders')
+    parser.add_argument('command', choices=['start', 'status', 'stop'])
+    parser.add_argument('services', nargs='*', help=f"{' and/or '.join(SERVICES)} (default: all)")
+    parser.add_argument('--headless', action='store_true',
+                        help='Run without windows (only once sign-in is saved)')
+    args = parser.parse_args()
+
+    unknown = set(args.services) - set(SERVICES)
+    if unknown:
+        parser.error(f"unknown service(s): {', '.join(sorted(unknown))}")
+    services = args.services or list(SERVICES)
+    if args.command == 'start':
+        serve(services, headless=args.headless)
+    elif args.command == 'stop':
+        stop(services)
+    else:
+        status(services)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+"""
+Dashboard Renderer - Keeps Dashboard.md small and up to date
+Counters are maintained incrementally from processing events and recent
+activity is a fixed-size ring buffer; the file is only rewritten (atomically)
+when its rendered content changes, and only the renderer's own sections are
+replaced
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer assumption
+    fcntl = None
+
+
+RECENT_ACTIVITY_LIMIT = 10
+COUNTER_RETENTION_DAYS = 40
+
+TEMPLATE = """# AI Employee Dashboard
+
+---
+last_updated: {today}
+status: active
+---
+
+## System Status
+- **AI Employee**: Active
+- **Watchers Running**: {watchers}
+- **Pending Actions**: {pending_actions}
+
+## Today's Summary
+- Tasks Completed: {tasks_today}
+- Messages Processed: {messages_today}
+- Approvals Pending: {approvals_pending}
+
+## Recent Activity
+{recent_activity}
+
+## Quick Stats
+- **This Week**: {tasks_week} tasks completed
+- **This Month**: {tasks_month} tasks completed
+
+## Alerts
+{alerts}
+
+---
+*Last updated by AI Employee*
+"""
+
+FOOTER = '---\n*Last updated by AI Employee*'
+
+# Template sections other skills and people write to: added when missing,
+# never overwritten by a refresh
+SEEDED_SECTIONS = {'## Alerts'}
+
+
+def count_entries(folder: Path, suffix: str = '.md') -> int:
+    """Count files in a folder without building a list"""
+    try:
+        with os.scandir(folder) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(suffix))
+    except FileNotFoundError:
+        return 0
+
+
+def _sections(text: str) -> list:
+    """Split markdown into the part before the first '## ' heading and one chunk per section"""
+    return re.split(r'(?m)^(?=## )', text)
+
+
+def merge_managed(existing: str, rendered: str) -> str:
+    """
+    Rendered sections spliced into an existing dashboard.
+
+    Sections the template renders replace their namesakes in place; any
+    other section, frontmatter key or content after the footer (added by
+    a person or another skill) is kept, as are SEEDED_SECTIONS. Template
+    sections missing from the existing file are added after the template
+    section before them.
+    """
+    rendered_preamble, *rendered_sections = _sections(rendered)
+    fresh = {chunk.split('\n', 1)[0]: chunk.split(FOOTER, 1)[0] for chunk in rendered_sections}
+    last_updated = re.search(r'(?m)^last_updated: .*$', rendered_preamble).group(0)
+
+    preamble, *sections = _sections(existing)
+    merged = [re.sub(r'(?m)^last_updated: .*$', lambda _: last_updated, preamble)]
+    for chunk in sections:
+        heading = chunk.split('\n', 1)[0]
+        if heading in fresh and heading not in SEEDED_SECTIONS:
+            _, footer, tail = chunk.partition(FOOTER)
+            chunk = fresh[heading] + footer + tail
+        merged.append(chunk)
+
+    headings = [chunk.split('\n', 1)[0] for chunk in merged]
+    for index, heading in enumerate(fresh):
+        if heading in headings:
+            continue
+        earlier = [headings.index(h) for h in list(fresh)[:index] if h in headings]
+        at = max(earlier) + 1 if earlier else len(merged)
+        if earlier and FOOTER in merged[at - 1]:
+            at -= 1  # Keep the footer last
+        merged.insert(at, fresh[heading])
+        headings.insert(at, heading)
+    return ''.join(merged)
+
+
+class Dashboard:
+    """
+    Incremental Dashboard.md renderer.
+
+    State lives in .state/dashboard.json: per-day counters for each event
+    kind, a ring buffer of recent activity lines and the hash of the last
+    rendered file. Updates are serialized with a lock file so concurrent
+    workers do not lose events.
+    """
+
+    def __init__(self, vault_path: Path, recent_limit: int = RECENT_ACTIVITY_LIMIT):
+        self.vault_path = Path(vault_path)
+        self.path = self.vault_path / 'Dashboard.md'
+        self.state_file = self.vault_path / '.state' / 'dashboard.json'
+        self.lock_file = self.vault_path / '.state' / 'dashboard.lock'
+        self.recent_limit = recent_limit
+        self.state = None
+
+    @contextmanager
+    def _locked(self):
+        """Hold the dashboard lock while loading, updating and saving state"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.state = self._load_state()
+                yield self.state
+                self._save_state()
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load_state(self) -> dict:
+        """Load renderer state, seeding recent activity from an existing dashboard"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Warning: Could not load dashboard state: {e}")
+
+        return {
+            'counters': {},
+            'recent': self._existing_activity(),
+            'watchers': 'File System Watcher',
+            'rendered_sha256': None,
+        }
+
+    def _save_state(self):
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def _existing_activity(self) -> list:
+        """Recent activity lines from a dashboard written before the renderer existed"""
+        if not self.path.exists():
+            return []
+        lines = []
+        in_activity = False
+        for line in self.path.read_text(encoding='utf-8').split('\n'):
+            if line.startswith('## Recent Activity'):
+                in_activity = True
+                continue
+            if in_activity and line.startswith('##'):
+                break
+            if in_activity and line.startswith('- ['):
+                lines.append(line)
+        return lines[:self.recent_limit]
+
+    def _apply(self, kind: str, count: int, message: str = None):
+        """Apply one event to the in-memory state"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        buckets = self.state['counters'].setdefault(kind, {})
+        buckets[today] = buckets.get(today, 0) + count
+
+        # Drop day buckets no longer needed for week/month totals
+        cutoff = (datetime.now() - timedelta(days=COUNTER_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        for day in [d for d in buckets if d < cutoff]:
+            del buckets[day]
+
+        if message:
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
+            recent = [f"- [{timestamp}] {message}"] + self.state['recent']
+            self.state['recent'] = recent[:self.recent_limit]
+
+    def _total(self, kind: str, since: str) -> int:
+        buckets = self.state['counters'].get(kind, {})
+        return sum(n for day, n in buckets.items() if day >= since)
+
+    def render(self) -> str:
+        """Render Dashboard.md from the current state"""
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        week_start = (now - timedelta(days=now.weekday())).strftime('%Y-%m-%d')
+        month_start = now.strftime('%Y-%m-01')
+
+        return TEMPLATE.format(
+            today=today,
+            watchers=self.state.get('watchers', 'File System Watcher'),
+            pending_actions=count_entries(self.vault_path / 'Needs_Action'),
+            tasks_today=self._total('tasks_completed', today),
+            messages_today=self._total('messages_processed', today),
+            approvals_pending=count_entries(self.vault_path / 'Pending_Approval'),
+            recent_activity='\n'.join(self.state['recent']) or '_No activity yet_',
+            tasks_week=self._total('tasks_completed', week_start),
+            tasks_month=self._total('tasks_completed', month_start),
+            alerts='_No alerts_',
+        )
+
+    def _write_if_changed(self) -> bool:
+        """Atomically update Dashboard.md's sections only if the rendered content changed"""
+        content = self.render()
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        if digest == self.state.get('rendered_sha256') and self.path.exists():
+            return False
+
+        try:
+            content = merge_managed(self.path.read_text(encoding='utf-8'), content)
+        except FileNotFoundError:
+            pass
+        tmp_path = self.path.with_name(f'.{self.path.name}.tmp')
+        tmp_path.write_text(content, encoding='utf-8')
+        os.replace(tmp_path, self.path)
+        self.state['rendered_sha256'] = digest
+        return True
+
+    def record(self, kind: str, count: int = 1, message: str = None) -> bool:
+        """
+        Record a processing event and refresh the dashboard.
+
+        Args:
+            kind: Counter to increment ('tasks_completed', 'messages_processed')
+            count: Amount to add
+            message: Optional line for Recent Activity
+
+        Returns: True if Dashboard.md was rewritten
+        """
+        with self._locked():
+            self._apply(kind, count, message)
+            return self._write_if_changed()
+
+    def summary(self):
+        """
+        Today's counters and recent activity, read without taking the lock.
+
+        Returns: dict, or None if the renderer has no state yet
+        """
+        if not self.state_file.exists():
+            return None
+        self.state = self._load_state()
+        today = datetime.now().strftime('%Y-%m-%d')
+        return {
+            'tasks_today': self._total('tasks_completed', today),
+            'messages_today': self._total('messages_processed', today),
+            'recent': self.state['recent'],
+        }
+
+    def refresh(self) -> bool:
+        """Re-render without recording an event (e.g. after the date changes)"""
+        with self._locked():
+            return self._write_if_changed()
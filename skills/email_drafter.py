@@ -4,44 +4,154 @@ Email Drafter - Creates email reply drafts with HITL approval workflow
 Analyzes incoming emails and drafts appropriate responses
 """
 
+import re
 import sys
+import argparse
 from pathlib import Path
 from datetime import datetime
 import json
 
+sys.path.append(str(Path(__file__).parent))
+from work_queue import WorkQueue, read_frontmatter
+from dashboard import Dashboard
+from handbook import load_handbook
+from text_features import NUMPY_AVAILABLE, section_text
+if NUMPY_AVAILABLE:
+    from reply_retrieval import ReplyIndex
+
+SUGGESTED_REPLIES = 3
+
+SUBJECT_PREFIX = re.compile(r'^\s*((re|fw|fwd|aw)\s*:\s*)+', re.IGNORECASE)
+ADDRESS = re.compile(r'<([^>]+)>')
+
+
+def normalize_subject(subject: str) -> str:
+    """Subject without Re:/Fwd: prefixes, for matching replies to a thread"""
+    return SUBJECT_PREFIX.sub('', subject or '').strip()
+
+
+def sender_address(sender: str) -> str:
+    """Bare lowercase address from a From header ("Name <a@b.c>" -> a@b.c)"""
+    match = ADDRESS.search(sender or '')
+    return (match.group(1) if match else sender or '').strip().lower()
+
+
+def thread_keys(email_info: dict) -> list:
+    """
+    Keys identifying an email's conversation, strongest first.
+
+    Gmail's thread id, the root of the References chain (the first message
+    of the conversation), the message's own Message-ID (so later replies
+    that reference it join), and - only for items written before the
+    watcher recorded threading headers - sender + normalized subject.
+    """
+    keys = []
+    if email_info.get('thread_id'):
+        keys.append(f"thread:{email_info['thread_id']}")
+    references = email_info.get('references', '').split()
+    if references:
+        keys.append(f"msg:{references[0]}")
+    if email_info.get('rfc_message_id'):
+        keys.append(f"msg:{email_info['rfc_message_id']}")
+    if not (email_info.get('thread_id') or email_info.get('rfc_message_id')):
+        subject = normalize_subject(email_info.get('subject', '')).lower()
+        keys.append(f"subject:{sender_address(email_info.get('from', ''))}|{subject}")
+    return keys
+
 class EmailDrafter:
     def __init__(self, vault_path: str):
         self.vault_path = Path(vault_path)
         self.needs_action = self.vault_path / 'Needs_Action'
         self.pending_approval = self.vault_path / 'Pending_Approval'
         self.company_handbook = self.vault_path / 'Company_Handbook.md'
+        self._reply_index = None
+
+    @property
+    def handbook(self):
+        """Parsed Company Handbook (cached; re-parsed only when it changes)"""
+        return load_handbook(self.vault_path)
+
+    def guideline_notes(self) -> str:
+        """Handbook communication guidelines as draft note lines"""
+        return ''.join(f"\n- Guideline: {rule}" for rule in self.handbook.communication_guidelines())
 
     def find_email_actions(self):
-        """Find email action items that need replies"""
-        emails = list(self.needs_action.glob('EMAIL_*.md'))
+        """Find email action items that need replies, most urgent first"""
+        emails = list(WorkQueue.from_folder(self.needs_action, 'EMAIL_*.md'))
         return emails
 
     def extract_email_info(self, filepath: Path):
         """Extract email information from action file"""
-        content = filepath.read_text(encoding='utf-8')
-
-        lines = content.split('\n')
-        frontmatter = {}
-        in_frontmatter = False
-
-        for line in lines:
-            if line.strip() == '---':
-                if not in_frontmatter:
-                    in_frontmatter = True
+        return read_frontmatter(filepath)
+
+    def group_by_thread(self, emails: list) -> list:
+        """
+        Group email action files into conversations in one pass.
+
+        Every key of a message (see thread_keys) is indexed to the first
+        message that had it, and messages sharing a key are joined with
+        union-find, so a later message that connects two groups merges
+        them. Groups with different Gmail thread ids are never joined.
+        Groups keep the order of their first (most urgent) message.
+
+        Returns: list of [(email_file, email_info), ...] per conversation
+        """
+        entries = [(email_file, self.extract_email_info(email_file)) for email_file in emails]
+        parent = list(range(len(entries)))
+        thread_ids = [info.get('thread_id', '') for _, info in entries]
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        index = {}
+        for i, (_, email_info) in enumerate(entries):
+            for key in thread_keys(email_info):
+                if key not in index:
+                    index[key] = i
                     continue
-                else:
-                    break
-
-            if in_frontmatter and ':' in line:
-                key, value = line.split(':', 1)
-                frontmatter[key.strip()] = value.strip()
-
-        return frontmatter
+                a, b = sorted((find(index[key]), find(i)))
+                if a == b or (thread_ids[a] and thread_ids[b] and thread_ids[a] != thread_ids[b]):
+                    continue
+                parent[b] = a
+                thread_ids[a] = thread_ids[a] or thread_ids[b]
+
+        threads = {}
+        for i, entry in enumerate(entries):
+            threads.setdefault(find(i), []).append(entry)
+        return list(threads.values())
+
+    @property
+    def reply_index(self):
+        """Index of sent replies, refreshed once per drafter (None without numpy)"""
+        if self._reply_index is None and NUMPY_AVAILABLE:
+            self._reply_index = ReplyIndex(self.vault_path)
+            added = self._reply_index.refresh()
+            self._reply_index.save()
+            if added:
+                print(f"📚 Indexed {added} new sent reply(ies) ({len(self._reply_index)} total)")
+        return self._reply_index
+
+    def similar_replies(self, email_file: Path, email_info: dict) -> str:
+        """Markdown section with the most similar past replies, or ''"""
+        index = self.reply_index
+        if index is None or not len(index):
+            return ''
+
+        body = section_text(email_file.read_text(encoding='utf-8'), 'Email Content')
+        matches = index.query([f"{email_info.get('subject', '')}\n{body}"], SUGGESTED_REPLIES)[0]
+        if not matches:
+            return ''
+
+        lines = ['## Similar Past Replies', '',
+                 'Sent replies to similar emails; copy one into the draft above if it fits.', '']
+        for i, (score, entry) in enumerate(matches, 1):
+            lines.append(f"### {i}. {entry['subject']} (similarity {score:.2f}, {entry['file']})")
+            lines.extend(f"> {line}" for line in entry['body'].split('\n'))
+            lines.append('')
+        return '\n'.join(lines) + '\n'
 
     def draft_reply(self, email_info: dict):
         """Draft a reply based on email information"""
@@ -63,9 +173,13 @@ Best regards"""
         """Create a reply draft for approval"""
         email_info = self.extract_email_info(email_file)
         reply_content = self.draft_reply(email_info)
+        suggestions = self.similar_replies(email_file, email_info)
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        sender = email_info.get('from', 'unknown').split('@')[0]
+        sender = sender_address(email_info.get('from', '')).split('@')[0] or 'unknown'
+        references = email_info.get('references', '').split()
+        if email_info.get('rfc_message_id'):
+            references.append(email_info['rfc_message_id'])
 
         draft_content = f"""---
 type: email_reply
@@ -75,8 +189,11 @@ subject: Re: {email_info.get('subject', '')}
 created: {datetime.now().isoformat()}
 priority: medium
 status: pending_approval
-requires_approval: true
+requires_approval: {str(self.handbook.requires_approval('External communications')).lower()}
 message_id: {email_info.get('message_id', '')}
+thread_id: {email_info.get('thread_id', '')}
+in_reply_to: {email_info.get('rfc_message_id', '')}
+references: {' '.join(references)}
 ---
 
 # Email Reply Draft
@@ -90,7 +207,7 @@ message_id: {email_info.get('message_id', '')}
 
 {reply_content}
 
-## Approval Instructions
+{suggestions}## Approval Instructions
 
 1. **Review** the draft reply above
 2. **Edit** if needed (modify the content directly)
@@ -101,22 +218,119 @@ message_id: {email_info.get('message_id', '')}
 
 - Reply will be sent from your Gmail account
 - You can edit the reply content before approving
-- Original email file: {email_file.name}
+- Original email file: {email_file.name}{self.guideline_notes()}
 """
 
         # Save draft to Pending_Approval
-        draft_file = self.pending_approval / f'EMAIL_REPLY_{timestamp}_{sender}.md'
+        draft_file = self._draft_path(timestamp, sender)
         draft_file.write_text(draft_content, encoding='utf-8')
 
         # Move original email to Done (processed)
+        self._move_to_done(email_file)
+
+        return draft_file
+
+    def _draft_path(self, timestamp: str, sender: str) -> Path:
+        """Unused draft filename (several drafts may share a second and sender)"""
+        draft_file = self.pending_approval / f'EMAIL_REPLY_{timestamp}_{sender}.md'
+        n = 2
+        while draft_file.exists():
+            draft_file = self.pending_approval / f'EMAIL_REPLY_{timestamp}_{sender}_{n}.md'
+            n += 1
+        return draft_file
+
+    def _move_to_done(self, email_file: Path):
         done_folder = self.vault_path / 'Done'
-        done_file = done_folder / email_file.name
-        email_file.rename(done_file)
+        email_file.rename(done_folder / email_file.name)
+
+    def create_thread_draft(self, thread: list) -> Path:
+        """
+        Create one reply draft for a whole conversation.
+
+        The reply goes to the latest message; the draft lists every message
+        so the reviewer approves the conversation once.
+        """
+        if len(thread) == 1:
+            return self.create_reply_draft(thread[0][0])
+
+        thread = sorted(thread, key=lambda entry: entry[1].get('received', ''))
+        latest_file, latest = thread[-1]
+        subject = normalize_subject(latest.get('subject', ''))
+        # Thread id and References both from the message replied to, so the
+        # reply is filed in the conversation it points at
+        thread_id = latest.get('thread_id', '')
+        reply_content = self.draft_reply(dict(latest, subject=subject))
+        suggestions = self.similar_replies(latest_file, latest)
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        sender = sender_address(latest.get('from', '')).split('@')[0] or 'unknown'
+
+        # References chain for the reply: the thread's chain plus the message replied to
+        references = latest.get('references', '').split()
+        if latest.get('rfc_message_id') and latest['rfc_message_id'] not in references:
+            references.append(latest['rfc_message_id'])
+
+        messages = '\n'.join(
+            f"{i}. **{info.get('received', 'Unknown')}** - {info.get('from', 'Unknown')}: "
+            f"{info.get('subject', 'No Subject')} ({email_file.name})"
+            for i, (email_file, info) in enumerate(thread, 1)
+        )
+
+        draft_content = f"""---
+type: email_reply
+source: email_drafter
+to: {latest.get('from', '')}
+subject: Re: {subject}
+created: {datetime.now().isoformat()}
+priority: medium
+status: pending_approval
+requires_approval: {str(self.handbook.requires_approval('External communications')).lower()}
+message_id: {latest.get('message_id', '')}
+thread_id: {thread_id}
+in_reply_to: {latest.get('rfc_message_id', '')}
+references: {' '.join(references)}
+thread_messages: {len(thread)}
+---
+
+# Email Reply Draft
+
+## Conversation ({len(thread)} messages)
+{messages}
+
+## Draft Reply
+
+{reply_content}
+
+{suggestions}## Approval Instructions
+
+1. **Review** the draft reply above
+2. **Edit** if needed (modify the content directly)
+3. **Approve:** Move this file to `/Approved` folder
+4. **Reject:** Move this file to `/Rejected` folder
+
+## Notes
+
+- Reply will be sent from your Gmail account, in the same thread
+- One reply covers all {len(thread)} messages listed above
+- Original email files: {', '.join(email_file.name for email_file, _ in thread)}{self.guideline_notes()}
+"""
+
+        draft_file = self._draft_path(timestamp, sender)
+        draft_file.write_text(draft_content, encoding='utf-8')
+
+        for email_file, _ in thread:
+            self._move_to_done(email_file)
 
         return draft_file
 
-    def process_emails(self):
-        """Process all email action items"""
+    def process_emails(self, batch: bool = False):
+        """
+        Process all email action items
+
+        Args:
+            batch: Draft one consolidated reply per conversation instead of
+                   one reply per email
+        """
         emails = self.find_email_actions()
 
         if not emails:
@@ -125,6 +339,10 @@ message_id: {email_info.get('message_id', '')}
 
         print(f"\n📧 Found {len(emails)} email(s) to process")
 
+        if batch:
+            self.process_threads(emails)
+            return
+
         for email_file in emails:
             print(f"\n{'='*60}")
             print(f"Processing: {email_file.name}")
@@ -135,11 +353,43 @@ message_id: {email_info.get('message_id', '')}
             print(f"📁 Location: {draft_file}")
             print(f"👉 Review and move to /Approved to send")
 
+        Dashboard(self.vault_path).record(
+            'messages_processed', len(emails),
+            f"Drafted {len(emails)} email reply(ies) for approval"
+        )
+
+    def process_threads(self, emails: list):
+        """Draft one reply per conversation"""
+        threads = self.group_by_thread(emails)
+        print(f"🧵 Grouped into {len(threads)} conversation(s)")
+
+        for thread in threads:
+            print(f"\n{'='*60}")
+            print(f"Processing conversation: {thread[0][0].name} ({len(thread)} message(s))")
+            print(f"{'='*60}")
+
+            draft_file = self.create_thread_draft(thread)
+            print(f"✅ Reply draft created: {draft_file.name}")
+            print(f"📁 Location: {draft_file}")
+            print(f"👉 Review and move to /Approved to send")
+
+        Dashboard(self.vault_path).record(
+            'messages_processed', len(emails),
+            f"Drafted {len(threads)} reply(ies) for {len(emails)} email(s) for approval"
+        )
+
 def main():
     """Main entry point"""
-    vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
+    parser = argparse.ArgumentParser(description='Draft email replies for approval')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Draft one consolidated reply per conversation')
+    args = parser.parse_args()
+
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
     drafter = EmailDrafter(str(vault_path))
-    drafter.process_emails()
+    drafter.process_emails(batch=args.batch)
 
 if __name__ == '__main__':
     main()
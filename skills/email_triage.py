@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Email Triage - Local classifier that sets the priority of incoming email
+A multinomial naive Bayes model on hashed sender/subject/snippet features,
+trained offline from the vault's history: replies that were approved and
+sent (Done) versus drafts and emails that were rejected (Rejected)
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from text_features import NUMPY_AVAILABLE, np, tokenize, hashed_counts, section_text
+from work_queue import read_frontmatter
+
+
+TRIAGE_DIM = 2 ** 15
+MODEL_FILE = 'triage_model.npz'
+RETRAIN_HOURS = 24
+MIN_EXAMPLES_PER_CLASS = 5
+
+# Calibrated reply probability -> priority, checked top down
+PRIORITY_THRESHOLDS = [(0.8, 'high'), (0.5, 'medium'), (0.0, 'low')]
+
+# Task Prioritization in the Company Handbook: these always mean urgent
+URGENT_KEYWORDS = ('urgent', 'asap')
+
+
+def email_features(sender: str, subject: str, snippet: str, dim: int = TRIAGE_DIM) -> dict:
+    """Hashed counts for one email; each field has its own namespace"""
+    sender = (sender or '').lower()
+    address = sender[sender.find('<') + 1:sender.rfind('>')] if '<' in sender else sender.strip()
+    domain = address.split('@')[-1] if '@' in address else ''
+
+    features = hashed_counts([address, domain], dim, bigrams=False, prefix='from:')
+    for prefix, text in (('subj:', subject), ('body:', snippet)):
+        for column, count in hashed_counts(tokenize(text), dim, prefix=prefix).items():
+            features[column] = features.get(column, 0) + count
+    return features
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def priority_for(score: float, subject: str = '') -> str:
+    """Priority for a calibrated score (urgent keywords in the subject win)"""
+    if any(keyword in (subject or '').lower() for keyword in URGENT_KEYWORDS):
+        return 'urgent'
+    for threshold, priority in PRIORITY_THRESHOLDS:
+        if score >= threshold:
+            return priority
+    return 'low'
+
+
+def history_examples(vault_path: Path) -> list:
+    """
+    Labelled examples from the vault history.
+
+    Returns: list of (sender, subject, snippet, label) with label 1 for
+             emails that got an approved, sent reply and 0 for rejected ones
+    """
+    vault_path = Path(vault_path)
+    done_folder = vault_path / 'Done'
+    examples = []
+
+    def original_snippet(draft: Path) -> str:
+        # Drafts name the email(s) they answer; originals are moved to Done
+        for line in draft.read_text(encoding='utf-8').split('\n'):
+            if line.startswith('- Original email file'):
+                names = line.split(':', 1)[1].split(',')
+                return ' '.join(section_text((done_folder / name.strip()).read_text(encoding='utf-8'),
+                                             'Email Content')
+                                for name in names if (done_folder / name.strip()).exists())
+        return ''
+
+    for folder, label in ((done_folder, 1), (vault_path / 'Rejected', 0)):
+        if not folder.exists():
+            continue
+        for path in folder.glob('EMAIL_REPLY_*.md'):
+            try:
+                meta = read_frontmatter(path)
+                subject = meta.get('subject', '')
+                if subject.lower().startswith('re:'):
+                    subject = subject[3:].strip()
+                examples.append((meta.get('to', ''), subject, original_snippet(path), label))
+            except (OSError, UnicodeDecodeError):
+                continue
+
+    # Emails rejected outright, without a draft
+    rejected = vault_path / 'Rejected'
+    if rejected.exists():
+        for path in rejected.glob('EMAIL_*.md'):
+            if path.name.startswith('EMAIL_REPLY_'):
+                continue
+            try:
+                meta = read_frontmatter(path)
+                snippet = section_text(path.read_text(encoding='utf-8'), 'Email Content')
+            except (OSError, UnicodeDecodeError):
+                continue
+            examples.append((meta.get('from', ''), meta.get('subject', ''), snippet, 0))
+
+    return examples
+
+
+class EmailTriage:
+    """
+    Naive Bayes reply-probability model with Platt calibration.
+
+    The model is one weight per hash column (the difference of the two
+    classes' log probabilities) plus a bias, so scoring a batch is a single
+    weighted bincount over the batch's sparse features.
+    """
+
+    def __init__(self, weights=None, bias: float = 0.0, platt=(1.0, 0.0), dim: int = TRIAGE_DIM,
+                 trained_at: float = 0.0, examples: int = 0):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for email triage (pip install numpy)")
+        self.dim = dim
+        self.weights = weights if weights is not None else np.zeros(dim, dtype=np.float32)
+        self.bias = bias
+        self.platt = platt
+        self.trained_at = trained_at
+        self.examples = examples
+
+    @staticmethod
+    def _flatten(feature_rows: list):
+        """Sparse rows -> (row ids, columns, counts) arrays"""
+        lengths = [len(row) for row in feature_rows]
+        total = sum(lengths)
+        rows = np.repeat(np.arange(len(feature_rows)), lengths)
+        columns = np.fromiter((c for row in feature_rows for c in row.keys()), dtype=np.int64, count=total)
+        counts = np.fromiter((v for row in feature_rows for v in row.values()), dtype=np.float32, count=total)
+        return rows, columns, counts
+
+    @classmethod
+    def fit(cls, examples: list, dim: int = TRIAGE_DIM, alpha: float = 1.0) -> 'EmailTriage':
+        """Train from (sender, subject, snippet, label) examples"""
+        labels = np.array([label for *_, label in examples], dtype=np.int64)
+        feature_rows = [email_features(sender, subject, snippet, dim)
+                        for sender, subject, snippet, _ in examples]
+        rows, columns, counts = cls._flatten(feature_rows)
+
+        # Per-class column totals in one pass: class k uses columns k*dim .. (k+1)*dim-1
+        totals = np.bincount(labels[rows] * dim + columns, weights=counts, minlength=2 * dim)
+        totals = totals.reshape(2, dim) + alpha
+        log_probs = np.log(totals / totals.sum(axis=1, keepdims=True))
+
+        class_counts = np.bincount(labels, minlength=2)
+        model = cls(weights=(log_probs[1] - log_probs[0]).astype(np.float32),
+                    bias=float(np.log(class_counts[1] / class_counts[0])),
+                    dim=dim, trained_at=time.time(), examples=len(examples))
+        model.platt = model._fit_platt(model._log_odds(rows, columns, counts, len(examples)), labels)
+        return model
+
+    @staticmethod
+    def _fit_platt(z, labels, iterations: int = 100, ridge: float = 1.0):
+        """
+        Fit p = sigmoid(a*z + b) to the labels (damped Newton's method).
+
+        Naive Bayes log-odds are over-confident; this rescales them into
+        probabilities that match the observed reply rate. Targets are
+        smoothed as in Platt's method and (a, b) are pulled towards (1, 0)
+        so perfectly separable history cannot drive the scale to infinity.
+        """
+        positives = labels.sum()
+        negatives = len(labels) - positives
+        targets = np.where(labels == 1, (positives + 1) / (positives + 2), 1 / (negatives + 2))
+        params = np.array([1.0, 0.0])
+        prior = np.array([1.0, 0.0])
+        for _ in range(iterations):
+            p = _sigmoid(params[0] * z + params[1])
+            residual = p - targets
+            gradient = np.array([np.sum(residual * z), np.sum(residual)]) + ridge * (params - prior)
+            w = p * (1 - p)
+            hessian = np.array([[np.sum(w * z * z), np.sum(w * z)],
+                                [np.sum(w * z), np.sum(w)]]) + ridge * np.eye(2)
+            step = np.linalg.solve(hessian, gradient)
+            scale = min(1.0, 1.0 / max(np.abs(step).max(), 1e-12))  # at most 1 per step
+            params -= scale * step
+            if np.abs(step).max() < 1e-6:
+                break
+        return float(params[0]), float(params[1])
+
+    def _log_odds(self, rows, columns, counts, n):
+        return np.bincount(rows, weights=counts * self.weights[columns], minlength=n) + self.bias
+
+    def score(self, emails: list):
+        """
+        Calibrated reply probabilities for a batch.
+
+        Args:
+            emails: list of (sender, subject, snippet)
+
+        Returns: numpy array of scores in [0, 1]
+        """
+        if not emails:
+            return np.zeros(0)
+        feature_rows = [email_features(sender, subject, snippet, self.dim)
+                        for sender, subject, snippet in emails]
+        z = self._log_odds(*self._flatten(feature_rows), len(emails))
+        a, b = self.platt
+        return _sigmoid(a * z + b)
+
+    def triage(self, emails: list) -> list:
+        """(priority, score) for each (sender, subject, snippet) in a batch"""
+        return [(priority_for(float(score), subject), round(float(score), 3))
+                for score, (_, subject, _) in zip(self.score(emails), emails)]
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+        np.savez(tmp_path, weights=self.weights, bias=self.bias, platt=np.array(self.platt),
+                 dim=self.dim, trained_at=self.trained_at, examples=self.examples)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path):
+        """Saved model, or None if there is none"""
+        try:
+            with np.load(path) as data:
+                return cls(weights=data['weights'], bias=float(data['bias']),
+                           platt=tuple(data['platt']), dim=int(data['dim']),
+                           trained_at=float(data['trained_at']), examples=int(data['examples']))
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return None
+
+
+def train_from_vault(vault_path: Path):
+    """
+    Train and save a model from the vault history.
+
+    Returns: the model, or None if there are too few examples of each class
+    """
+    examples = history_examples(vault_path)
+    labels = [label for *_, label in examples]
+    if min(labels.count(0), labels.count(1)) < MIN_EXAMPLES_PER_CLASS:
+        return None
+    model = EmailTriage.fit(examples)
+    model.save(Path(vault_path) / '.state' / MODEL_FILE)
+    return model
+
+
+def load_triage(vault_path: Path, max_age_hours: float = RETRAIN_HOURS):
+    """
+    Triage model for a vault, retrained when older than max_age_hours.
+
+    Returns: EmailTriage, or None without numpy or enough history
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    model = EmailTriage.load(Path(vault_path) / '.state' / MODEL_FILE)
+    if model is None or time.time() - model.trained_at > max_age_hours * 3600:
+        model = train_from_vault(vault_path) or model
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train or try the email triage model')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--train', action='store_true', help='Retrain from Done/Rejected history')
+    parser.add_argument('--score', nargs=3, metavar=('FROM', 'SUBJECT', 'SNIPPET'),
+                        help='Score one email')
+    args = parser.parse_args()
+
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
+
+    if not NUMPY_AVAILABLE:
+        print("Error: numpy is not installed. Install with: pip install numpy")
+        sys.exit(1)
+
+    if args.train:
+        model = train_from_vault(vault_path)
+        if model is None:
+            print(f"Not enough history to train (need {MIN_EXAMPLES_PER_CLASS} sent and "
+                  f"{MIN_EXAMPLES_PER_CLASS} rejected replies)")
+            sys.exit(1)
+        print(f"✓ Trained on {model.examples} examples")
+    else:
+        model = load_triage(vault_path)
+        if model is None:
+            print("No triage model yet (not enough history)")
+            sys.exit(1)
+
+    if args.score:
+        priority, score = model.triage([tuple(args.score)])[0]
+        print(f"priority: {priority}, triage_score: {score}")
+
+
+if __name__ == '__main__':
+    main()
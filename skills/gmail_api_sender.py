@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Gmail API Sender - Sends approved email replies through the Gmail API
+Uses the gmail.send token minted by authenticate_gmail_send.py and one
+keep-alive HTTP session for the whole batch, so a reply costs one API
+request instead of a browser session
+"""
+
+import sys
+import json
+import base64
+import pickle
+import select
+import argparse
+import http.client
+from pathlib import Path
+from urllib.parse import urlsplit
+from email.message import EmailMessage
+from email.utils import formatdate
+
+sys.path.insert(0, str(Path(__file__).parent))
+from send_queue import SendError, UnconfirmedSend, idempotency_key
+
+# google-auth is only needed against the real API; a local endpoint works without it
+try:
+    import requests
+    from urllib3.exceptions import NewConnectionError
+    from google.auth.exceptions import RefreshError
+    from google.auth.transport.requests import AuthorizedSession, Request
+    GOOGLE_AUTH_AVAILABLE = True
+except ImportError:
+    RefreshError = ()  # Nothing to catch without google-auth
+    GOOGLE_AUTH_AVAILABLE = False
+
+
+GMAIL_API = 'https://gmail.googleapis.com'
+SEND_PATH = '/gmail/v1/users/me/messages/send'
+TOKEN_PATH = Path(__file__).parent.parent / 'token_send.pickle'
+
+# Worth retrying (SendQueue backs off); any other 4xx means the reply itself is bad
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def build_message(email_data: dict) -> EmailMessage:
+    """
+    MIME message of a reply.
+
+    From is left out: Gmail fills in the authenticated account. In-Reply-To
+    and References come from the draft, so the reply lands in the
+    original conversation in every mail client.
+    """
+    message = EmailMessage()
+    message['To'] = email_data['to']
+    message['Subject'] = email_data['subject']
+    message['Date'] = formatdate(localtime=True)
+
+    in_reply_to = email_data.get('in_reply_to', '').strip()
+    references = email_data.get('references', '').split()
+    if in_reply_to:
+        message['In-Reply-To'] = in_reply_to
+        if in_reply_to not in references:
+            references.append(in_reply_to)
+    if references:
+        message['References'] = ' '.join(references)
+
+    message.set_content(email_data['body'])
+    return message
+
+
+def send_payload(email_data: dict) -> dict:
+    """messages.send request body: the raw message plus its Gmail thread"""
+    raw = base64.urlsafe_b64encode(build_message(email_data).as_bytes()).decode('ascii')
+    payload = {'raw': raw}
+    if email_data.get('thread_id'):
+        payload['threadId'] = email_data['thread_id']
+    return payload
+
+
+class TokenError(Exception):
+    """The saved gmail.send token could not be refreshed (expired or revoked)"""
+
+
+class RequestNotSent(OSError):
+    """The request failed before it was fully written, so Gmail cannot have acted on it"""
+
+
+def _not_sent(error: Exception) -> bool:
+    """
+    Whether a failed POST provably never reached the server.
+
+    Only then is a retry safe: a timeout or disconnect while waiting for
+    the response may come after Gmail already sent the email.
+    """
+    if isinstance(error, RequestNotSent):
+        return True
+    if GOOGLE_AUTH_AVAILABLE:
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+            # Connection refused / DNS failure: urllib3 never opened a connection
+            return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+def _json_body(data) -> bytes:
+    return json.dumps(data).encode('utf-8')
+
+
+class KeepAliveResponse:
+    def __init__(self, status_code: int, body: bytes):
+        self.status_code = status_code
+        self.text = body.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text) if self.text else {}
+
+
+class KeepAliveSession:
+    """
+    Minimal requests-style session on one persistent http.client connection.
+
+    Used for local endpoints (the fake Gmail API in benchmarks/) where no
+    OAuth token is involved. An idle connection the server has closed is
+    detected before writing and reopened; failures while writing raise
+    RequestNotSent. Failures while waiting for the response are raised
+    as they are and never resent, since the server may have acted.
+    """
+
+    def __init__(self, base_url: str, headers: dict = None):
+        parts = urlsplit(base_url)
+        connection_class = (http.client.HTTPSConnection if parts.scheme == 'https'
+                            else http.client.HTTPConnection)
+        self.connection = connection_class(parts.hostname, parts.port)
+        self.headers = dict(headers or {})
+
+    def post(self, url: str, json: dict = None, timeout: float = None) -> KeepAliveResponse:
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        body = _json_body(json)
+        headers = {**self.headers, 'Content-Type': 'application/json'}
+        if timeout is not None:
+            self.connection.timeout = timeout
+
+        if self._dropped():
+            self.connection.close()  # request() reconnects
+        try:
+            self.connection.request('POST', path, body=body, headers=headers)
+        except (OSError, http.client.HTTPException) as e:
+            self.connection.close()
+            raise RequestNotSent(f"request not sent: {e}") from e
+        try:
+            response = self.connection.getresponse()
+            return KeepAliveResponse(response.status, response.read())
+        except BaseException:
+            self.connection.close()
+            raise
+
+    def _dropped(self) -> bool:
+        """Whether the server closed the idle connection (an idle socket turns readable on EOF)"""
+        sock = self.connection.sock
+        if sock is None:
+            return False
+        try:
+            return bool(select.select([sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def close(self):
+        self.connection.close()
+
+
+def authorized_session(token_path: Path = TOKEN_PATH):
+    """
+    AuthorizedSession (pooled, keep-alive) for the saved gmail.send token.
+
+    Refreshes an expired token and saves it back; raises TokenError when
+    the token can no longer be refreshed.
+    """
+    if not GOOGLE_AUTH_AVAILABLE:
+        raise ImportError("google-auth is required for the Gmail API backend "
+                          "(pip install google-auth google-auth-oauthlib requests)")
+    if not Path(token_path).exists():
+        raise FileNotFoundError(f"{token_path} not found - run: python3 authenticate_gmail_send.py")
+
+    with open(token_path, 'rb') as f:
+        creds = pickle.load(f)
+    if not creds.valid and creds.expired and creds.refresh_token:
+        try:
+            creds.refresh(Request())
+        except RefreshError as e:
+            raise TokenError(f"Gmail send token could not be refreshed ({e}) - "
+                             f"run: python3 authenticate_gmail_send.py") from e
+        with open(token_path, 'wb') as f:
+            pickle.dump(creds, f)
+    return AuthorizedSession(creds)
+
+
+class GmailApiSender:
+    """
+    Send backend for the approved-reply pipeline (GmailReplyHandler).
+
+    One session is opened lazily and reused for every reply in the run.
+    Request bodies are built once per reply and kept, so retries after a
+    transient error send the identical message.
+    """
+
+    name = 'gmail_api'
+
+    def __init__(self, endpoint: str = GMAIL_API, token_path: Path = TOKEN_PATH, timeout: float = 30):
+        self.endpoint = endpoint.rstrip('/')
+        self.token_path = Path(token_path)
+        self.timeout = timeout
+        self.session = None
+        self.payloads = {}
+        self.last_message_id = None
+
+    def connect(self):
+        """The run's session, opened on first use (fails early on a missing token)"""
+        if self.session is None:
+            if self.endpoint == GMAIL_API:
+                self.session = authorized_session(self.token_path)
+            else:
+                self.session = KeepAliveSession(self.endpoint)
+        return self.session
+
+    def send(self, email_data: dict) -> bool:
+        """
+        Send one reply.
+
+        Returns: True when Gmail accepted it, False when it was rejected
+                 (bad address, missing permission; not worth retrying)
+        Raises: SendError when the request never reached Gmail or got a
+                retryable status; UnconfirmedSend when the connection failed
+                after the request was written (Gmail may have sent it)
+        """
+        key = idempotency_key(email_data)
+        if key not in self.payloads:
+            self.payloads[key] = send_payload(email_data)
+
+        session = self.connect()
+        try:
+            response = session.post(self.endpoint + SEND_PATH, json=self.payloads[key],
+                                    timeout=self.timeout)
+        except RefreshError as e:
+            # Raised before the request is made
+            raise SendError(f"Gmail send token could not be refreshed: {e}") from e
+        except (OSError, http.client.HTTPException) as e:
+            if _not_sent(e):
+                raise SendError(f"Gmail API unreachable: {e}") from e
+            raise UnconfirmedSend(f"Gmail API connection failed after the request was sent ({e}); "
+                                  f"the email may have gone out") from e
+
+        if response.status_code in RETRYABLE_STATUS:
+            raise SendError(f"Gmail API returned {response.status_code}")
+        if response.status_code >= 400:
+            print(f"❌ Gmail API rejected the email ({response.status_code}): {response.text[:200]}")
+            return False
+
+        self.payloads.pop(key, None)
+        self.last_message_id = response.json().get('id')
+        print(f"✅ Sent via Gmail API (id {self.last_message_id}) to {email_data['to']}")
+        return True
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+
+def main():
+    """Check that the Gmail API backend can authenticate"""
+    parser = argparse.ArgumentParser(description='Check the Gmail API send token')
+    parser.add_argument('--token', default=str(TOKEN_PATH), help='gmail.send token (token_send.pickle)')
+    args = parser.parse_args()
+
+    try:
+        session = authorized_session(Path(args.token))
+    except (ImportError, FileNotFoundError, TokenError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    session.close()
+    print(f"✅ Gmail API send token is valid ({args.token})")
+    print("   Send approved replies with: python3 skills/gmail_reply_handler.py --backend gmail-api")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,14 +6,35 @@ Part of Silver Tier - Actual email sending functionality
 
 import sys
 import json
+import argparse
 import subprocess
 from pathlib import Path
 from datetime import datetime
 import re
 
+sys.path.insert(0, str(Path(__file__).parent))
+from send_queue import SendQueue, SendError, print_summary, DEFAULT_BATCH_SIZE, DEFAULT_RATE_PER_MINUTE
+from gmail_api_sender import GmailApiSender, GMAIL_API, TokenError
+from smtp_sender import SmtpSender, DEFAULT_POOL_SIZE
+
+# Method recorded in the Done log per send backend
+BACKEND_METHODS = {
+    'mock': 'Email MCP Server (mock)',
+    'gmail_api': 'Gmail API (users.messages.send)',
+    'smtp': 'SMTP (pooled connection)',
+}
+
 class GmailReplyHandler:
-    def __init__(self, vault_path: str):
+    def __init__(self, vault_path: str, backend=None):
+        """
+        Args:
+            vault_path: Vault root
+            backend: Send backend with send(email_data) and close(), e.g.
+                     GmailApiSender or SmtpSender; None keeps the mock MCP sender
+        """
         self.vault_path = Path(vault_path)
+        self.backend = backend
+        self.method = backend.name if backend else 'mock'
         self.approved_folder = self.vault_path / 'Approved'
         self.done_folder = self.vault_path / 'Done'
         self.project_root = Path(__file__).parent.parent
@@ -64,7 +85,10 @@ class GmailReplyHandler:
             'to': frontmatter.get('to', frontmatter.get('from', '')),
             'subject': frontmatter.get('subject', 'Re: Your email'),
             'body': '\n'.join(reply_content).strip(),
-            'original_message_id': frontmatter.get('message_id', '')
+            'original_message_id': frontmatter.get('message_id', ''),
+            'thread_id': frontmatter.get('thread_id', ''),
+            'in_reply_to': frontmatter.get('in_reply_to', ''),
+            'references': frontmatter.get('references', '')
         }
 
     def send_email_via_mcp(self, to: str, subject: str, body: str):
@@ -104,41 +128,23 @@ class GmailReplyHandler:
             print("\n❌ Email sending cancelled")
             return False
 
-    def process_approved_emails(self):
-        """Process all approved email replies"""
-        emails = self.find_approved_emails()
+    def send(self, email_data: dict) -> bool:
+        """Send one reply (SendQueue callback)"""
+        if self.backend:
+            return self.backend.send(email_data)
+        return self.send_email_via_mcp(email_data['to'], email_data['subject'], email_data['body'])
 
-        if not emails:
-            print("No approved email replies found.")
-            return
-
-        print(f"\n📋 Found {len(emails)} approved email(s)")
-
-        for email_file in emails:
-            print(f"\n{'='*60}")
-            print(f"Processing: {email_file.name}")
-            print(f"{'='*60}")
-
-            # Extract email data
-            email_data = self.extract_email_data(email_file)
-
-            # Send email
-            success = self.send_email_via_mcp(
-                email_data['to'],
-                email_data['subject'],
-                email_data['body']
-            )
-
-            if success:
-                # Create execution log
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                log_content = f"""---
+    def log_sent(self, email_file: Path, email_data: dict, key: str) -> Path:
+        """Write the Done log for a sent reply and move the approval file to Done"""
+        log_content = f"""---
 type: email_reply
 status: sent
 sent_at: {datetime.now().isoformat()}
 original_file: {email_file.name}
 to: {email_data['to']}
 subject: {email_data['subject']}
+method: {self.method}
+idempotency_key: {key}
 ---
 
 # Email Reply Execution Log
@@ -155,29 +161,84 @@ subject: {email_data['subject']}
 {email_data['body']}
 
 ## Execution Details
-- Method: Email MCP Server / Gmail API
+- Method: {BACKEND_METHODS[self.method]}
 - User approval: Required and obtained
 - Original file: {email_file.name}
 """
 
-                # Save execution log
-                log_file = self.done_folder / f'SENT_{email_file.name}'
-                log_file.write_text(log_content, encoding='utf-8')
+        # Save execution log
+        log_file = self.done_folder / f'SENT_{email_file.name}'
+        log_file.write_text(log_content, encoding='utf-8')
+
+        # Move original to Done
+        done_file = self.done_folder / email_file.name
+        email_file.rename(done_file)
+
+        print(f"\n✅ Execution log saved: {log_file.name}")
+        print(f"✅ Original moved to Done: {done_file.name}")
+        return log_file
+
+    def process_approved_emails(self, batch_size: int = DEFAULT_BATCH_SIZE,
+                                rate_per_minute: float = DEFAULT_RATE_PER_MINUTE,
+                                retry_unconfirmed: bool = False):
+        """Send approved email replies through the send queue (batch_size per run)"""
+        queue = SendQueue(self.vault_path, self.extract_email_data, self.send, self.log_sent,
+                          batch_size=batch_size, rate_per_minute=rate_per_minute,
+                          retry_unconfirmed=retry_unconfirmed)
+        emails = queue.pending()
 
-                # Move original to Done
-                done_file = self.done_folder / email_file.name
-                email_file.rename(done_file)
+        if not emails:
+            print("No approved email replies found.")
+            return
 
-                print(f"\n✅ Execution log saved: {log_file.name}")
-                print(f"✅ Original moved to Done: {done_file.name}")
-            else:
-                print(f"\n⚠️ Email not sent. File remains in Approved folder.")
+        print(f"\n📋 Found {len(emails)} approved email(s)")
+        try:
+            print_summary(queue.run())
+        finally:
+            if self.backend:
+                self.backend.close()
 
 def main():
     """Main entry point"""
-    vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
-    handler = GmailReplyHandler(str(vault_path))
-    handler.process_approved_emails()
+    parser = argparse.ArgumentParser(description='Send approved email replies')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Most emails to send per run (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_PER_MINUTE,
+                        help=f'Most sends per minute (default: {DEFAULT_RATE_PER_MINUTE})')
+    parser.add_argument('--retry-unconfirmed', action='store_true',
+                        help='Send emails whose earlier send was interrupted (check Sent first)')
+    parser.add_argument('--backend', choices=['mock', 'gmail-api', 'smtp'], default='mock',
+                        help='mock: confirm each email by hand, nothing is sent (default); '
+                             'gmail-api: send with token_send.pickle; '
+                             'smtp: send with the SMTP settings in mcp-servers/email/.env')
+    parser.add_argument('--endpoint', default=GMAIL_API,
+                        help='Gmail API base URL (e.g. benchmarks/fake_gmail_api.py for testing)')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help=f'SMTP connections kept open (default: {DEFAULT_POOL_SIZE})')
+    parser.add_argument('--unattended', action='store_true',
+                        help='Never prompt (cron/systemd); needs --backend gmail-api or smtp')
+    args = parser.parse_args()
+    if args.unattended and args.backend == 'mock':
+        # The mock asks before "sending" and would file unsent replies as sent
+        parser.error('--unattended needs a real backend (--backend gmail-api or --backend smtp)')
+
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
+    backend = None
+    try:
+        if args.backend == 'gmail-api':
+            backend = GmailApiSender(args.endpoint)
+        elif args.backend == 'smtp':
+            backend = SmtpSender(pool_size=args.pool_size)
+        if backend:
+            backend.connect()
+    except (ImportError, FileNotFoundError, ValueError, TokenError, SendError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    handler = GmailReplyHandler(str(vault_path), backend=backend)
+    handler.process_approved_emails(batch_size=args.batch_size, rate_per_minute=args.rate,
+                                    retry_unconfirmed=args.retry_unconfirmed)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,174 @@
+"""
+Company Handbook - Parsed, cached view of Company_Handbook.md
+The handbook is parsed once into a section/rule index and re-parsed only
+when the file changes, so drafting and planning code can look up rules
+(tone, approval thresholds, ...) per item without re-reading the file
+"""
+
+import os
+import re
+from pathlib import Path
+
+
+HANDBOOK_FILE = 'Company_Handbook.md'
+
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*$')
+RULE = re.compile(r'^\s*(?:[-*+]|\d+\.)\s+(.*)$')
+NUMBERING = re.compile(r'^\d+\.\s*')
+WORD = re.compile(r'[a-z0-9]+')
+
+# Parsed handbooks by path: (mtime_ns, size, Handbook)
+_cache = {}
+
+
+def section_key(title: str) -> str:
+    """Lookup key for a heading: lowercase, without "2." style numbering"""
+    return NUMBERING.sub('', title).strip().lower()
+
+
+def _yes(value: str) -> bool:
+    return value.strip().lower() in ('yes', 'y', 'true')
+
+
+class Handbook:
+    """
+    Section/rule index of a handbook.
+
+    Each heading becomes a section with its list items (rules), table rows
+    and raw lines. Sections are keyed by their normalized title; a word
+    index maps title and rule words to sections for keyword lookups.
+    """
+
+    def __init__(self, text: str = ''):
+        self.metadata = {}
+        self.sections = {}
+        self._words = {}
+        self._thresholds = None
+        self._parse(text)
+
+    def _parse(self, text: str):
+        lines = text.split('\n')
+        start = 0
+
+        # Frontmatter block (may follow the title line)
+        for i, line in enumerate(lines[:5]):
+            if line.strip() == '---':
+                for j in range(i + 1, len(lines)):
+                    if lines[j].strip() == '---':
+                        for entry in lines[i + 1:j]:
+                            if ':' in entry:
+                                key, value = entry.split(':', 1)
+                                self.metadata[key.strip()] = value.strip()
+                        start = j + 1
+                        break
+                break
+
+        current = None
+        for line in lines[start:]:
+            heading = HEADING.match(line)
+            if heading:
+                current = self._add_section(heading.group(2), len(heading.group(1)))
+                continue
+            if current is None:
+                continue
+            current['lines'].append(line)
+            rule = RULE.match(line)
+            if rule:
+                current['rules'].append(rule.group(1).strip())
+            elif line.strip().startswith('|'):
+                current['_table'].append([cell.strip() for cell in line.strip().strip('|').split('|')])
+
+        for key, section in self.sections.items():
+            section['table'] = self._table_rows(section.pop('_table'))
+            text = ' '.join([section['title']] + section['rules']).lower()
+            for word in set(WORD.findall(text)):
+                self._words.setdefault(word, []).append(key)
+
+    def _add_section(self, title: str, level: int) -> dict:
+        section = {'title': title, 'level': level, 'lines': [], 'rules': [], '_table': []}
+        key = section_key(title)
+        if key in self.sections:
+            key = f"{key} ({len(self.sections)})"
+        self.sections[key] = section
+        return section
+
+    @staticmethod
+    def _table_rows(rows: list) -> list:
+        """Markdown table rows as dicts keyed by the header row"""
+        if len(rows) < 2:
+            return []
+        header = rows[0]
+        return [dict(zip(header, row)) for row in rows[1:]
+                if not all(set(cell) <= set('-: ') for cell in row)]
+
+    def section(self, name: str):
+        """Section by title (case and numbering insensitive), or None"""
+        return self.sections.get(section_key(name))
+
+    def rules(self, name: str) -> list:
+        """List items of a section ([] if there is no such section)"""
+        section = self.section(name)
+        return section['rules'] if section else []
+
+    def search(self, keyword: str) -> list:
+        """Sections whose title or rules contain every word of keyword"""
+        words = WORD.findall(keyword.lower())
+        if not words:
+            return []
+        keys = set(self._words.get(words[0], ()))
+        for word in words[1:]:
+            keys &= set(self._words.get(word, ()))
+        return [self.sections[key] for key in self.sections if key in keys]
+
+    def communication_guidelines(self) -> list:
+        """Tone and external communication rules"""
+        return self.rules('Communication Guidelines')
+
+    def approval_thresholds(self) -> dict:
+        """
+        Approval table by lowercase action type.
+
+        Returns: {action: {'auto_approve': bool, 'requires_approval': bool}}
+        """
+        if self._thresholds is not None:
+            return self._thresholds
+
+        section = self.section('Approval Thresholds')
+        thresholds = {}
+        for row in section['table'] if section else []:
+            action = row.get('Action Type', '').strip().lower()
+            if action:
+                thresholds[action] = {
+                    'auto_approve': _yes(row.get('Auto-Approve', '')),
+                    'requires_approval': _yes(row.get('Requires Approval', '')),
+                }
+        self._thresholds = thresholds
+        return thresholds
+
+    def requires_approval(self, action: str, default: bool = True) -> bool:
+        """Whether an action type needs human approval (default when not listed)"""
+        threshold = self.approval_thresholds().get(action.lower())
+        return threshold['requires_approval'] if threshold else default
+
+
+def load_handbook(vault_path: Path) -> Handbook:
+    """
+    Parsed Company_Handbook.md for a vault.
+
+    Cached per process and re-parsed only when the file's mtime or size
+    changes; a missing handbook gives an empty Handbook.
+    """
+    path = Path(vault_path) / HANDBOOK_FILE
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _cache.pop(path, None)
+        return Handbook()
+
+    cached = _cache.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    handbook = Handbook(path.read_text(encoding='utf-8'))
+    _cache[path] = (st.st_mtime_ns, st.st_size, handbook)
+    return handbook
@@ -6,23 +6,29 @@ Part of Silver Tier implementation
 
 import sys
 from pathlib import Path
+import argparse
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from handbook import load_handbook, Handbook
+from post_schedule import (week_slots, slot_number, slot_expires, scheduled_slots,
+                           sort_posts)
+from post_dedup import PostIndex, DUPLICATE_THRESHOLD
+from work_queue import read_frontmatter
 
-def read_company_handbook(vault_path: Path) -> str:
-    """Read company handbook for brand voice and guidelines"""
-    handbook_path = vault_path / 'Company_Handbook.md'
-    if handbook_path.exists():
-        return handbook_path.read_text(encoding='utf-8')
-    return ""
+
+# Template topics of draft_linkedin_post, in the order scheduled posts rotate through them
+POST_TOPICS = ['expertise', 'value', 'success']
+
+
+def read_company_handbook(vault_path: Path) -> Handbook:
+    """Company handbook (parsed and cached) for brand voice and guidelines"""
+    return load_handbook(vault_path)
 
 
 def draft_linkedin_post(vault_path: Path, topic: str = None) -> str:
     """Draft a LinkedIn post based on company guidelines"""
 
-    # Read handbook for context
-    handbook = read_company_handbook(vault_path)
-
     # Sample post templates based on common business topics
     posts = {
         'expertise': """🚀 Transforming Businesses Through AI Automation
@@ -89,23 +95,72 @@ If you're facing similar challenges, let's talk. Sometimes the biggest breakthro
         return posts['expertise']
 
 
-def create_approval_request(vault_path: Path, post_content: str) -> Path:
-    """Create approval request file in Pending_Approval folder"""
+def create_approval_request(vault_path: Path, post_content: str, publish_at: datetime = None,
+                            topic: str = None, dedup_index: PostIndex = None) -> Path:
+    """
+    Create approval request file in Pending_Approval folder.
+
+    With publish_at the post is scheduled: the file is named after its slot
+    and expires when the slot is missed, instead of at the end of today.
+
+    The draft is checked against past and pending posts; near-duplicates
+    are flagged in the frontmatter. Pass dedup_index when creating several
+    drafts (the caller refreshes and saves it), otherwise one is loaded.
+    """
 
     pending_approval = vault_path / 'Pending_Approval'
     pending_approval.mkdir(exist_ok=True)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = (publish_at or datetime.now()).strftime('%Y%m%d_%H%M%S')
     filename = f'LINKEDIN_POST_{timestamp}.md'
     filepath = pending_approval / filename
 
+    if publish_at:
+        expires = slot_expires(publish_at)
+        schedule_lines = f"topic: {topic or 'expertise'}\npublish_at: {publish_at.isoformat()}\n"
+        schedule_section = f"""## Schedule
+
+- Publish at: {publish_at.strftime('%A %Y-%m-%d %H:%M')}
+- Not published after: {expires.strftime('%A %Y-%m-%d %H:%M')}
+
+"""
+    else:
+        expires = datetime.now().replace(hour=23, minute=59)
+        schedule_lines = ''
+        schedule_section = ''
+
+    index = dedup_index
+    if index is None:
+        index = PostIndex(vault_path)
+        index.refresh()
+    duplicates = index.check(post_content, exclude=filepath.stem)
+    if duplicates:
+        similarity, duplicate_of = duplicates[0]
+        schedule_lines += f"near_duplicate_of: {duplicate_of}\nduplicate_similarity: {similarity:.2f}\n"
+        listed = '\n'.join(f"- {pid} (similarity {score:.2f})" for score, pid in duplicates)
+        schedule_section += f"""## ⚠ Near-Duplicate Warning
+
+This draft is nearly identical to earlier posts or drafts:
+
+{listed}
+
+Edit it to say something new, or reject it.
+
+"""
+
+    # Brand voice and approval rule from the handbook
+    handbook = read_company_handbook(vault_path)
+    requires_approval = handbook.requires_approval('External communications')
+    brand_voice = '\n'.join(f"- {rule}" for rule in handbook.communication_guidelines()) \
+        or '- No communication guidelines found in Company_Handbook.md'
+
     approval_content = f"""---
 type: approval_request
 action: linkedin_post
 created: {datetime.now().isoformat()}
 status: pending
-expires: {datetime.now().replace(hour=23, minute=59).isoformat()}
-requires_approval: true
+{schedule_lines}expires: {expires.isoformat()}
+requires_approval: {str(requires_approval).lower()}
 ---
 
 # LinkedIn Post Approval Required
@@ -116,6 +171,10 @@ requires_approval: true
 
 ---
 
+{schedule_section}## Brand Voice (Company Handbook)
+
+{brand_voice}
+
 ## Instructions
 
 **To APPROVE this post:**
@@ -151,17 +210,50 @@ requires_approval: true
 """
 
     filepath.write_text(approval_content, encoding='utf-8')
+
+    index.add(filepath.stem, post_content)
+    if dedup_index is None:
+        index.save()
     return filepath
 
 
 def check_approved_posts(vault_path: Path) -> list:
-    """Check for approved LinkedIn posts ready to execute"""
-    approved_folder = vault_path / 'Approved'
-    if not approved_folder.exists():
-        return []
-
-    approved_posts = list(approved_folder.glob('LINKEDIN_POST_*.md'))
-    return approved_posts
+    """Check for approved LinkedIn posts ready to execute (due now, earliest slot first)"""
+    due, upcoming, expired = sort_posts(vault_path / 'Approved')
+    for post in expired:
+        print(f"⚠ Skipping {post.name}: its publish slot has passed (move it to Rejected or reschedule)")
+    if upcoming:
+        print(f"{len(upcoming)} approved post(s) scheduled for later")
+    return due
+
+
+def plan_week(vault_path: Path, start: datetime = None, days: int = 7,
+              duplicate_threshold: float = DUPLICATE_THRESHOLD) -> list:
+    """
+    Draft a week of scheduled posts in one pass.
+
+    Every open publish slot in the next `days` days gets a draft in
+    Pending_Approval; topics rotate through POST_TOPICS by slot, so
+    consecutive weeks continue the rotation. Slots already held by a
+    pending or approved post are left alone, so re-running is safe.
+
+    Returns: list of created approval request paths
+    """
+    start = start or datetime.now()
+    taken = scheduled_slots([vault_path / 'Pending_Approval', vault_path / 'Approved'])
+    index = PostIndex(vault_path, threshold=duplicate_threshold)
+    index.refresh()
+
+    created = []
+    for slot in week_slots(start, days):
+        if slot in taken:
+            continue
+        topic = POST_TOPICS[slot_number(slot) % len(POST_TOPICS)]
+        post_content = draft_linkedin_post(vault_path, topic=topic)
+        created.append(create_approval_request(vault_path, post_content, publish_at=slot, topic=topic,
+                                               dedup_index=index))
+    index.save()
+    return created
 
 
 def execute_approved_post(filepath: Path, vault_path: Path):
@@ -227,8 +319,20 @@ original_file: {filepath.name}
 def main():
     """Main entry point for LinkedIn post drafter"""
 
+    parser = argparse.ArgumentParser(description='Draft LinkedIn posts for approval')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--week', action='store_true',
+                        help="Draft a week of scheduled posts (one per open publish slot)")
+    parser.add_argument('--days', type=int, default=7, help='Days to plan with --week (default: 7)')
+    parser.add_argument('--topic', choices=POST_TOPICS, default='expertise',
+                        help='Topic of the single unscheduled draft (default: expertise)')
+    parser.add_argument('--duplicate-threshold', type=float, default=DUPLICATE_THRESHOLD,
+                        help=f'Jaccard similarity flagged as a near-duplicate (default: {DUPLICATE_THRESHOLD})')
+    args = parser.parse_args()
+
     # Get vault path
-    vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
 
     if not vault_path.exists():
         print(f"Error: Vault not found at {vault_path}")
@@ -241,22 +345,41 @@ def main():
     # Check for approved posts first
     approved_posts = check_approved_posts(vault_path)
     if approved_posts:
-        print(f"Found {len(approved_posts)} approved post(s) ready to execute\n")
+        print(f"Found {len(approved_posts)} approved post(s) due to execute\n")
         for post in approved_posts:
             print(f"Executing: {post.name}")
             log_path = execute_approved_post(post, vault_path)
             print(f"  ✓ Execution log created: {log_path.name}")
         print()
 
-    # Draft new post
-    print("Drafting new LinkedIn post...")
-    post_content = draft_linkedin_post(vault_path, topic='expertise')
-
-    # Create approval request
-    approval_path = create_approval_request(vault_path, post_content)
-
-    print(f"✓ Draft created and moved to Pending_Approval")
-    print(f"  File: {approval_path.name}")
+    if args.week:
+        print(f"Planning LinkedIn posts for the next {args.days} days...")
+        created = plan_week(vault_path, days=args.days, duplicate_threshold=args.duplicate_threshold)
+        if not created:
+            print("✓ Every publish slot already has a post")
+            return
+        print(f"✓ {len(created)} scheduled draft(s) created in Pending_Approval")
+        for approval_path in created:
+            print(f"  File: {approval_path.name}")
+    else:
+        # Draft new post
+        print("Drafting new LinkedIn post...")
+        post_content = draft_linkedin_post(vault_path, topic=args.topic)
+
+        # Create approval request (checked for near-duplicates of earlier posts)
+        index = PostIndex(vault_path, threshold=args.duplicate_threshold)
+        index.refresh()
+        approval_path = create_approval_request(vault_path, post_content, dedup_index=index)
+        index.save()
+
+        print(f"✓ Draft created and moved to Pending_Approval")
+        print(f"  File: {approval_path.name}")
+        created = [approval_path]
+
+    for approval_path in created:
+        duplicate_of = read_frontmatter(approval_path).get('near_duplicate_of')
+        if duplicate_of:
+            print(f"  ⚠ {approval_path.name} is a near-duplicate of {duplicate_of}")
     print(f"\n{'=' * 50}")
     print("HUMAN-IN-THE-LOOP WORKFLOW ACTIVE")
     print("=" * 50)
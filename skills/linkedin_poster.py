@@ -11,6 +11,9 @@ from pathlib import Path
 from datetime import datetime
 import time
 
+sys.path.insert(0, str(Path(__file__).parent))
+from post_schedule import due_posts
+
 class LinkedInPoster:
     def __init__(self, vault_path: str):
         self.vault_path = Path(vault_path)
@@ -19,9 +22,8 @@ class LinkedInPoster:
         self.playwright_script = Path(__file__).parent.parent / '.claude' / 'skills' / 'browsing-with-playwright' / 'scripts'
 
     def find_approved_posts(self):
-        """Find approved LinkedIn posts"""
-        posts = list(self.approved_folder.glob('LINKEDIN_POST_*.md'))
-        return posts
+        """Find approved LinkedIn posts that are due (scheduled ones wait for their slot)"""
+        return due_posts(self.approved_folder)
 
     def extract_post_content(self, filepath: Path):
         """Extract post content from markdown file"""
@@ -131,7 +133,7 @@ class LinkedInPoster:
         posts = self.find_approved_posts()
 
         if not posts:
-            print("No approved LinkedIn posts found.")
+            print("No approved LinkedIn posts due.")
             return
 
         print(f"\n📋 Found {len(posts)} approved post(s)")
@@ -0,0 +1,147 @@
+"""
+Plan Registry - Tracks which action items already have a plan
+Lets the reasoning loop skip items that have not changed since their last plan
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer assumption
+    fcntl = None
+
+
+def content_digest(content: str) -> str:
+    """Return the content hash used to detect modified action items"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class PlanRegistry:
+    """
+    Registry of planned action items, keyed by source filename.
+
+    Each entry stores the file identity (inode, size, mtime) and a content
+    hash. An item whose stat identity is unchanged is skipped without being
+    read; an item whose stat changed but whose hash is the same is skipped
+    after one read. Only new or modified items get a new plan.
+
+    Several processes may share the registry (the daemon and a cron run):
+    save() merges this process's changes into the file under a lock
+    instead of overwriting it, and reload() picks up other writers' entries.
+    """
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = Path(vault_path)
+        self.state_file = self.vault_path / '.state' / 'plan_registry.json'
+        self.lock_file = self.vault_path / '.state' / 'plan_registry.lock'
+        self._changed = set()
+        self._removed = set()
+        self._loaded_mtime_ns = None
+        self.entries = self._load_state()
+
+    def _load_state(self) -> dict:
+        """Load registry entries from the state file"""
+        try:
+            self._loaded_mtime_ns = self.state_file.stat().st_mtime_ns
+            with open(self.state_file, 'r') as f:
+                return json.load(f).get('entries', {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Warning: Could not load plan registry: {e}")
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        """Hold the registry lock while reading and rewriting the state file"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, 'w') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _merged(self, entries: dict) -> dict:
+        """File entries with this process's unsaved changes applied on top"""
+        for name in self._removed:
+            entries.pop(name, None)
+        for name in self._changed:
+            entries[name] = self.entries[name]
+        return entries
+
+    def reload(self):
+        """Pick up entries other processes saved (no-op if the file is unchanged)"""
+        try:
+            mtime_ns = self.state_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime_ns != self._loaded_mtime_ns:
+            with self._locked():
+                self.entries = self._merged(self._load_state())
+
+    def save(self):
+        """Merge changes into the state file (atomic replace, only when changed)"""
+        if not (self._changed or self._removed):
+            return
+        with self._locked():
+            entries = self._merged(self._load_state())
+            tmp_file = self.state_file.with_name(f'plan_registry.{os.getpid()}.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump({'entries': entries}, f)
+            os.replace(tmp_file, self.state_file)
+            self._loaded_mtime_ns = self.state_file.stat().st_mtime_ns
+        self.entries = entries
+        self._changed.clear()
+        self._removed.clear()
+
+    @staticmethod
+    def identity(stat_result) -> list:
+        """Stat-based identity of a source file"""
+        return [stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns]
+
+    def is_unchanged(self, filename: str, stat_result) -> bool:
+        """True if the file's stat identity matches its registered plan"""
+        entry = self.entries.get(filename)
+        return entry is not None and entry.get('identity') == self.identity(stat_result)
+
+    def has_plan_for(self, filename: str, digest: str) -> bool:
+        """True if a plan was already generated for this exact content"""
+        entry = self.entries.get(filename)
+        return entry is not None and entry.get('sha256') == digest
+
+    def refresh_identity(self, filename: str, stat_result):
+        """Update stat identity for a file whose content did not change"""
+        self.entries[filename]['identity'] = self.identity(stat_result)
+        self._changed.add(filename)
+
+    def record(self, filename: str, stat_result, digest: str, plan_name: str):
+        """Register a newly generated plan for an action item"""
+        self.entries[filename] = {
+            'identity': self.identity(stat_result),
+            'sha256': digest,
+            'plan': plan_name,
+        }
+        self._changed.add(filename)
+        self._removed.discard(filename)
+
+    def prune(self, live_filenames: set):
+        """Drop entries for items that have left Needs_Action"""
+        stale = [name for name in self.entries if name not in live_filenames]
+        return self.forget(stale)
+
+    def forget(self, filenames) -> int:
+        """Drop entries for the given items (deleted or moved out)"""
+        removed = 0
+        for name in filenames:
+            if self.entries.pop(name, None) is not None:
+                self._changed.discard(name)
+                self._removed.add(name)
+                removed += 1
+        return removed
@@ -0,0 +1,98 @@
+"""
+Plan Templates - Registry of precompiled plan templates keyed by action type
+Templates live in skills/reasoning_loop/templates (built-in) and in the
+vault's Templates/Plans folder (overrides and new action types)
+"""
+
+import os
+import re
+from pathlib import Path
+from datetime import datetime
+
+
+BUILTIN_TEMPLATES = Path(__file__).parent / 'reasoning_loop' / 'templates'
+FALLBACK_TYPE = 'generic'
+
+# {{key}} or {{key|default}}
+PLACEHOLDER = re.compile(r'\{\{\s*([A-Za-z_][\w-]*)\s*(?:\|([^}]*))?\}\}')
+
+
+class CompiledTemplate:
+    """A template split once into literal text and (key, default) slots"""
+
+    def __init__(self, source: str):
+        self.parts = []
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            self.parts.append(source[position:match.start()])
+            self.parts.append((match.group(1), match.group(2) or ''))
+            position = match.end()
+        self.parts.append(source[position:])
+
+    def render(self, values: dict) -> str:
+        """Render the template with values, using slot defaults for missing or None keys"""
+        rendered = []
+        for part in self.parts:
+            if not isinstance(part, str):
+                key, default = part
+                value = values.get(key)
+                part = default if value is None else str(value)
+            rendered.append(part)
+        return ''.join(rendered)
+
+
+class PlanTemplateRegistry:
+    """
+    Plan templates keyed by action `type`.
+
+    A template for type `X` is the file `X.md`; a vault template overrides the
+    built-in one of the same name. Templates are compiled once and recompiled
+    only when refresh() sees a changed mtime, so rendering never re-reads or
+    re-parses template files.
+    """
+
+    def __init__(self, vault_path: Path = None):
+        self.search_dirs = [BUILTIN_TEMPLATES]
+        if vault_path is not None:
+            # Later directories take precedence
+            self.search_dirs.append(Path(vault_path) / 'Templates' / 'Plans')
+        self.templates = {}
+        self._mtimes = {}
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Recompile templates whose files were added or modified; returns count recompiled"""
+        found = {}
+        for folder in self.search_dirs:
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_file() and entry.name.endswith('.md'):
+                            found[entry.name[:-3]] = (entry.path, entry.stat().st_mtime_ns)
+            except FileNotFoundError:
+                continue
+
+        recompiled = 0
+        for action_type, signature in found.items():
+            if self._mtimes.get(action_type) != signature:
+                source = Path(signature[0]).read_text(encoding='utf-8')
+                self.templates[action_type] = CompiledTemplate(source)
+                self._mtimes[action_type] = signature
+                recompiled += 1
+
+        for action_type in set(self.templates) - set(found):
+            del self.templates[action_type]
+            del self._mtimes[action_type]
+
+        return recompiled
+
+    def get(self, action_type: str) -> CompiledTemplate:
+        """Return the template for an action type, falling back to the generic plan"""
+        return self.templates.get(action_type) or self.templates[FALLBACK_TYPE]
+
+    def render(self, action_type: str, action_item: dict) -> str:
+        """Render the plan for an action item with the given template type"""
+        values = dict(action_item['metadata'])
+        values['created'] = datetime.now().isoformat()
+        values['original_file'] = action_item['filename']
+        return self.get(action_type).render(values)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Post Dedup - Near-duplicate detection for LinkedIn posts
+Executed posts (Done/EXECUTED_LINKEDIN_POST_*) and pending or approved
+drafts are kept as MinHash signatures in an LSH index, so a new draft is
+checked against the whole posting history with a few bucket lookups
+"""
+
+import os
+import sys
+import json
+import zlib
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from text_features import NUMPY_AVAILABLE, np, tokenize, section_text
+
+
+NUM_PERM = 128
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = 0.7
+
+# Universal hashing modulo a Mersenne prime: a * x stays below 2**62
+PRIME = (1 << 31) - 1
+_rng = random.Random(20260101)
+PERMUTATIONS = [(_rng.randrange(1, PRIME), _rng.randrange(0, PRIME)) for _ in range(NUM_PERM)]
+
+# Where posts live: (folder, filename prefix)
+POST_SOURCES = [('Done', 'EXECUTED_LINKEDIN_POST_'),
+                ('Pending_Approval', 'LINKEDIN_POST_'),
+                ('Approved', 'LINKEDIN_POST_')]
+
+
+def post_id(name: str) -> str:
+    """Post id shared by a draft and its execution log"""
+    name = name[:-3] if name.endswith('.md') else name
+    return name[len('EXECUTED_'):] if name.startswith('EXECUTED_') else name
+
+
+def post_text(content: str) -> str:
+    """Post body of a draft or execution log"""
+    return section_text(content, 'Content Posted') or section_text(content, 'Draft Post Content')
+
+
+def shingles(text: str) -> set:
+    """crc32 hashes of the word 3-grams of a text"""
+    tokens = tokenize(text)
+    if len(tokens) < SHINGLE_SIZE:
+        grams = tokens
+    else:
+        grams = [' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+    return {zlib.crc32(gram.encode('utf-8')) % PRIME for gram in grams}
+
+
+if NUMPY_AVAILABLE:
+    _A = np.array([a for a, _ in PERMUTATIONS], dtype=np.uint64)
+    _B = np.array([b for _, b in PERMUTATIONS], dtype=np.uint64)
+
+
+def minhash(text: str) -> list:
+    """MinHash signature (NUM_PERM values) of a text's shingles"""
+    hashes = shingles(text)
+    if not hashes:
+        return [PRIME] * NUM_PERM
+    if NUMPY_AVAILABLE:
+        x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        return ((np.outer(_A, x) + _B[:, None]) % PRIME).min(axis=1).tolist()
+    return [min((a * x + b) % PRIME for x in hashes) for a, b in PERMUTATIONS]
+
+
+def similarity(first: list, second: list) -> float:
+    """Jaccard similarity estimated from two signatures"""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+def lsh_bands(threshold: float) -> tuple:
+    """
+    (bands, rows) whose candidate curve is steep just below threshold.
+
+    Pairs with similarity s share a bucket with probability
+    1 - (1 - s**rows)**bands, which crosses 1/2 near (1/bands)**(1/rows);
+    the most selective split whose crossing is below 0.85 * threshold is
+    used, so true near-duplicates are almost never missed.
+    """
+    best = (NUM_PERM, 1)
+    for rows in range(1, NUM_PERM + 1):
+        if NUM_PERM % rows:
+            continue
+        bands = NUM_PERM // rows
+        if (1 / bands) ** (1 / rows) <= 0.85 * threshold:
+            best = (bands, rows)
+    return best
+
+
+class PostIndex:
+    """
+    MinHash/LSH index of LinkedIn posts in .state/post_dedup.json.
+
+    Signatures are stored per post id; refresh() lists the post folders
+    (names only) and reads just the posts that are new, dropping posts that
+    left every folder (e.g. rejected drafts). A check hashes the draft once
+    and looks up one bucket per band, so its cost does not grow with the
+    history.
+    """
+
+    def __init__(self, vault_path: Path, threshold: float = DUPLICATE_THRESHOLD):
+        self.vault_path = Path(vault_path)
+        self.state_file = self.vault_path / '.state' / 'post_dedup.json'
+        self.threshold = threshold
+        self.bands, self.rows = lsh_bands(threshold)
+        self.signatures = {}
+        self.buckets = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if state.get('num_perm') != NUM_PERM:
+            return
+        for pid, signature in state.get('signatures', {}).items():
+            self._insert(pid, signature)
+
+    def save(self):
+        """Persist the signatures if they changed (atomic replace)"""
+        if not self._dirty:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_name(f'post_dedup.{os.getpid()}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'num_perm': NUM_PERM,
+                       'signatures': {pid: [int(x) for x in signature]
+                                      for pid, signature in self.signatures.items()}}, f)
+        os.replace(tmp_file, self.state_file)
+        self._dirty = False
+
+    def _band_keys(self, signature: list):
+        for band in range(self.bands):
+            yield band, tuple(int(x) for x in signature[band * self.rows:(band + 1) * self.rows])
+
+    def _insert(self, pid: str, signature: list):
+        if NUMPY_AVAILABLE:
+            signature = np.asarray(signature, dtype=np.uint32)
+        self.signatures[pid] = signature
+        for key in self._band_keys(signature):
+            self.buckets.setdefault(key, set()).add(pid)
+
+    def remove(self, pid: str):
+        signature = self.signatures.pop(pid, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            bucket = self.buckets.get(key)
+            if bucket:
+                bucket.discard(pid)
+                if not bucket:
+                    del self.buckets[key]
+        self._dirty = True
+
+    def add(self, pid: str, text: str):
+        """Index (or re-index) a post's text"""
+        self.remove(pid)
+        self._insert(pid, minhash(text))
+        self._dirty = True
+
+    def refresh(self) -> int:
+        """
+        Sync the index with the post folders.
+
+        Returns: number of posts added
+        """
+        present = {}
+        for folder, prefix in POST_SOURCES:
+            try:
+                with os.scandir(self.vault_path / folder) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(prefix) and entry.name.endswith('.md'):
+                            present.setdefault(post_id(entry.name), entry.path)
+            except FileNotFoundError:
+                continue
+
+        for pid in [pid for pid in self.signatures if pid not in present]:
+            self.remove(pid)
+
+        added = 0
+        for pid, path in present.items():
+            if pid in self.signatures:
+                continue
+            try:
+                self.add(pid, post_text(Path(path).read_text(encoding='utf-8')))
+                added += 1
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Warning: Could not index {Path(path).name}: {e}")
+        return added
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def check(self, text: str, exclude: str = None) -> list:
+        """
+        Indexed posts that are near-duplicates of a text.
+
+        Returns: list of (similarity, post_id) at or above the threshold,
+                 most similar first
+        """
+        signature = minhash(text)
+        candidates = set()
+        for key in self._band_keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        candidates.discard(exclude)
+
+        if not candidates:
+            return []
+        candidates = list(candidates)
+        if NUMPY_AVAILABLE:
+            # All candidates in one comparison instead of NUM_PERM steps each
+            rows = np.stack([self.signatures[pid] for pid in candidates])
+            scores = (rows == np.asarray(signature, dtype=np.uint32)).mean(axis=1).tolist()
+        else:
+            scores = [similarity(signature, self.signatures[pid]) for pid in candidates]
+        return sorted(((score, pid) for score, pid in zip(scores, candidates) if score >= self.threshold),
+                      reverse=True)
+
+
+def main():
+    """Check the vault's LinkedIn drafts for near-duplicates"""
+    parser = argparse.ArgumentParser(description='Find near-duplicate LinkedIn posts')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD,
+                        help=f'Jaccard similarity that counts as a duplicate (default: {DUPLICATE_THRESHOLD})')
+    parser.add_argument('--text', help='Check this text instead of the pending drafts')
+    args = parser.parse_args()
+
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
+
+    index = PostIndex(vault_path, threshold=args.threshold)
+    added = index.refresh()
+    index.save()
+    print(f"Post index: {len(index)} posts ({added} new)")
+
+    if args.text:
+        drafts = [('text', args.text)]
+    else:
+        pending = vault_path / 'Pending_Approval'
+        drafts = [(path.stem, post_text(path.read_text(encoding='utf-8')))
+                  for path in sorted(pending.glob('LINKEDIN_POST_*.md'))] if pending.exists() else []
+
+    for name, text in drafts:
+        matches = index.check(text, exclude=name)
+        if matches:
+            listed = ', '.join(f"{pid} ({score:.2f})" for score, pid in matches[:3])
+            print(f"⚠ {name}: near-duplicate of {listed}")
+        else:
+            print(f"✓ {name}: no near-duplicates")
+
+
+if __name__ == '__main__':
+    main()
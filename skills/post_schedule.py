@@ -0,0 +1,113 @@
+"""
+Post Schedule - Publish slots for LinkedIn posts
+A week of drafts is planned in one pass: each draft carries a publish_at
+slot and an expires time in its frontmatter, and posters only publish
+approved posts whose slot has come, earliest slot first
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent))
+from work_queue import read_frontmatter, parse_timestamp
+
+
+POST_PATTERN = 'LINKEDIN_POST_*.md'
+
+# Default publishing rhythm: Monday, Wednesday and Friday at 09:00
+SLOT_WEEKDAYS = (0, 2, 4)
+SLOT_TIME = (9, 0)
+
+# A slot that was missed by more than this is stale and not published
+SLOT_GRACE_HOURS = 12
+
+
+def week_slots(start: datetime, days: int = 7, weekdays=SLOT_WEEKDAYS, slot_time=SLOT_TIME) -> list:
+    """Publish slots after start within the next `days` days"""
+    hour, minute = slot_time
+    slots = []
+    for offset in range(days + 1):
+        slot = (start + timedelta(days=offset)).replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if slot.weekday() in weekdays and start < slot <= start + timedelta(days=days):
+            slots.append(slot)
+    return slots
+
+
+def slot_number(slot: datetime, weekdays=SLOT_WEEKDAYS) -> int:
+    """Running number of a slot across weeks (Monday-aligned), for topic rotation"""
+    week = (slot.toordinal() - 1) // 7
+    return week * len(weekdays) + sorted(weekdays).index(slot.weekday())
+
+
+def slot_expires(slot: datetime) -> datetime:
+    return slot + timedelta(hours=SLOT_GRACE_HOURS)
+
+
+def read_schedule(filepath: Path) -> tuple:
+    """
+    Schedule of a post file.
+
+    Returns: (publish_at, expires); publish_at is None for unscheduled posts
+    """
+    frontmatter = read_frontmatter(filepath)
+    return parse_timestamp(frontmatter.get('publish_at')), parse_timestamp(frontmatter.get('expires'))
+
+
+def scheduled_slots(folders: list) -> set:
+    """publish_at slots already taken by posts in the given folders"""
+    taken = set()
+    for folder in folders:
+        if not folder.exists():
+            continue
+        for path in folder.glob(POST_PATTERN):
+            try:
+                publish_at, _ = read_schedule(path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            if publish_at:
+                taken.add(publish_at)
+    return taken
+
+
+def sort_posts(folder: Path, now: datetime = None) -> tuple:
+    """
+    Split a folder's posts by schedule.
+
+    Unscheduled posts are due immediately, as before scheduling existed;
+    their expires only applies to the approval request. Scheduled posts are
+    due from publish_at until their expires.
+
+    Returns: (due, upcoming, expired) lists of paths, earliest slot first
+    """
+    now = now or datetime.now()
+    due, upcoming, expired = [], [], []
+    if not folder.exists():
+        return due, upcoming, expired
+
+    for path in folder.glob(POST_PATTERN):
+        try:
+            publish_at, expires = read_schedule(path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        if publish_at is None:
+            due.append((datetime.min, path))
+        elif publish_at > now:
+            upcoming.append((publish_at, path))
+        elif expires and expires < now:
+            expired.append((publish_at, path))
+        else:
+            due.append((publish_at, path))
+
+    return tuple([path for _, path in sorted(group)] for group in (due, upcoming, expired))
+
+
+def due_posts(folder: Path, now: datetime = None) -> list:
+    """Posts in folder that should be published now, earliest slot first"""
+    return sort_posts(folder, now)[0]
+
+
+def next_slot(folder: Path, now: datetime = None):
+    """Earliest upcoming publish_at in folder, or None"""
+    upcoming = sort_posts(folder, now)[1]
+    return read_schedule(upcoming[0])[0] if upcoming else None
@@ -3,17 +3,166 @@ Process Needs Action Skill
 Processes files in the Needs_Action folder and moves them to Done when complete
 """
 
+import os
 import sys
+import errno
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).parent))
+from work_queue import WorkQueue, print_wait_report
+from dashboard import Dashboard, count_entries
+from work_claims import ClaimManager
+from run_journal import RunJournal
 
-def process_needs_action(vault_path: str = None):
+
+PROCESSED_MARKER = '**Processed**:'
+JOURNAL_FILE = 'journal.jsonl'
+
+
+def move_to_done(action_file: Path, done_path: Path):
+    """
+    Move an action file into Done and stamp it as processed.
+
+    The file is renamed (a metadata-only operation on the same filesystem)
+    and the processed footer is appended in place, so the content is never
+    read or rewritten. Falls back to copy + unlink across filesystems.
+    """
+    try:
+        os.replace(action_file, done_path)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        tmp_path = done_path.with_name(f'.{done_path.name}.tmp')
+        shutil.copy2(action_file, tmp_path)
+        os.replace(tmp_path, done_path)
+        action_file.unlink()
+
+    stamp_processed(done_path)
+
+
+def stamp_processed(done_path: Path):
+    """Append the processed footer to a file in Done"""
+    with open(done_path, 'a', encoding='utf-8') as f:
+        f.write(f"\n\n---\n{PROCESSED_MARKER} {datetime.now().isoformat()}\n")
+
+
+def is_stamped(done_path: Path) -> bool:
+    """True if the file already ends with a processed footer"""
+    with open(done_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 128))
+        return PROCESSED_MARKER.encode('utf-8') in f.read()
+
+
+def recover_journal(claim_dir: Path):
+    """
+    Finish the uncommitted batch of an interrupted worker.
+
+    Items already renamed into Done but not yet stamped get their footer;
+    items still in the claim folder are returned to the queue by the caller.
+    Only the journal's last open batch is checked, never the whole of Done.
+    """
+    journal = RunJournal(claim_dir / JOURNAL_FILE)
+    recovered = 0
+    for _, done_path in journal.uncommitted():
+        if done_path.exists() and not is_stamped(done_path):
+            stamp_processed(done_path)
+            recovered += 1
+    if recovered:
+        print(f"Recovered {recovered} half-processed item(s) from an interrupted run")
+    journal.clear()
+
+
+def read_preview(action_file: Path, length: int = 200) -> str:
+    """Read only the first `length` characters of a file"""
+    with open(action_file, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read(length)
+
+
+def drain_queue(vault_path: Path, preview: bool = False, batch_size: int = 100) -> dict:
+    """
+    Claim and process items from Needs_Action until the queue is empty.
+
+    Safe to run in several processes at once: each item is claimed by an
+    atomic rename into this worker's in-progress folder before it is moved
+    to Done, and items left behind by crashed workers are reclaimed first.
+    Progress is journaled per batch, so an interrupted run is resumed from
+    its last committed batch.
+
+    Returns: dict with found/processed counts and the taken queue items
+    """
+    needs_action = vault_path / 'Needs_Action'
+    done_folder = vault_path / 'Done'
+
+    claims = ClaimManager(needs_action).acquire()
+    reclaimed = claims.reclaim_expired(recover=recover_journal)
+    if reclaimed:
+        print(f"Reclaimed {reclaimed} item(s) from crashed workers")
+
+    journal = RunJournal(claims.claim_dir / JOURNAL_FILE)
+
+    # Get all files in Needs_Action, most urgent first
+    queue = WorkQueue.from_folder(needs_action)
+    result = {'found': len(queue), 'processed': 0, 'items': []}
+    pending = iter(queue)
+
+    try:
+        while True:
+            # Claim the next batch and record where each item will go
+            batch = []
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            for action_file in pending:
+                claimed = claims.claim(action_file)
+                if claimed is None:
+                    continue  # Taken by another worker
+                done_path = done_folder / f"{timestamp}_{action_file.name}"
+                batch.append((claimed, done_path, queue.taken[-1]))
+                if len(batch) >= batch_size:
+                    break
+
+            if not batch:
+                break
+
+            batch_id = journal.begin_batch([(claimed, done_path) for claimed, done_path, _ in batch])
+
+            for claimed, done_path, item in batch:
+                try:
+                    print(f"\nProcessing: {claimed.name}")
+
+                    if preview:
+                        print(f"Content preview: {read_preview(claimed)}...")
+
+                    move_to_done(claimed, done_path)
+
+                    print(f"✓ Moved to Done: {done_path.name}")
+                    result['processed'] += 1
+                    result['items'].append(item)
+
+                except Exception as e:
+                    print(f"✗ Error processing {claimed.name}: {e}")
+
+            journal.commit(batch_id)
+            claims.renew()
+    finally:
+        claims.release(recover=recover_journal)
+
+    return result
+
+
+def process_needs_action(vault_path: str = None, preview: bool = False, workers: int = 1,
+                         batch_size: int = 100):
     """
     Process all files in Needs_Action folder
 
     Args:
         vault_path: Path to the Obsidian vault (default: AI_Employee_Vault)
+        preview: Print the first 200 characters of each file
+        workers: Number of worker processes draining the queue concurrently
+        batch_size: Items per journaled batch (checkpoint interval)
     """
     if vault_path is None:
         vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
@@ -28,41 +177,28 @@ def process_needs_action(vault_path: str = None):
     needs_action.mkdir(parents=True, exist_ok=True)
     done_folder.mkdir(parents=True, exist_ok=True)
 
-    # Get all files in Needs_Action
-    action_files = sorted(needs_action.glob('*.md'))
+    # Return items held by crashed workers before sizing the queue
+    reclaimed = ClaimManager(needs_action).reclaim_expired(recover=recover_journal)
+    if reclaimed:
+        print(f"Reclaimed {reclaimed} item(s) from crashed workers")
 
-    if not action_files:
+    total = count_entries(needs_action)
+
+    if not total:
         print("No files to process in Needs_Action folder")
         return
 
-    print(f"Found {len(action_files)} file(s) to process")
-
-    processed_count = 0
-
-    for action_file in action_files:
-        try:
-            print(f"\nProcessing: {action_file.name}")
-
-            # Read the file content
-            content = action_file.read_text(encoding='utf-8')
-            print(f"Content preview: {content[:200]}...")
-
-            # Add processing timestamp
-            processed_content = content + f"\n\n---\n**Processed**: {datetime.now().isoformat()}\n"
-
-            # Move to Done folder with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            done_filename = f"{timestamp}_{action_file.name}"
-            done_path = done_folder / done_filename
-
-            done_path.write_text(processed_content, encoding='utf-8')
-            action_file.unlink()  # Remove from Needs_Action
+    print(f"Found {total} file(s) to process")
 
-            print(f"✓ Moved to Done: {done_filename}")
-            processed_count += 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(drain_queue, vault_path, preview, batch_size) for _ in range(workers)]
+            results = [future.result() for future in futures]
+    else:
+        results = [drain_queue(vault_path, preview, batch_size)]
 
-        except Exception as e:
-            print(f"✗ Error processing {action_file.name}: {e}")
+    processed_count = sum(r['processed'] for r in results)
+    taken = [item for r in results for item in r['items']]
 
     # Update Dashboard
     try:
@@ -71,7 +207,8 @@ def process_needs_action(vault_path: str = None):
         print(f"Warning: Could not update dashboard: {e}")
 
     print(f"\n{'='*50}")
-    print(f"Processing complete: {processed_count}/{len(action_files)} files processed")
+    print(f"Processing complete: {processed_count}/{total} files processed")
+    print_wait_report(WorkQueue().wait_report(taken))
 
 
 def update_dashboard(dashboard_path: Path, processed_count: int):
@@ -79,32 +216,25 @@ def update_dashboard(dashboard_path: Path, processed_count: int):
     if not dashboard_path.exists():
         return
 
-    content = dashboard_path.read_text(encoding='utf-8')
-
-    # Update last_updated
-    content = content.replace(
-        f"last_updated: {datetime.now().strftime('%Y-%m-%d')}",
-        f"last_updated: {datetime.now().strftime('%Y-%m-%d')}"
-    )
-
-    # Add to recent activity
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M')
-    activity_line = f"- [{timestamp}] Processed {processed_count} file(s) from Needs_Action"
-
-    if "## Recent Activity" in content:
-        # Replace "_No activity yet_" or add to existing activity
-        if "_No activity yet_" in content:
-            content = content.replace("_No activity yet_", activity_line)
-        else:
-            # Add after "## Recent Activity"
-            content = content.replace(
-                "## Recent Activity\n",
-                f"## Recent Activity\n{activity_line}\n"
-            )
-
-    dashboard_path.write_text(content, encoding='utf-8')
+    if processed_count:
+        Dashboard(dashboard_path.parent).record(
+            'tasks_completed', processed_count,
+            f"Processed {processed_count} file(s) from Needs_Action"
+        )
+    else:
+        Dashboard(dashboard_path.parent).refresh()
 
 
 if __name__ == '__main__':
-    vault_path = sys.argv[1] if len(sys.argv) > 1 else None
-    process_needs_action(vault_path)
+    parser = argparse.ArgumentParser(description='Process Needs_Action items into Done')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--preview', action='store_true',
+                        help='Print a 200-character preview of each file')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Drain the queue with N concurrent worker processes')
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='Items per checkpointed batch (default: 100)')
+    args = parser.parse_args()
+    process_needs_action(args.vault_path, preview=args.preview, workers=args.workers,
+                         batch_size=args.batch_size)
@@ -4,22 +4,63 @@ Reads and summarizes the current state of the AI Employee vault
 """
 
 import sys
+import json
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from vault_status import VaultStatus, StatusSnapshot, env_lines
+from dashboard import Dashboard
 
-def read_vault_status(vault_path: str = None):
+
+def dashboard_lines(vault_path: Path):
     """
-    Read and display the current status of the AI Employee vault
+    Summary and latest activity lines for the status report.
 
-    Args:
-        vault_path: Path to the Obsidian vault (default: AI_Employee_Vault)
+    Read from the dashboard renderer's state when it exists, so Dashboard.md
+    does not have to be scanned; falls back to parsing Dashboard.md.
+
+    Returns: list of lines, or None if there is no dashboard
     """
-    if vault_path is None:
-        vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
-    else:
-        vault_path = Path(vault_path)
+    summary = Dashboard(vault_path).summary()
+    if summary is not None:
+        lines = [f"- Tasks Completed: {summary['tasks_today']}",
+                 f"- Messages Processed: {summary['messages_today']}"]
+        lines.extend(summary['recent'][:1])
+        return lines
+
+    dashboard = vault_path / 'Dashboard.md'
+    if not dashboard.exists():
+        return None
+
+    lines = []
+    in_summary = False
+    in_activity = False
+    with open(dashboard, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if '## Today\'s Summary' in line:
+                in_summary = True
+                continue
+            elif '## Recent Activity' in line:
+                in_summary = False
+                in_activity = True
+                continue
+            elif line.startswith('##'):
+                in_summary = False
+                in_activity = False
+
+            if in_summary and line.strip() and not line.startswith('---'):
+                lines.append(line.strip())
+            elif in_activity and line.strip() and not line.startswith('---') and not line.startswith('*Last'):
+                lines.append(line.strip())
+                break  # Only show first activity line
+    return lines
+
 
+def print_status(vault_path: Path, status: VaultStatus, summary_lines: list = None):
+    """Print the status report from a scanned VaultStatus"""
     print(f"{'='*60}")
     print(f"AI EMPLOYEE VAULT STATUS")
     print(f"{'='*60}")
@@ -27,75 +68,37 @@ def read_vault_status(vault_path: str = None):
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
 
-    # Check folder status
-    folders = {
-        'Inbox': vault_path / 'Inbox',
-        'Needs_Action': vault_path / 'Needs_Action',
-        'Done': vault_path / 'Done',
-        'Plans': vault_path / 'Plans',
-        'Pending_Approval': vault_path / 'Pending_Approval',
-        'Approved': vault_path / 'Approved',
-        'Rejected': vault_path / 'Rejected',
-        'Logs': vault_path / 'Logs'
-    }
-
     print("FOLDER STATUS:")
     print("-" * 60)
-    for name, folder in folders.items():
-        if folder.exists():
-            file_count = len(list(folder.glob('*')))
+    for name in status.folders:
+        file_count = status.count(name)
+        if file_count is not None:
             print(f"  {name:20} ✓ ({file_count} items)")
         else:
             print(f"  {name:20} ✗ (missing)")
 
     print()
 
-    # Read Dashboard
-    dashboard = vault_path / 'Dashboard.md'
-    if dashboard.exists():
+    if summary_lines is not None:
         print("DASHBOARD SUMMARY:")
         print("-" * 60)
-        content = dashboard.read_text(encoding='utf-8')
-
-        # Extract key sections
-        lines = content.split('\n')
-        in_summary = False
-        in_activity = False
-
-        for line in lines:
-            if '## Today\'s Summary' in line:
-                in_summary = True
-                continue
-            elif '## Recent Activity' in line:
-                in_summary = False
-                in_activity = True
-                continue
-            elif line.startswith('##'):
-                in_summary = False
-                in_activity = False
-
-            if in_summary and line.strip() and not line.startswith('---'):
-                print(f"  {line.strip()}")
-            elif in_activity and line.strip() and not line.startswith('---') and not line.startswith('*Last'):
-                print(f"  {line.strip()}")
-                if in_activity:
-                    break  # Only show first activity line
+        for line in summary_lines:
+            print(f"  {line}")
     else:
         print("⚠ Dashboard.md not found")
 
     print()
 
     # Check for pending actions
-    needs_action = vault_path / 'Needs_Action'
-    if needs_action.exists():
-        action_files = list(needs_action.glob('*.md'))
-        if action_files:
+    if status.count('Needs_Action') is not None:
+        first, total = status.pending(5)
+        if total:
             print("PENDING ACTIONS:")
             print("-" * 60)
-            for f in action_files[:5]:  # Show first 5
-                print(f"  • {f.name}")
-            if len(action_files) > 5:
-                print(f"  ... and {len(action_files) - 5} more")
+            for name in first:  # Show first 5
+                print(f"  • {name}")
+            if total > 5:
+                print(f"  ... and {total - 5} more")
         else:
             print("✓ No pending actions")
 
@@ -103,6 +106,88 @@ def read_vault_status(vault_path: str = None):
     print("="*60)
 
 
+def _resolve(vault_path) -> Path:
+    if vault_path is None:
+        return Path(__file__).parent.parent / 'AI_Employee_Vault'
+    return Path(vault_path)
+
+
+def read_vault_status(vault_path: str = None):
+    """
+    Read and display the current status of the AI Employee vault
+
+    Args:
+        vault_path: Path to the Obsidian vault (default: AI_Employee_Vault)
+    """
+    vault_path = _resolve(vault_path)
+    status = VaultStatus(vault_path).scan()
+    print_status(vault_path, status, dashboard_lines(vault_path))
+
+
+def vault_status_snapshot(vault_path: str = None) -> dict:
+    """
+    Machine-readable status, served from the cached snapshot.
+
+    Only folders changed since the last call are rescanned.
+    """
+    return StatusSnapshot(_resolve(vault_path)).refresh()
+
+
+def watch_vault_status(vault_path: str = None, debounce: float = 0.5):
+    """
+    Live status view, redrawn when the vault changes.
+
+    Folders are scanned once; after that only the changed entries reported
+    by the change feed are applied, and the dashboard summary is re-read
+    only when Dashboard.md changes.
+    """
+    from vault_events import VaultChangeFeed
+
+    vault_path = _resolve(vault_path)
+    status = VaultStatus(vault_path).scan()
+    summary_lines = dashboard_lines(vault_path)
+
+    folders = [status.folder_path(name) for name in status.folders]
+    feed = VaultChangeFeed(folders + [vault_path]).start()
+
+    def redraw():
+        print("\033[2J\033[H", end='')
+        print_status(vault_path, status, summary_lines)
+        print(f"Watching for changes ({feed.mode}) - press Ctrl+C to stop")
+
+    redraw()
+    try:
+        for changed in feed.batches(debounce=debounce):
+            touched = status.apply(changed)
+            if any(p.name == 'Dashboard.md' and p.parent == vault_path for p in changed):
+                summary_lines = dashboard_lines(vault_path)
+                touched.add('Dashboard.md')
+            if touched:
+                redraw()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        feed.stop()
+
+
 if __name__ == '__main__':
-    vault_path = sys.argv[1] if len(sys.argv) > 1 else None
-    read_vault_status(vault_path)
+    parser = argparse.ArgumentParser(description='Show the AI Employee vault status')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and refresh the view as the vault changes')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--json', action='store_true',
+                        help='Print the cached status snapshot as JSON')
+    output.add_argument('--env', action='store_true',
+                        help='Print the snapshot as shell variables (for eval)')
+    args = parser.parse_args()
+
+    if args.json:
+        print(json.dumps(vault_status_snapshot(args.vault_path), indent=2))
+    elif args.env:
+        print('\n'.join(env_lines(vault_status_snapshot(args.vault_path))))
+    elif args.watch:
+        watch_vault_status(args.vault_path)
+    else:
+        read_vault_status(args.vault_path)
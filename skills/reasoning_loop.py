@@ -5,10 +5,23 @@ Part of Silver Tier implementation
 """
 
 import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import json
 
+sys.path.append(str(Path(__file__).parent))
+from plan_registry import PlanRegistry, content_digest
+from plan_templates import PlanTemplateRegistry
+from vault_events import VaultChangeFeed
+from work_queue import WorkQueue, print_wait_report
+
+# Template registry shared by every render in this process (see load_templates)
+_templates = None
+_templates_vault = None
+
 
 def read_needs_action(vault_path: Path) -> list:
     """Read all files from Needs_Action folder"""
@@ -41,243 +54,301 @@ def parse_action_file(filepath: Path) -> dict:
             'filepath': filepath,
             'filename': filepath.name,
             'metadata': metadata,
-            'content': content
+            'content': content,
+            'sha256': content_digest(content)
         }
     except Exception as e:
         print(f"Error parsing {filepath}: {e}")
         return None
 
 
-def generate_plan(action_item: dict, vault_path: Path) -> Path:
-    """Generate a Plan.md file for an action item"""
-    plans_folder = vault_path / 'Plans'
-    plans_folder.mkdir(exist_ok=True)
+def load_templates(vault_path: Path = None) -> PlanTemplateRegistry:
+    """Load (or refresh) the plan template registry used by render_plan"""
+    global _templates, _templates_vault
+    if _templates is None or _templates_vault != vault_path:
+        _templates = PlanTemplateRegistry(vault_path)
+        _templates_vault = vault_path
+    else:
+        _templates.refresh()
+    return _templates
 
-    metadata = action_item['metadata']
-    action_type = metadata.get('type', 'unknown')
 
-    # Generate plan based on action type
-    if action_type == 'email':
-        plan_content = generate_email_plan(action_item)
-    elif action_type == 'linkedin_post':
-        plan_content = generate_linkedin_plan(action_item)
-    elif action_type == 'file_drop':
-        plan_content = generate_file_plan(action_item)
-    else:
-        plan_content = generate_generic_plan(action_item)
+def get_templates() -> PlanTemplateRegistry:
+    """Return the loaded template registry (built-in templates only if none loaded)"""
+    return _templates or load_templates()
+
+
+def render_plan(action_item: dict) -> tuple:
+    """Render the plan for an action item, returning (plan_filename, plan_content)"""
+    action_type = action_item['metadata'].get('type', 'unknown')
+    plan_content = get_templates().render(action_type, action_item)
 
     # Create plan filename
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     base_name = action_item['filename'].replace('.md', '')
     plan_filename = f'PLAN_{timestamp}_{base_name}.md'
-    plan_path = plans_folder / plan_filename
 
-    # Write plan file
-    plan_path.write_text(plan_content, encoding='utf-8')
+    return plan_filename, plan_content
 
-    return plan_path
 
+def generate_plan(action_item: dict, vault_path: Path) -> Path:
+    """Generate a Plan.md file for an action item"""
+    plans_folder = vault_path / 'Plans'
+    plans_folder.mkdir(exist_ok=True)
 
-def generate_email_plan(action_item: dict) -> str:
-    """Generate plan for email action"""
-    metadata = action_item['metadata']
-
-    return f"""---
-type: plan
-source: reasoning_loop
-action_type: email
-created: {datetime.now().isoformat()}
-status: pending
-original_file: {action_item['filename']}
----
+    plan_filename, plan_content = render_plan(action_item)
+    plan_path = plans_folder / plan_filename
 
-# Plan: Process Email
+    # Write plan file
+    plan_path.write_text(plan_content, encoding='utf-8')
 
-## Context
+    return plan_path
 
-- **From**: {metadata.get('from', 'Unknown')}
-- **Subject**: {metadata.get('subject', 'No subject')}
-- **Priority**: {metadata.get('priority', 'normal')}
 
-## Objective
+def plan_action_file(task: tuple) -> dict:
+    """
+    Parse and render one action item (runs in worker processes).
 
-Process the incoming email and determine appropriate response.
+    Args:
+        task: (filepath, known_sha256) - rendering is skipped when the
+              content hash matches the one already registered
 
-## Steps
+    Returns: dict with filename, sha256 and rendered plan, or None if unparseable
+    """
+    filepath, known_sha256 = task
+    action_item = parse_action_file(Path(filepath))
+    if not action_item:
+        return None
 
-- [ ] Read and understand the email content
-- [ ] Identify the sender's intent and any requests
-- [ ] Determine if a response is needed
-- [ ] Draft response if required (requires approval)
-- [ ] Check Company_Handbook.md for relevant policies
-- [ ] Move to appropriate folder when complete
+    result = {
+        'filename': action_item['filename'],
+        'sha256': action_item['sha256'],
+        'plan_filename': None,
+        'plan_content': None
+    }
+    if action_item['sha256'] != known_sha256:
+        result['plan_filename'], result['plan_content'] = render_plan(action_item)
+    return result
+
+
+def iter_planned(tasks: list, vault_path: Path, workers: int = 1, chunksize: int = 64):
+    """
+    Yield plan_action_file results in task order.
+
+    With workers > 1, parsing and rendering run in a process pool; map()
+    keeps results in submission order so output matches the serial path.
+    """
+    if workers <= 1 or len(tasks) < 2:
+        for task in tasks:
+            yield plan_action_file(task)
+        return
 
-## Decision Points
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_templates,
+                             initargs=(vault_path,)) as executor:
+        yield from executor.map(plan_action_file, tasks, chunksize=chunksize)
 
-1. **Response Required?**
-   - If yes: Draft reply and move to /Pending_Approval
-   - If no: Archive to /Done with summary
 
-2. **Urgency Level**
-   - High: Process immediately
-   - Medium: Process within 24 hours
-   - Low: Process within 48 hours
+def write_plan_batch(plans_folder: Path, batch: list):
+    """Write a batch of rendered plans to the Plans folder"""
+    for plan_filename, plan_content in batch:
+        (plans_folder / plan_filename).write_text(plan_content, encoding='utf-8')
 
-## Next Actions
 
-Review the original email file and execute the plan steps.
-"""
+def generate_email_plan(action_item: dict) -> str:
+    """Generate plan for email action"""
+    return get_templates().render('email', action_item)
 
 
 def generate_linkedin_plan(action_item: dict) -> str:
     """Generate plan for LinkedIn post"""
-    return f"""---
-type: plan
-source: reasoning_loop
-action_type: linkedin_post
-created: {datetime.now().isoformat()}
-status: pending
-original_file: {action_item['filename']}
----
-
-# Plan: Create LinkedIn Post
+    return get_templates().render('linkedin_post', action_item)
 
-## Objective
 
-Draft a professional LinkedIn post to generate business leads and showcase expertise.
-
-## Steps
-
-- [ ] Review Company_Handbook.md for brand voice and guidelines
-- [ ] Identify recent wins or insights to share
-- [ ] Draft post content (150-300 words)
-- [ ] Include relevant hashtags
-- [ ] Add call-to-action
-- [ ] Create approval request in /Pending_Approval
-- [ ] Wait for human approval before posting
-
-## Content Guidelines
-
-1. **Tone**: Professional, confident, helpful
-2. **Focus**: Value proposition and expertise
-3. **Structure**: Hook → Value → Call-to-action
-4. **Length**: 150-300 words optimal
-
-## Topics to Consider
-
-- Recent project successes
-- Industry insights
-- Client testimonials
-- Service offerings
-- Tips and best practices
-
-## Approval Required
-
-This action requires human approval before execution. Draft will be placed in /Pending_Approval.
-
-## Next Actions
+def generate_file_plan(action_item: dict) -> str:
+    """Generate plan for file drop"""
+    return get_templates().render('file_drop', action_item)
 
-1. Draft the LinkedIn post content
-2. Create approval request file
-3. Wait for approval
-4. Execute post (via MCP or manual)
-"""
 
+def generate_generic_plan(action_item: dict) -> str:
+    """Generate generic plan for unknown action types"""
+    return get_templates().render('generic', action_item)
 
-def generate_file_plan(action_item: dict) -> str:
-    """Generate plan for file drop"""
-    metadata = action_item['metadata']
 
-    return f"""---
-type: plan
-source: reasoning_loop
-action_type: file_processing
-created: {datetime.now().isoformat()}
-status: pending
-original_file: {action_item['filename']}
----
+def run_reasoning_loop(vault_path: Path, force: bool = False, workers: int = 1,
+                       batch_size: int = 256, action_files: list = None,
+                       registry: PlanRegistry = None) -> dict:
+    """
+    Plan every new or changed item in Needs_Action
 
-# Plan: Process Dropped File
+    Args:
+        vault_path: Path to the Obsidian vault
+        force: Re-plan every item, ignoring the plan registry
+        workers: Number of processes used to parse and render plans
+        batch_size: Number of rendered plans written per batch
+        action_files: Only consider these files (default: scan Needs_Action)
+        registry: Plan registry to reuse across runs (daemon mode)
 
-## Context
+    Returns: dict with found/created/unchanged/failed counts and the
+             planned files with their mtimes (for latency reporting)
+    """
+    stats = {'found': 0, 'created': 0, 'unchanged': 0, 'failed': 0, 'planned': []}
 
-- **File**: {metadata.get('original_name', 'Unknown')}
-- **Size**: {metadata.get('size', 'Unknown')} bytes
-- **Type**: {metadata.get('type', 'file_drop')}
+    # Read action items
+    registry = registry or PlanRegistry(vault_path)
+    load_templates(vault_path)
+    if action_files is None:
+        action_files = read_needs_action(vault_path)
+        registry.prune({f.name for f in action_files})
 
-## Objective
+    if not action_files:
+        registry.save()
+        print("No action items found in Needs_Action folder.")
+        return stats
 
-Process the dropped file and determine appropriate action.
+    stats['found'] = len(action_files)
+    print(f"Found {len(action_files)} action item(s)\n")
 
-## Steps
+    # Only items that are new or changed since their last plan get planned
+    changed = []
+    stat_results = {}
+    for action_file in action_files:
+        try:
+            stat_result = action_file.stat()
+        except FileNotFoundError:
+            continue
 
-- [ ] Identify file type and purpose
-- [ ] Read file contents if text-based
-- [ ] Determine processing requirements
-- [ ] Execute appropriate action
-- [ ] Log results
-- [ ] Move to /Done when complete
+        if not force and registry.is_unchanged(action_file.name, stat_result):
+            stats['unchanged'] += 1
+            continue
 
-## Decision Points
+        stat_results[action_file.name] = stat_result
+        changed.append(action_file)
 
-1. **File Type**
-   - Document: Review and summarize
-   - Data: Process and analyze
-   - Image: Catalog and describe
-   - Other: Determine handling
+    # Plan the changed items most urgent first
+    queue = WorkQueue(changed)
+    tasks = []
+    for action_file in queue:
+        entry = None if force else registry.entries.get(action_file.name)
+        tasks.append((str(action_file), entry['sha256'] if entry else None))
 
-2. **Action Required**
-   - Store for reference
-   - Process and extract data
-   - Forward to external system
-   - Archive
+    plans_folder = vault_path / 'Plans'
+    if tasks:
+        plans_folder.mkdir(exist_ok=True)
 
-## Next Actions
+    batch = []
+    pending = []
 
-Examine the file and execute the appropriate processing steps.
-"""
+    def flush():
+        try:
+            write_plan_batch(plans_folder, batch)
+        except Exception as e:
+            print(f"  ✗ Error writing plans: {e}")
+            stats['failed'] += len(batch)
+            stats['created'] -= len(batch)
+        else:
+            for name, stat_result, sha256, plan_filename in pending:
+                registry.record(name, stat_result, sha256, plan_filename)
+        batch.clear()
+        pending.clear()
+
+    for (filepath, _), result in zip(tasks, iter_planned(tasks, vault_path, workers)):
+        name = Path(filepath).name
+        if not result:
+            print(f"Processing: {name}")
+            print(f"  ⚠ Could not parse file")
+            stats['failed'] += 1
+            continue
 
+        if result['plan_content'] is None:
+            registry.refresh_identity(name, stat_results[name])
+            stats['unchanged'] += 1
+            continue
 
-def generate_generic_plan(action_item: dict) -> str:
-    """Generate generic plan for unknown action types"""
-    return f"""---
-type: plan
-source: reasoning_loop
-action_type: generic
-created: {datetime.now().isoformat()}
-status: pending
-original_file: {action_item['filename']}
----
+        print(f"Processing: {name}")
+        print(f"  ✓ Plan created: {result['plan_filename']}")
+        stats['planned'].append((name, stat_results[name].st_mtime))
+        batch.append((result['plan_filename'], result['plan_content']))
+        pending.append((name, stat_results[name], result['sha256'], result['plan_filename']))
+        stats['created'] += 1
 
-# Plan: Process Action Item
+        if len(batch) >= batch_size:
+            flush()
 
-## Context
+    if batch:
+        flush()
 
-Action item detected that requires processing.
+    registry.save()
+    if stats['created']:
+        print_wait_report(queue.wait_report())
+    return stats
 
-## Objective
 
-Review the action item and determine appropriate steps.
+def run_daemon(vault_path: Path, workers: int = 1, debounce: float = 0.5,
+               max_delay: float = 2.0):
+    """
+    Long-running mode: plan new Needs_Action files as soon as they appear.
 
-## Steps
+    Bursts of watcher output are debounced into batches, and only the
+    files in each batch are planned. The registry is kept in memory,
+    reloaded when another process (a cron run) saved it, and entries of
+    files that left Needs_Action are dropped as they go.
+    """
+    registry = PlanRegistry(vault_path)
+    needs_action = vault_path / 'Needs_Action'
+    feed = VaultChangeFeed([needs_action]).start()
 
-- [ ] Read and understand the action item
-- [ ] Identify required actions
-- [ ] Check for dependencies or prerequisites
-- [ ] Execute actions in appropriate order
-- [ ] Log results
-- [ ] Move to /Done when complete
+    print(f"Daemon mode: watching {needs_action} ({feed.mode})")
+    print(f"Debounce: {debounce}s, max batch delay: {max_delay}s")
+    print("Press Ctrl+C to stop\n")
 
-## Next Actions
+    # Catch up on anything that arrived while the daemon was down
+    run_reasoning_loop(vault_path, workers=workers, registry=registry)
 
-Review the original action file and determine specific steps needed.
-"""
+    try:
+        for changed in feed.batches(debounce=debounce, max_delay=max_delay):
+            changed = [p for p in changed if p.suffix == '.md' and p.parent == needs_action]
+            action_files = sorted(p for p in changed if p.exists())
+            registry.reload()
+            registry.forget(p.name for p in changed if not p.exists())
+            if not action_files:
+                registry.save()
+                continue
+
+            stats = run_reasoning_loop(vault_path, workers=workers, registry=registry,
+                                       action_files=action_files)
+            if stats['planned']:
+                now = time.time()
+                latencies = [now - mtime for _, mtime in stats['planned']]
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Batch: "
+                      f"{stats['created']} plan(s), watcher→plan latency "
+                      f"max {max(latencies):.2f}s, avg {sum(latencies) / len(latencies):.2f}s\n")
+    except KeyboardInterrupt:
+        print("\nReasoning daemon stopped by user")
+    finally:
+        feed.stop()
+        registry.save()
 
 
 def main():
     """Main entry point for reasoning loop"""
+    parser = argparse.ArgumentParser(description='Generate plans for Needs_Action items')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-plan every item, ignoring the plan registry')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Parse and render plans in N processes (default: 1)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and plan new Needs_Action files as they appear')
+    parser.add_argument('--debounce', type=float, default=0.5,
+                        help='Daemon: seconds of quiet before a batch is planned (default: 0.5)')
+    args = parser.parse_args()
+
     # Get vault path
-    vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
+    if args.vault_path is None:
+        vault_path = Path(__file__).parent.parent / 'AI_Employee_Vault'
+    else:
+        vault_path = Path(args.vault_path)
 
     if not vault_path.exists():
         print(f"Error: Vault not found at {vault_path}")
@@ -287,36 +358,16 @@ def main():
     print("=" * 50)
     print(f"Vault: {vault_path}\n")
 
-    # Read action items
-    action_files = read_needs_action(vault_path)
-
-    if not action_files:
-        print("No action items found in Needs_Action folder.")
+    if args.daemon:
+        run_daemon(vault_path, workers=args.workers, debounce=args.debounce)
         return
 
-    print(f"Found {len(action_files)} action item(s)\n")
-
-    # Generate plans for each action item
-    plans_created = 0
-    for action_file in action_files:
-        print(f"Processing: {action_file.name}")
-
-        # Parse action file
-        action_item = parse_action_file(action_file)
-        if not action_item:
-            print(f"  ⚠ Could not parse file")
-            continue
-
-        # Generate plan
-        try:
-            plan_path = generate_plan(action_item, vault_path)
-            print(f"  ✓ Plan created: {plan_path.name}")
-            plans_created += 1
-        except Exception as e:
-            print(f"  ✗ Error creating plan: {e}")
+    stats = run_reasoning_loop(vault_path, force=args.force, workers=args.workers)
 
-    print(f"\n{'=' * 50}")
-    print(f"Plans created: {plans_created}/{len(action_files)}")
+    if stats['found']:
+        print(f"\n{'=' * 50}")
+        print(f"Plans created: {stats['created']}/{stats['found']} "
+              f"({stats['unchanged']} unchanged, skipped)")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Reply Retrieval - Finds past sent replies similar to a new email
+Sent replies in Done/SENT_EMAIL_REPLY_* are indexed as hashed TF-IDF
+vectors in a NumPy matrix; new replies are appended incrementally and a
+query is a single matrix-vector product
+"""
+
+import os
+import sys
+import json
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from text_features import (NUMPY_AVAILABLE, DEFAULT_DIM, np, tokenize, hashed_counts,
+                           count_matrix, section_text)
+from work_queue import read_frontmatter
+
+
+SENT_PATTERN = ('SENT_EMAIL_REPLY_', '.md')
+MIN_SCORE = 0.05
+
+
+def read_sent_reply(filepath: Path) -> dict:
+    """Subject, recipient and sent body of a sent-reply log"""
+    content = filepath.read_text(encoding='utf-8')
+    frontmatter = read_frontmatter(filepath)
+    return {
+        'file': filepath.name,
+        'to': frontmatter.get('to', ''),
+        'subject': frontmatter.get('subject', ''),
+        'body': section_text(content, 'Content Sent'),
+    }
+
+
+class ReplyIndex:
+    """
+    Hashed TF-IDF index of sent replies.
+
+    Each reply's hashed term counts are stored sparsely (columns + counts,
+    CSR layout) in .state/reply_index.npz with the reply texts in
+    reply_index.json. refresh() only reads sent replies that are not
+    indexed yet. The dense matrix of IDF-weighted, L2-normalized rows is
+    built in memory when the index changes, so a query is one matrix
+    product plus a top-k selection.
+    """
+
+    def __init__(self, vault_path: Path, dim: int = DEFAULT_DIM):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for reply retrieval (pip install numpy)")
+
+        self.vault_path = Path(vault_path)
+        self.done_folder = self.vault_path / 'Done'
+        self.state_dir = self.vault_path / '.state'
+        self.matrix_file = self.state_dir / 'reply_index.npz'
+        self.meta_file = self.state_dir / 'reply_index.json'
+        self.dim = dim
+
+        self.entries = []
+        self.rows = []  # (columns, counts) per reply
+        self._indexed = set()
+        self._weighted = None
+        self._idf = None
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.meta_file, 'r') as f:
+                meta = json.load(f)
+            with np.load(self.matrix_file) as data:
+                indptr, indices, counts = data['indptr'], data['indices'], data['counts']
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return
+
+        if meta.get('dim') != self.dim or len(indptr) != len(meta['entries']) + 1:
+            print("Reply index does not match its settings, rebuilding")
+            return
+        self.entries = meta['entries']
+        self.rows = list(zip(np.split(indices, indptr[1:-1]), np.split(counts, indptr[1:-1])))
+        self._indexed = {entry['file'] for entry in self.entries}
+
+    def save(self):
+        """Persist the index if it changed (atomic replace)"""
+        if not self._dirty:
+            return
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+        lengths = np.fromiter((len(columns) for columns, _ in self.rows), dtype=np.int64,
+                              count=len(self.rows))
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        indices = np.concatenate([c for c, _ in self.rows]) if self.rows else np.zeros(0, np.uint16)
+        counts = np.concatenate([v for _, v in self.rows]) if self.rows else np.zeros(0, np.uint16)
+
+        tmp_matrix = self.state_dir / f'reply_index.{os.getpid()}.npz.tmp'
+        with open(tmp_matrix, 'wb') as f:
+            np.savez(f, indptr=indptr, indices=indices, counts=counts)
+        tmp_meta = self.state_dir / f'reply_index.{os.getpid()}.json.tmp'
+        with open(tmp_meta, 'w') as f:
+            json.dump({'dim': self.dim, 'entries': self.entries}, f)
+
+        os.replace(tmp_matrix, self.matrix_file)
+        os.replace(tmp_meta, self.meta_file)
+        self._dirty = False
+
+    def clear(self):
+        """Drop every indexed reply (the next refresh re-indexes Done)"""
+        self.entries = []
+        self.rows = []
+        self._indexed = set()
+        self._weighted = None
+        self._dirty = True
+
+    def refresh(self) -> int:
+        """
+        Index sent replies added to Done since the last refresh.
+
+        Returns: number of replies added
+        """
+        prefix, suffix = SENT_PATTERN
+        try:
+            with os.scandir(self.done_folder) as entries:
+                new_files = sorted(entry.name for entry in entries
+                                   if entry.name.startswith(prefix) and entry.name.endswith(suffix)
+                                   and entry.name not in self._indexed)
+        except FileNotFoundError:
+            return 0
+
+        replies = []
+        for name in new_files:
+            try:
+                replies.append(read_sent_reply(self.done_folder / name))
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Warning: Could not index {name}: {e}")
+        self.add(replies)
+        return len(replies)
+
+    def add(self, replies: list):
+        """Append replies ({file, to, subject, body}) to the index"""
+        if not replies:
+            return
+        index_dtype = np.uint16 if self.dim <= 65536 else np.uint32
+        for reply in replies:
+            counts = hashed_counts(tokenize(f"{reply['subject']}\n{reply['body']}"), self.dim)
+            self.rows.append((np.fromiter(counts.keys(), dtype=index_dtype, count=len(counts)),
+                              np.fromiter(counts.values(), dtype=np.uint16, count=len(counts))))
+        self.entries.extend(replies)
+        self._indexed.update(reply['file'] for reply in replies)
+        self._weighted = None
+        self._dirty = True
+
+    def _weights(self):
+        """IDF vector and dense L2-normalized TF-IDF rows for the current index"""
+        if self._weighted is None:
+            n = len(self.rows)
+            lengths = np.fromiter((len(columns) for columns, _ in self.rows), dtype=np.int64, count=n)
+            columns = np.concatenate([c for c, _ in self.rows]).astype(np.int64)
+            counts = np.concatenate([v for _, v in self.rows]).astype(np.float32)
+
+            # Columns are unique within a row, so column frequency is document frequency
+            df = np.bincount(columns, minlength=self.dim).astype(np.float32)
+            self._idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+
+            weighted = np.zeros((n, self.dim), dtype=np.float32)
+            weighted[np.repeat(np.arange(n), lengths), columns] = np.log1p(counts) * self._idf[columns]
+            norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            weighted /= norms
+            self._weighted = weighted
+        return self._weighted, self._idf
+
+    def __len__(self):
+        return len(self.entries)
+
+    def query(self, texts: list, k: int = 3) -> list:
+        """
+        Top-k most similar past replies for each query text.
+
+        Replies with identical bodies are listed once.
+
+        Returns: per text, a list of (score, entry) best first
+        """
+        if not self.entries or not texts:
+            return [[] for _ in texts]
+
+        weighted, idf = self._weights()
+        queries = np.log1p(count_matrix([hashed_counts(tokenize(t), self.dim) for t in texts],
+                                        self.dim)) * idf
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries /= norms
+
+        # Queries are sparse: touching only their columns halves the memory read
+        columns = np.flatnonzero(queries.any(axis=0))
+        if len(columns) < self.dim // 2:
+            scores = queries[:, columns] @ weighted[:, columns].T
+        else:
+            scores = queries @ weighted.T
+
+        # Over-fetch so duplicates can be dropped and k distinct replies remain
+        fetch = min(len(self.entries), k * 4)
+        results = []
+        for row in scores:
+            top = np.argpartition(-row, fetch - 1)[:fetch]
+            top = top[np.argsort(-row[top])]
+            found = []
+            seen = set()
+            for i in top:
+                score = float(row[i])
+                if score < MIN_SCORE or len(found) == k:
+                    break
+                body = self.entries[i]['body']
+                if body in seen:
+                    continue
+                seen.add(body)
+                found.append((score, self.entries[i]))
+            results.append(found)
+        return results
+
+
+def main():
+    """Build or query the reply index"""
+    parser = argparse.ArgumentParser(description='Find past sent replies similar to a text')
+    parser.add_argument('vault_path', nargs='?', default=None,
+                        help='Path to the Obsidian vault (default: AI_Employee_Vault)')
+    parser.add_argument('--query', help='Text to find similar replies for')
+    parser.add_argument('-k', type=int, default=3, help='Number of replies (default: 3)')
+    parser.add_argument('--rebuild', action='store_true', help='Re-index all sent replies')
+    args = parser.parse_args()
+
+    vault_path = Path(args.vault_path) if args.vault_path else Path(__file__).parent.parent / 'AI_Employee_Vault'
+
+    if not NUMPY_AVAILABLE:
+        print("Error: numpy is not installed. Install with: pip install numpy")
+        sys.exit(1)
+
+    index = ReplyIndex(vault_path)
+    if args.rebuild:
+        index.clear()
+    added = index.refresh()
+    index.save()
+    print(f"Reply index: {len(index)} sent replies ({added} new)")
+
+    if args.query:
+        for score, entry in index.query([args.query], args.k)[0]:
+            print(f"\n[{score:.2f}] {entry['subject']} ({entry['file']})")
+            print(entry['body'])
+
+
+if __name__ == '__main__':
+    main()
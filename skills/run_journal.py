@@ -0,0 +1,68 @@
+"""
+Run Journal - Batched write-ahead progress journal for resumable runs
+Each batch of (source, destination) moves is recorded before it starts and
+marked committed when it finishes; after a crash only the uncommitted batch
+needs checking, however much of the backlog was already done
+"""
+
+import os
+import json
+from pathlib import Path
+
+
+class RunJournal:
+    """
+    Append-only JSON-lines journal.
+
+    Lines are either {"batch": n, "items": [[src, dst], ...]} written before
+    a batch is processed, or {"commit": n} written after it completes. Each
+    write is flushed and fsync'd, so there are two syncs per batch rather
+    than per item.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._next_batch = 0
+
+    def _append(self, record: dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def begin_batch(self, items: list) -> int:
+        """Record the moves of a batch before they happen; returns the batch id"""
+        batch_id = self._next_batch
+        self._next_batch += 1
+        self._append({'batch': batch_id, 'items': [[str(src), str(dst)] for src, dst in items]})
+        return batch_id
+
+    def commit(self, batch_id: int):
+        """Mark a batch as fully processed"""
+        self._append({'commit': batch_id})
+
+    def uncommitted(self) -> list:
+        """(src, dst) pairs from batches that were started but never committed"""
+        if not self.path.exists():
+            return []
+
+        batches = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn final write: nothing after it was recorded
+                if 'batch' in record:
+                    batches[record['batch']] = record['items']
+                elif 'commit' in record:
+                    batches.pop(record['commit'], None)
+
+        return [(Path(src), Path(dst)) for items in batches.values() for src, dst in items]
+
+    def clear(self):
+        """Remove the journal after a clean finish"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Selector Cache - Learned selectors for the Gmail/LinkedIn UI automation
+Each control (Compose, To, Send, ...) has several candidate selectors. The
+candidates are raced in one wait instead of being tried one timeout after
+another, the winner is remembered per control, and hit rates and lookup
+latency are recorded so stale selectors show up
+"""
+
+import os
+import json
+import time
+import argparse
+from pathlib import Path
+
+try:
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
+except ImportError:
+    PlaywrightTimeout = TimeoutError
+
+
+BROWSER_DATA = Path(__file__).parent.parent / '.browser_data'
+
+# A cached selector is dropped after this many lookups in a row found nothing
+MAX_FAILURES = 2
+
+# Weight of the newest lookup in the latency average
+LATENCY_SMOOTHING = 0.3
+
+
+class SelectorNotFound(LookupError):
+    """No candidate selector of a control became visible in time"""
+
+
+class SelectorCache:
+    """
+    Per-service record of which selector works for each control.
+
+    locate() races all candidates of a control with locator.or_(), so a
+    lookup waits only as long as the first visible match takes. When the
+    race resolves the cached selector is checked first: if it matched the
+    lookup is a hit, otherwise the visible candidate replaces it (a miss).
+    Entries that keep failing are invalidated. Stored in
+    .browser_data/<service>.selectors.json.
+    """
+
+    def __init__(self, service: str, path: Path = None):
+        self.service = service
+        self.path = Path(path) if path else BROWSER_DATA / f'{service}.selectors.json'
+        self.controls = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.controls, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _entry(self, control: str) -> dict:
+        return self.controls.setdefault(control, {
+            'selector': None, 'lookups': 0, 'hits': 0, 'misses': 0, 'not_found': 0,
+            'failures': 0, 'latency_ms': None, 'last_ms': None,
+        })
+
+    def _record_latency(self, entry: dict, started: float):
+        elapsed = (time.perf_counter() - started) * 1000
+        entry['last_ms'] = round(elapsed, 1)
+        previous = entry['latency_ms']
+        entry['latency_ms'] = round(elapsed if previous is None
+                                    else previous + LATENCY_SMOOTHING * (elapsed - previous), 1)
+
+    def ordered(self, control: str, candidates: list) -> list:
+        """Candidates with the cached selector first"""
+        cached = self.controls.get(control, {}).get('selector')
+        if cached in candidates:
+            return [cached] + [c for c in candidates if c != cached]
+        return list(candidates)
+
+    def locate(self, page, control: str, candidates: list, timeout: int = 5000):
+        """
+        Visible element for a control.
+
+        Returns: Locator of the first matching element
+        Raises: SelectorNotFound when no candidate is visible within timeout
+        """
+        entry = self._entry(control)
+        entry['lookups'] += 1
+        started = time.perf_counter()
+        ordered = self.ordered(control, candidates)
+
+        race = page.locator(ordered[0])
+        for selector in ordered[1:]:
+            race = race.or_(page.locator(selector))
+
+        try:
+            race.first.wait_for(state='visible', timeout=timeout)
+        except PlaywrightTimeout:
+            entry['not_found'] += 1
+            self._fail(entry)
+            self._record_latency(entry, started)
+            self.save()
+            raise SelectorNotFound(f"{self.service}/{control}: none of {len(candidates)} selectors visible")
+
+        winner = next((s for s in ordered if page.locator(s).first.is_visible()), None)
+        if winner is None:
+            # Matched element went away between the race and the check
+            winner = ordered[0]
+
+        if winner == entry['selector']:
+            entry['hits'] += 1
+            entry['failures'] = 0
+        else:
+            # Stale or first lookup: the visible candidate replaces the cached one
+            entry['misses'] += 1
+            entry['selector'] = winner
+            entry['failures'] = 0
+
+        self._record_latency(entry, started)
+        self.save()
+        return page.locator(winner).first
+
+    def _fail(self, entry: dict):
+        entry['failures'] += 1
+        if entry['failures'] >= MAX_FAILURES:
+            entry['selector'] = None
+            entry['failures'] = 0
+
+    def invalidate(self, control: str = None):
+        """Forget the learned selector of one control, or of all controls"""
+        for name in [control] if control else list(self.controls):
+            if name in self.controls:
+                self.controls[name]['selector'] = None
+                self.controls[name]['failures'] = 0
+        self.save()
+
+    def report_lines(self) -> list:
+        lines = []
+        for control, entry in sorted(self.controls.items()):
+            lookups = entry['lookups'] or 1
+            latency = f"{entry['latency_ms']:.0f} ms" if entry['latency_ms'] is not None else '-'
+            lines.append(f"{control:14} hit rate {entry['hits'] / lookups:>4.0%}  "
+                         f"avg {latency:>8}  lookups {entry['lookups']:>4}  "
+                         f"not found {entry['not_found']:>3}  selector: {entry['selector'] or '-'}")
+        return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Show or reset learned UI selectors')
+    parser.add_argument('service', choices=['gmail', 'linkedin'])
+    parser.add_argument('--reset', nargs='?', const='', metavar='CONTROL',
+                        help='Forget learned selectors (all, or one control)')
+    args = parser.parse_args()
+
+    cache = SelectorCache(args.service)
+    if args.reset is not None:
+        cache.invalidate(args.reset or None)
+        print(f"✓ Reset {args.reset or 'all'} selector(s) for {args.service}")
+    lines = cache.report_lines()
+    print('\n'.join(lines) if lines else f"No selector history for {args.service} yet")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Send Queue - Batch sending of approved email replies
+Approved/EMAIL_REPLY_* files are sent oldest first, up to a batch size per
+run, behind a token-bucket rate limit with per-item retries. Every reply
+has an idempotency key that is recorded in its Done log, so a reply is
+never sent twice, however often the queue runs
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent))
+from work_queue import read_frontmatter
+
+
+SEND_PATTERN = ('EMAIL_REPLY_', '.md')
+SENT_PREFIX = 'SENT_EMAIL_REPLY_'
+
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_RATE_PER_MINUTE = 20
+DEFAULT_BURST = 5
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+
+
+class SendError(Exception):
+    """A send failed in a way that may succeed on retry (network, browser, ...)"""
+
+
+class UnconfirmedSend(Exception):
+    """The send may or may not have gone out; hold it for checking instead of retrying"""
+
+
+def idempotency_key(email_data: dict) -> str:
+    """
+    Stable key of a reply: recipient, subject, body and the message it answers.
+
+    The same approved reply gets the same key even if its file is copied or
+    re-approved under another name.
+    """
+    parts = [email_data.get('to', '').strip().lower(),
+             email_data.get('subject', '').strip(),
+             email_data.get('body', '').strip(),
+             email_data.get('in_reply_to', '').strip()]
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+
+class TokenBucket:
+    """Allows `burst` sends at once, refilled at rate_per_minute"""
+
+    def __init__(self, rate_per_minute: float = DEFAULT_RATE_PER_MINUTE, burst: int = DEFAULT_BURST,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """
+        Take one token, waiting for it if necessary.
+
+        Returns: seconds waited
+        """
+        self._refill()
+        waited = 0.0
+        if self.tokens < 1:
+            wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+            waited = wait
+            self._refill()
+        self.tokens -= 1
+        return waited
+
+
+class SentLedger:
+    """
+    Idempotency keys of sent replies.
+
+    The keys live in the frontmatter of the Done/SENT_EMAIL_REPLY_* logs;
+    .state/send_ledger.json caches them per log file so only new logs are
+    read. Keys being sent are marked in flight first, so a send that was
+    interrupted before its log was written is not silently repeated.
+    """
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = Path(vault_path)
+        self.done_folder = self.vault_path / 'Done'
+        self.state_file = self.vault_path / '.state' / 'send_ledger.json'
+        self.files = {}
+        self.in_flight = {}
+        self._load()
+        self.refresh()
+
+    def _load(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self.files = state.get('files', {})
+        self.in_flight = state.get('in_flight', {})
+
+    def save(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_name(f'send_ledger.{os.getpid()}.tmp')
+        # dumps() uses the C encoder; dump() streams through the pure-Python one
+        with open(tmp_file, 'w') as f:
+            f.write(json.dumps({'files': self.files, 'in_flight': self.in_flight}))
+        os.replace(tmp_file, self.state_file)
+
+    def refresh(self):
+        """Read keys from Done logs written since the last refresh"""
+        self._keys = set(self.files.values())
+        try:
+            with os.scandir(self.done_folder) as entries:
+                names = [entry.name for entry in entries if entry.name.startswith(SENT_PREFIX)]
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name not in self.files:
+                try:
+                    self.files[name] = read_frontmatter(self.done_folder / name).get('idempotency_key', '')
+                except (OSError, UnicodeDecodeError):
+                    continue
+                self._keys.add(self.files[name])
+        # A key whose log has appeared is no longer in doubt
+        for key in [key for key in self.in_flight if key in self._keys]:
+            del self.in_flight[key]
+
+    def sent(self, key: str) -> bool:
+        return key in self._keys
+
+    def begin(self, key: str, filename: str):
+        self.in_flight[key] = {'file': filename, 'started_at': datetime.now().isoformat(),
+                               'pid': os.getpid()}
+        self.save()
+
+    def abort(self, key: str):
+        """The send did not happen (failed or cancelled)"""
+        self.in_flight.pop(key, None)
+        self.save()
+
+    def record(self, key: str, log_file: Path):
+        self.files[log_file.name] = key
+        self._keys.add(key)
+        self.in_flight.pop(key, None)
+        self.save()
+
+
+class SendQueue:
+    """
+    Sends approved replies in batches.
+
+    Args:
+        vault_path: Vault root
+        extract: path -> email data dict (to, subject, body, ...)
+        send: email data -> True (sent) or False (declined, e.g. cancelled
+              by the user; not retried). Raises SendError for retryable
+              failures and UnconfirmedSend when it cannot tell whether
+              the email went out.
+        log_sent: (path, email data, key) -> Done log path; the log's
+                  frontmatter must carry `idempotency_key: <key>`
+    """
+
+    def __init__(self, vault_path: Path, extract, send, log_sent, batch_size: int = DEFAULT_BATCH_SIZE,
+                 rate_per_minute: float = DEFAULT_RATE_PER_MINUTE, burst: int = DEFAULT_BURST,
+                 max_attempts: int = MAX_ATTEMPTS, backoff: float = BACKOFF_SECONDS,
+                 retry_unconfirmed: bool = False, sleep=time.sleep):
+        self.vault_path = Path(vault_path)
+        self.approved_folder = self.vault_path / 'Approved'
+        self.done_folder = self.vault_path / 'Done'
+        self.extract = extract
+        self.send = send
+        self.log_sent = log_sent
+        self.batch_size = batch_size
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.retry_unconfirmed = retry_unconfirmed
+        self.sleep = sleep
+        self.bucket = TokenBucket(rate_per_minute, burst, sleep=sleep)
+        self.ledger = SentLedger(self.vault_path)
+
+    def pending(self) -> list:
+        """Approved replies, oldest first"""
+        prefix, suffix = SEND_PATTERN
+        try:
+            with os.scandir(self.approved_folder) as entries:
+                names = sorted(entry.name for entry in entries
+                               if entry.name.startswith(prefix) and entry.name.endswith(suffix))
+        except FileNotFoundError:
+            return []
+        return [self.approved_folder / name for name in names]
+
+    def _retire_duplicate(self, email_file: Path):
+        """An already-sent reply: file it in Done without sending again"""
+        email_file.rename(self.done_folder / email_file.name)
+
+    def _send_with_retry(self, email_data: dict):
+        """
+        Returns: (True/False result, attempts, last error or None)
+        """
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return self.send(email_data), attempt, None
+            except SendError as e:
+                error = e
+                if attempt < self.max_attempts:
+                    delay = min(BACKOFF_MAX_SECONDS, self.backoff * 2 ** (attempt - 1))
+                    delay *= random.uniform(0.8, 1.2)
+                    print(f"   ↻ Attempt {attempt} failed ({e}), retrying in {delay:.1f}s")
+                    self.sleep(delay)
+        return False, self.max_attempts, error
+
+    def run(self) -> dict:
+        """
+        Send up to batch_size approved replies.
+
+        Returns: counts of sent, duplicates, declined, failed, unconfirmed,
+                 invalid and remaining items
+        """
+        stats = dict.fromkeys(['sent', 'duplicates', 'declined', 'failed', 'unconfirmed',
+                               'invalid', 'remaining'], 0)
+        pending = self.pending()
+        attempted = 0
+        self.done_folder.mkdir(exist_ok=True)
+
+        for index, email_file in enumerate(pending):
+            if attempted >= self.batch_size:
+                stats['remaining'] = len(pending) - index
+                break
+
+            email_data = self.extract(email_file)
+            if not email_data.get('to') or not email_data.get('body'):
+                print(f"⚠️  {email_file.name}: no recipient or body, skipped")
+                stats['invalid'] += 1
+                continue
+
+            key = idempotency_key(email_data)
+            if self.ledger.sent(key):
+                print(f"⏭️  {email_file.name}: already sent (key {key[:12]}), moved to Done")
+                self._retire_duplicate(email_file)
+                stats['duplicates'] += 1
+                continue
+            if key in self.ledger.in_flight and not self.retry_unconfirmed:
+                print(f"⚠️  {email_file.name}: an earlier send was interrupted and may have gone out.")
+                print("    Check the Sent folder, then rerun with --retry-unconfirmed to send it")
+                stats['unconfirmed'] += 1
+                continue
+
+            attempted += 1
+            waited = self.bucket.acquire()
+            if waited > 0.05:
+                print(f"⏳ Rate limit: waited {waited:.1f}s")
+
+            print(f"\n{'='*70}")
+            print(f"Processing: {email_file.name} ({attempted}/{min(self.batch_size, len(pending))})")
+            print(f"{'='*70}")
+
+            self.ledger.begin(key, email_file.name)
+            try:
+                result, attempts, error = self._send_with_retry(email_data)
+            except UnconfirmedSend as e:
+                # Stays in flight, so later runs hold it until --retry-unconfirmed
+                print(f"\n⚠️  {email_file.name}: {e}")
+                print("    Check the Sent folder, then rerun with --retry-unconfirmed to send it")
+                stats['unconfirmed'] += 1
+                continue
+            if result:
+                log_file = self.log_sent(email_file, email_data, key)
+                self.ledger.record(key, log_file)
+                stats['sent'] += 1
+            else:
+                self.ledger.abort(key)
+                if error is not None:
+                    print(f"\n❌ {email_file.name}: failed after {attempts} attempt(s): {error}")
+                    stats['failed'] += 1
+                else:
+                    stats['declined'] += 1
+                print("⚠️  Email not sent. File remains in Approved folder.")
+
+        return stats
+
+
+def print_summary(stats: dict):
+    print(f"\n📊 Sent {stats['sent']}, already sent {stats['duplicates']}, "
+          f"declined {stats['declined']}, failed {stats['failed']}")
+    if stats['unconfirmed']:
+        print(f"   {stats['unconfirmed']} interrupted send(s) need checking (--retry-unconfirmed)")
+    if stats['invalid']:
+        print(f"   {stats['invalid']} approved file(s) without recipient or body")
+    if stats['remaining']:
+        print(f"   {stats['remaining']} more approved email(s) wait for the next run (--batch-size)")
@@ -10,6 +10,9 @@ from datetime import datetime
 from playwright.sync_api import sync_playwright
 import time
 
+sys.path.insert(0, str(Path(__file__).parent))
+from post_schedule import due_posts
+
 class SimpleLinkedInPoster:
     def __init__(self, vault_path: str):
         self.vault_path = Path(vault_path)
@@ -17,8 +20,8 @@ class SimpleLinkedInPoster:
         self.done_folder = self.vault_path / 'Done'
 
     def find_approved_posts(self):
-        """Find approved LinkedIn posts"""
-        return list(self.approved_folder.glob('LINKEDIN_POST_*.md'))
+        """Find approved LinkedIn posts that are due (scheduled ones wait for their slot)"""
+        return due_posts(self.approved_folder)
 
     def extract_post_content(self, filepath: Path):
         """Extract post content from markdown file"""
@@ -96,7 +99,7 @@ class SimpleLinkedInPoster:
         posts = self.find_approved_posts()
 
         if not posts:
-            print("No approved LinkedIn posts found.")
+            print("No approved LinkedIn posts due.")
             return
 
         print(f"\n📋 Found {len(posts)} approved post(s)\n")
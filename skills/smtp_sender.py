@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+SMTP Sender - Sends approved email replies over SMTP
+Uses the Email MCP server's settings (EMAIL_FROM, SMTP_HOST, SMTP_PORT,
+SMTP_USER, SMTP_PASSWORD from the environment or mcp-servers/email/.env)
+and keeps a small pool of authenticated STARTTLS connections open for the
+whole batch instead of connecting per email
+"""
+
+import os
+import re
+import ssl
+import sys
+import time
+import queue
+import smtplib
+import argparse
+import threading
+import contextlib
+from pathlib import Path
+from email.utils import make_msgid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent))
+from send_queue import SendError, UnconfirmedSend, idempotency_key
+from gmail_api_sender import build_message
+
+
+ENV_FILE = Path(__file__).parent.parent / 'mcp-servers' / 'email' / '.env'
+SETTING_KEYS = ('EMAIL_FROM', 'SMTP_HOST', 'SMTP_PORT', 'SMTP_USER', 'SMTP_PASSWORD', 'SMTP_STARTTLS')
+
+DEFAULT_POOL_SIZE = 2
+CONNECT_TIMEOUT = 30
+
+# Servers drop idle connections (often after a minute or so); a pooled
+# connection idle longer than this is checked with NOOP before it is used
+MAX_IDLE_SECONDS = 30
+
+
+def load_settings(env_file: Path = ENV_FILE) -> dict:
+    """SMTP settings from the .env file, overridden by the environment"""
+    settings = {}
+    try:
+        lines = Path(env_file).read_text(encoding='utf-8').splitlines()
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        key = key.strip()
+        if key.startswith('export '):
+            key = key[len('export '):].strip()
+        if key in SETTING_KEYS:
+            settings[key] = value.strip().strip('"\'')
+    settings.update({key: os.environ[key] for key in SETTING_KEYS if key in os.environ})
+    return settings
+
+
+def _dot_stuff(data: bytes) -> bytes:
+    """CRLF line endings and leading dots doubled, ready for DATA"""
+    data = re.sub(rb'\r\n|\n|\r', b'\r\n', data)
+    data = re.sub(rb'(?m)^\.', b'..', data)
+    return data if data.endswith(b'\r\n') else data + b'\r\n'
+
+
+class StaleConnection(smtplib.SMTPServerDisconnected):
+    """The server had closed the connection before the message was started"""
+
+
+def _transaction(smtp: smtplib.SMTP, sender: str, recipients: list, data: bytes) -> dict:
+    """
+    One MAIL/RCPT/DATA transaction on an open connection.
+
+    With PIPELINING (RFC 2920) the MAIL, RCPT and DATA commands go out in
+    one write and their replies are read together, saving two round trips
+    per message. Returns refused recipients like smtplib.sendmail().
+    Raises StaleConnection when the server had already hung up, and
+    UnconfirmedSend when the final reply is lost after the end-of-data
+    marker went out (the server may have accepted the message).
+    """
+    pipelining = smtp.has_extn('pipelining')
+    try:
+        if pipelining:
+            smtp.send(''.join([f'MAIL FROM:<{sender}>\r\n'] +
+                              [f'RCPT TO:<{rcpt}>\r\n' for rcpt in recipients] + ['DATA\r\n']))
+            mail_reply = smtp.getreply()
+        else:
+            mail_reply = smtp.mail(sender)
+    except smtplib.SMTPServerDisconnected as e:
+        raise StaleConnection(str(e)) from e
+    if mail_reply[0] == 421:
+        # "Service closing": the server timed the idle connection out
+        raise StaleConnection(mail_reply[1].decode('utf-8', errors='replace'))
+
+    if pipelining:
+        rcpt_replies = [smtp.getreply() for _ in recipients]
+        data_reply = smtp.getreply()
+    else:
+        rcpt_replies = [smtp.rcpt(rcpt) for rcpt in recipients] if mail_reply[0] == 250 else []
+        data_reply = None
+
+    refused = {rcpt: reply for rcpt, reply in zip(recipients, rcpt_replies) if reply[0] not in (250, 251)}
+    accepted = mail_reply[0] == 250 and len(refused) < len(recipients)
+    if data_reply and data_reply[0] == 354 and not accepted:
+        # Nonconforming server took DATA without a valid envelope: end it empty
+        smtp.send(b'.\r\n')
+        smtp.getreply()
+    if mail_reply[0] != 250:
+        smtp.rset()
+        raise smtplib.SMTPSenderRefused(mail_reply[0], mail_reply[1], sender)
+    if not accepted:
+        smtp.rset()
+        raise smtplib.SMTPRecipientsRefused(refused)
+
+    if not pipelining:
+        data_reply = smtp.docmd('data')
+    if data_reply[0] != 354:
+        smtp.rset()
+        raise smtplib.SMTPDataError(*data_reply)
+    smtp.send(_dot_stuff(data) + b'.\r\n')
+    try:
+        code, response = smtp.getreply()
+    except (smtplib.SMTPException, OSError) as e:
+        raise UnconfirmedSend(f"SMTP connection failed after the message was sent ({e}); "
+                              f"the server may have accepted it") from e
+    if code != 250:
+        raise smtplib.SMTPDataError(code, response)
+    return refused
+
+
+class SmtpPool:
+    """
+    Up to `size` open SMTP connections, each EHLO'd, STARTTLS'd and logged in once.
+
+    acquire() hands out an idle connection (checking it with NOOP when it
+    sat idle past max_idle) or opens a new one; release() returns it for
+    the next message. Thread-safe, so a batch can be sent over several
+    connections at once.
+    """
+
+    def __init__(self, host: str, port: int = 587, user: str = None, password: str = None,
+                 starttls: bool = True, size: int = DEFAULT_POOL_SIZE,
+                 max_idle: float = MAX_IDLE_SECONDS, timeout: float = CONNECT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.size = max(1, size)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.connects = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                if not smtp.has_extn('starttls'):
+                    # Never send the password (or mail) in the clear
+                    raise SendError(f"{self.host}:{self.port} does not offer STARTTLS")
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            if self.user:
+                smtp.login(self.user, self.password or '')
+        except BaseException:
+            self._close(smtp)
+            raise
+        with self._lock:
+            self.connects += 1
+        return smtp
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP):
+        with contextlib.suppress(smtplib.SMTPException, OSError):
+            smtp.quit()
+        smtp.close()
+
+    @staticmethod
+    def _alive(smtp: smtplib.SMTP) -> bool:
+        try:
+            return smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def acquire(self) -> smtplib.SMTP:
+        self._slots.acquire()
+        try:
+            try:
+                smtp, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used > self.max_idle and not self._alive(smtp):
+                self._close(smtp)
+                return self._connect()
+            return smtp
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, smtp: smtplib.SMTP):
+        """Return a healthy connection for reuse"""
+        self._idle.put((smtp, time.monotonic()))
+        self._slots.release()
+
+    def discard(self, smtp: smtplib.SMTP):
+        """Drop a broken connection; the next acquire() opens a fresh one"""
+        self._close(smtp)
+        self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                smtp, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(smtp)
+
+
+class SmtpSender:
+    """
+    Send backend for the approved-reply pipeline (GmailReplyHandler).
+
+    Each reply's message is built once (From, Message-ID and the draft's
+    threading headers) and kept until it is delivered, so a retry sends
+    the identical message.
+    """
+
+    name = 'smtp'
+
+    def __init__(self, settings: dict = None, pool_size: int = DEFAULT_POOL_SIZE):
+        settings = load_settings() if settings is None else settings
+        self.sender = settings.get('EMAIL_FROM') or settings.get('SMTP_USER')
+        if not settings.get('SMTP_HOST') or not self.sender:
+            raise ValueError("SMTP_HOST and EMAIL_FROM must be set (environment or mcp-servers/email/.env)")
+        self.pool = SmtpPool(settings['SMTP_HOST'], int(settings.get('SMTP_PORT', 587)),
+                             user=settings.get('SMTP_USER'), password=settings.get('SMTP_PASSWORD'),
+                             starttls=settings.get('SMTP_STARTTLS', 'true').lower() not in ('0', 'false', 'no'),
+                             size=pool_size)
+        self.messages = {}
+
+    def connect(self):
+        """Open (and pool) the first connection, so bad settings fail before the batch"""
+        try:
+            self.pool.release(self.pool.acquire())
+        except (smtplib.SMTPException, OSError) as e:
+            raise SendError(f"SMTP connection to {self.pool.host}:{self.pool.port} failed: {e}") from e
+
+    def message_bytes(self, email_data: dict) -> bytes:
+        message = build_message(email_data)
+        message['From'] = self.sender
+        message['Message-ID'] = make_msgid(domain=self.sender.rsplit('@', 1)[-1])
+        return message.as_bytes()
+
+    def send(self, email_data: dict) -> bool:
+        """
+        Send one reply.
+
+        Returns: True when the server accepted it, False when it was refused
+                 (bad recipient, rejected content; not worth retrying)
+        Raises: SendError on connection errors and temporary (4xx) failures;
+                UnconfirmedSend when the connection failed after the whole
+                message was sent
+        """
+        key = idempotency_key(email_data)
+        if key not in self.messages:
+            self.messages[key] = self.message_bytes(email_data)
+
+        for attempt in range(2):
+            try:
+                smtp = self.pool.acquire()
+            except (smtplib.SMTPException, OSError) as e:
+                raise SendError(f"SMTP connection failed: {e}") from e
+            try:
+                _transaction(smtp, self.sender, [email_data['to']], self.messages[key])
+            except StaleConnection as e:
+                # Closed while idle, before this message started: reconnect once
+                self.pool.discard(smtp)
+                if attempt:
+                    raise SendError(f"SMTP server keeps closing the connection: {e}") from e
+                continue
+            except UnconfirmedSend:
+                self.pool.discard(smtp)
+                raise
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+                self.pool.release(smtp)
+                print(f"❌ SMTP server refused the email: {e}")
+                return False
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code == 421:
+                    self.pool.discard(smtp)
+                else:
+                    self.pool.release(smtp)
+                if 400 <= e.smtp_code < 500:
+                    raise SendError(f"SMTP temporary failure {e.smtp_code}: {e.smtp_error!r}") from e
+                print(f"❌ SMTP server rejected the email ({e.smtp_code}): {e.smtp_error!r}")
+                return False
+            except (smtplib.SMTPException, OSError) as e:
+                self.pool.discard(smtp)
+                raise SendError(f"SMTP send failed: {e}") from e
+
+            self.pool.release(smtp)
+            self.messages.pop(key, None)
+            print(f"✅ Sent via SMTP ({self.pool.host}) to {email_data['to']}")
+            return True
+
+    def send_many(self, batch: list) -> list:
+        """Send several replies over all pooled connections at once; results in order"""
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            return list(executor.map(self._send_quietly, batch))
+
+    def _send_quietly(self, email_data: dict):
+        try:
+            return self.send(email_data)
+        except (SendError, UnconfirmedSend) as e:
+            return e
+
+    def close(self):
+        self.pool.close()
+
+
+def main():
+    """Check the SMTP settings by opening one pooled connection"""
+    parser = argparse.ArgumentParser(description='Check the SMTP send settings')
+    parser.add_argument('--env-file', default=str(ENV_FILE), help='Settings file (default: mcp-servers/email/.env)')
+    args = parser.parse_args()
+
+    try:
+        sender = SmtpSender(load_settings(Path(args.env_file)))
+        sender.connect()
+    except (ValueError, SendError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    sender.close()
+    print(f"✅ SMTP login to {sender.pool.host}:{sender.pool.port} works (sending as {sender.sender})")
+    print("   Send approved replies with: python3 skills/gmail_reply_handler.py --backend smtp")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Text Features - Tokenizing and feature hashing shared by the text models
+Words (and word pairs) are hashed with crc32 into a fixed number of
+columns, so vectors need no vocabulary and stay stable across runs
+"""
+
+import re
+import zlib
+
+# NumPy is optional: only the vectorized models need it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+DEFAULT_DIM = 1024
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9'@._-]*[a-z0-9]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i if in is it its me my of on
+or our so that the this to was we were will with you your re fw fwd
+""".split())
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens without stopwords"""
+    return [t for t in TOKEN.findall((text or '').lower()) if t not in STOPWORDS]
+
+
+def feature_index(token: str, dim: int = DEFAULT_DIM) -> int:
+    """Stable column for a token (crc32, unlike hash(), is the same in every process)"""
+    return zlib.crc32(token.encode('utf-8')) % dim
+
+
+def hashed_counts(tokens: list, dim: int = DEFAULT_DIM, bigrams: bool = True,
+                  prefix: str = '') -> dict:
+    """
+    Sparse hashed term counts {column: count}.
+
+    Args:
+        tokens: Output of tokenize()
+        dim: Number of hash columns
+        bigrams: Also count adjacent word pairs
+        prefix: Namespace for the tokens (e.g. 'from:'), so the same word
+                in different fields lands in different columns
+    """
+    counts = {}
+    for token in tokens:
+        column = feature_index(prefix + token, dim)
+        counts[column] = counts.get(column, 0) + 1
+    if bigrams:
+        for first, second in zip(tokens, tokens[1:]):
+            column = feature_index(f"{prefix}{first} {second}", dim)
+            counts[column] = counts.get(column, 0) + 1
+    return counts
+
+
+def count_matrix(rows: list, dim: int = DEFAULT_DIM):
+    """Dense float32 matrix from a list of hashed_counts() dicts"""
+    matrix = np.zeros((len(rows), dim), dtype=np.float32)
+    for i, counts in enumerate(rows):
+        if counts:
+            columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            matrix[i, columns] = values
+    return matrix
+
+
+def section_text(content: str, heading: str) -> str:
+    """Text of a markdown `## heading` section, up to the next `##` heading"""
+    lines = []
+    in_section = False
+    for line in content.split('\n'):
+        if line.startswith('## '):
+            if in_section:
+                break
+            in_section = line[3:].strip().lower() == heading.lower()
+            continue
+        if in_section:
+            lines.append(line)
+    return '\n'.join(lines).strip()
@@ -0,0 +1,167 @@
+"""
+Vault Events - Change feed for vault folders
+Uses watchdog (inotify/FSEvents) when installed, otherwise polls with os.scandir
+"""
+
+import os
+import time
+import queue
+import threading
+from pathlib import Path
+
+# Try to import watchdog, fall back to polling if not available
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+if WATCHDOG_AVAILABLE:
+    class _QueueHandler(FileSystemEventHandler):
+        """Forwards watchdog events for files into a queue"""
+
+        def __init__(self, events: queue.Queue):
+            self.events = events
+
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            self.events.put(Path(event.src_path))
+            dest_path = getattr(event, 'dest_path', None)
+            if dest_path:
+                self.events.put(Path(dest_path))
+
+
+class VaultChangeFeed:
+    """
+    Feed of changed files in one or more vault folders.
+
+    Changes are delivered in debounced batches: after the first event the
+    feed keeps collecting until the folders have been quiet for `debounce`
+    seconds, or `max_delay` seconds have passed since the first event.
+    """
+
+    def __init__(self, folders: list, poll_interval: float = 0.5,
+                 full_scan_interval: float = 30.0):
+        self.folders = [Path(f) for f in folders]
+        self.poll_interval = poll_interval
+        self.full_scan_interval = full_scan_interval
+        self.events = queue.Queue()
+        self._stop = threading.Event()
+        self._observer = None
+        self._poller = None
+        self.mode = 'watchdog' if WATCHDOG_AVAILABLE else 'polling'
+
+    def start(self):
+        """Start watching the folders"""
+        for folder in self.folders:
+            folder.mkdir(parents=True, exist_ok=True)
+
+        if WATCHDOG_AVAILABLE:
+            self._observer = Observer()
+            handler = _QueueHandler(self.events)
+            for folder in self.folders:
+                self._observer.schedule(handler, str(folder), recursive=False)
+            self._observer.start()
+        else:
+            self._poller = threading.Thread(target=self._poll, daemon=True)
+            self._poller.start()
+        return self
+
+    def stop(self):
+        """Stop watching"""
+        self._stop.set()
+        if self._observer:
+            self._observer.stop()
+            self._observer.join()
+        if self._poller:
+            self._poller.join()
+
+    def _snapshot(self, folder: Path, old: dict = None) -> dict:
+        """
+        Map of file path -> (inode, mtime_ns, size) for one folder.
+
+        With an old snapshot, only entries that are new or were replaced
+        (different inode, which scandir gives without a stat) are stat'ed;
+        the others keep their old signature.
+        """
+        snapshot = {}
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        signature = old.get(entry.path) if old else None
+                        if signature and signature[0] == entry.inode():
+                            snapshot[entry.path] = signature
+                        elif entry.is_file():
+                            st = entry.stat()
+                            snapshot[entry.path] = (st.st_ino, st.st_mtime_ns, st.st_size)
+                    except FileNotFoundError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return snapshot
+
+    @staticmethod
+    def _folder_mtime(folder: Path):
+        try:
+            return folder.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _poll(self):
+        """
+        Polling fallback: diff folder snapshots every poll_interval.
+
+        Each tick stats only the folders themselves and rescans a folder
+        when its mtime changed (a file was created, removed or renamed
+        into it), stat'ing just the new entries. Files edited in place
+        do not touch the folder, so every full_scan_interval seconds all
+        files are stat'ed once to pick those up.
+        """
+        previous = {folder: self._snapshot(folder) for folder in self.folders}
+        folder_mtimes = {folder: self._folder_mtime(folder) for folder in self.folders}
+        last_full_scan = time.monotonic()
+        while not self._stop.wait(self.poll_interval):
+            full_scan = time.monotonic() - last_full_scan >= self.full_scan_interval
+            if full_scan:
+                last_full_scan = time.monotonic()
+            for folder in self.folders:
+                mtime = self._folder_mtime(folder)
+                if mtime == folder_mtimes[folder] and not full_scan:
+                    continue
+                # Directory mtimes can be coarse: keep rescanning a folder
+                # that changed within the last second so a file created in
+                # the same timestamp tick as this scan is not missed
+                recent = mtime is not None and time.time_ns() - mtime < 1_000_000_000
+                folder_mtimes[folder] = None if recent else mtime
+                old = previous[folder]
+                current = self._snapshot(folder, None if full_scan else old)
+                for path, signature in current.items():
+                    if old.get(path) != signature:
+                        self.events.put(Path(path))
+                for path in old.keys() - current.keys():
+                    self.events.put(Path(path))
+                previous[folder] = current
+
+    def batches(self, debounce: float = 0.5, max_delay: float = 2.0):
+        """Yield debounced sets of changed paths until stop() is called"""
+        while not self._stop.is_set():
+            try:
+                first = self.events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = {first}
+            started = time.monotonic()
+            while True:
+                remaining = max_delay - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                try:
+                    batch.add(self.events.get(timeout=min(debounce, remaining)))
+                except queue.Empty:
+                    break
+            yield batch
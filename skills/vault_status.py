@@ -0,0 +1,292 @@
+"""
+Vault Status - Folder counts and pending items for the AI Employee vault
+Folders are scanned with os.scandir (no Path lists, no stat calls) and the
+result can be kept current from file events instead of rescanning. A cached
+snapshot with per-type counts serves machine-readable polling
+"""
+
+import os
+import json
+import time
+import heapq
+from pathlib import Path
+from datetime import datetime
+
+
+STATUS_FOLDERS = ['Inbox', 'Needs_Action', 'Done', 'Plans', 'Pending_Approval',
+                  'Approved', 'Rejected', 'Logs']
+
+# Lifecycle status of the items in each folder
+FOLDER_STATUS = {
+    'Inbox': 'incoming',
+    'Needs_Action': 'pending',
+    'Pending_Approval': 'awaiting_approval',
+    'Approved': 'approved',
+    'Rejected': 'rejected',
+    'Done': 'done',
+}
+
+# Item types scripts branch on; env_lines() prints these for every folder,
+# with 0 when absent, so an emptied type resets a long-lived shell's value
+TRACKED_TYPES = ('email', 'email_reply', 'linkedin_post')
+
+# Folders whose oldest item age is tracked (the ones that should drain)
+AGED_FOLDERS = {'Inbox', 'Needs_Action', 'Pending_Approval', 'Approved'}
+
+# Directory mtimes this close to the scan time may hide a later change on
+# filesystems with coarse timestamps, so such folders are always rescanned
+MTIME_SLACK_NS = 2_000_000_000
+
+
+def scan_names(folder: Path):
+    """
+    Names of the visible entries in a folder, or None if it is missing.
+
+    Hidden entries (claim folders, temp files, state) are not vault items.
+    """
+    try:
+        with os.scandir(folder) as entries:
+            return {entry.name for entry in entries if not entry.name.startswith('.')}
+    except FileNotFoundError:
+        return None
+
+
+class VaultStatus:
+    """
+    In-memory view of the vault's folders.
+
+    Each folder is scanned once; afterwards `apply()` updates the view from
+    changed paths (e.g. a VaultChangeFeed batch), touching only those
+    entries, so a live view stays cheap on folders with 100k+ items.
+    """
+
+    def __init__(self, vault_path: Path, folders: list = None):
+        self.vault_path = Path(vault_path)
+        self.folders = folders or STATUS_FOLDERS
+        self.entries = {}
+
+    def folder_path(self, name: str) -> Path:
+        return self.vault_path / name
+
+    def scan(self, names: list = None):
+        """(Re)scan the given folders, or all of them"""
+        for name in names or self.folders:
+            self.entries[name] = scan_names(self.folder_path(name))
+        return self
+
+    def apply(self, changed_paths) -> set:
+        """
+        Update the view from changed file paths.
+
+        Returns: names of the folders whose contents changed
+        """
+        touched = set()
+        for path in changed_paths:
+            path = Path(path)
+            name = path.parent.name
+            if path.parent != self.folder_path(name) or name not in self.entries:
+                continue  # Not directly inside a tracked folder
+            if path.name.startswith('.'):
+                continue
+
+            entries = self.entries[name]
+            if entries is None:
+                # Folder appeared since the last scan
+                self.scan([name])
+                touched.add(name)
+                continue
+
+            if path.exists():
+                if path.name not in entries:
+                    entries.add(path.name)
+                    touched.add(name)
+            elif path.name in entries:
+                entries.discard(path.name)
+                touched.add(name)
+        return touched
+
+    def count(self, name: str):
+        """Number of items in a folder, or None if the folder is missing"""
+        entries = self.entries.get(name)
+        return None if entries is None else len(entries)
+
+    def pending(self, limit: int = 5) -> tuple:
+        """
+        First pending action files by name, and the total count.
+
+        Returns: (names, total)
+        """
+        entries = self.entries.get('Needs_Action') or ()
+        actions = [n for n in entries if n.endswith('.md')]
+        return heapq.nsmallest(limit, actions), len(actions)
+
+
+def item_type(name: str) -> str:
+    """
+    Item type from a vault filename prefix.
+
+    EMAIL_20260101_... -> email, EMAIL_REPLY_... -> email_reply,
+    LINKEDIN_POST_... -> linkedin_post; anything else -> other. A leading
+    timestamp (Done items are filed as 20260101_120000_EMAIL_...) is skipped.
+    """
+    tokens = name[:-3].split('_')
+    while tokens and tokens[0].isdigit():
+        tokens.pop(0)
+    parts = []
+    for part in tokens:
+        if not part.isupper() or not part.isalpha():
+            break
+        parts.append(part.lower())
+    return '_'.join(parts) if parts else 'other'
+
+
+def scan_folder_summary(folder: Path, with_age: bool = False):
+    """
+    Count a folder's items by type in one scandir pass.
+
+    Returns: dict with count (visible entries), md (action files), types
+             and oldest_mtime, or None if the folder is missing
+    """
+    summary = {'count': 0, 'md': 0, 'types': {}, 'oldest_mtime': None}
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                summary['count'] += 1
+                if not name.endswith('.md'):
+                    continue
+                summary['md'] += 1
+                kind = item_type(name)
+                summary['types'][kind] = summary['types'].get(kind, 0) + 1
+                if with_age:
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+                    if summary['oldest_mtime'] is None or mtime < summary['oldest_mtime']:
+                        summary['oldest_mtime'] = mtime
+    except FileNotFoundError:
+        return None
+    return summary
+
+
+class StatusSnapshot:
+    """
+    Cached machine-readable vault status in .state/status.json.
+
+    Each folder's summary is stored with the folder's directory mtime; on
+    refresh only folders whose mtime changed (an item was added, removed or
+    renamed) are rescanned, so polling costs one stat per folder.
+    """
+
+    def __init__(self, vault_path: Path, folders: list = None):
+        self.vault_path = Path(vault_path)
+        self.folders = folders or STATUS_FOLDERS
+        self.state_file = self.vault_path / '.state' / 'status.json'
+        self.cache = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f).get('folders', {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save(self):
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_name(f'status.{os.getpid()}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'folders': self.cache}, f)
+        os.replace(tmp_file, self.state_file)
+
+    def _fresh(self, cached: dict, mtime_ns) -> bool:
+        return (cached is not None
+                and cached.get('mtime_ns') == mtime_ns
+                and mtime_ns is not None
+                and cached['scanned_at_ns'] - mtime_ns > MTIME_SLACK_NS)
+
+    def refresh(self) -> dict:
+        """
+        Rescan changed folders and return the status snapshot.
+
+        Returns: dict with per-folder counts, per-type counts, per-status
+                 counts and oldest-item ages
+        """
+        rescanned = 0
+        for name in self.folders:
+            folder = self.vault_path / name
+            try:
+                mtime_ns = folder.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime_ns = None
+
+            cached = self.cache.get(name)
+            if self._fresh(cached, mtime_ns) or (mtime_ns is None and cached == {'missing': True}):
+                continue
+
+            scanned_at_ns = time.time_ns()
+            summary = scan_folder_summary(folder, with_age=name in AGED_FOLDERS)
+            if summary is None:
+                self.cache[name] = {'missing': True}
+            else:
+                summary.update(mtime_ns=mtime_ns, scanned_at_ns=scanned_at_ns)
+                self.cache[name] = summary
+            rescanned += 1
+
+        if rescanned:
+            self._save()
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        """Public view of the cached folder summaries"""
+        now = time.time()
+        folders = {}
+        by_status = dict.fromkeys(FOLDER_STATUS.values(), 0)
+        for name in self.folders:
+            cached = self.cache.get(name) or {'missing': True}
+            if cached.get('missing'):
+                folders[name] = {'exists': False, 'count': 0, 'md': 0, 'types': {}}
+                continue
+
+            info = {'exists': True, 'count': cached['count'], 'md': cached['md'],
+                    'types': cached['types']}
+            if name in AGED_FOLDERS:
+                oldest = cached['oldest_mtime']
+                info['oldest_age_seconds'] = round(now - oldest, 1) if oldest else None
+            folders[name] = info
+
+            status = FOLDER_STATUS.get(name)
+            if status:
+                # Inbox holds raw drops of any type; elsewhere items are .md files
+                by_status[status] += cached['count'] if name == 'Inbox' else cached['md']
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'vault': str(self.vault_path.absolute()),
+            'folders': folders,
+            'by_status': by_status,
+        }
+
+
+def env_lines(snapshot: dict) -> list:
+    """
+    Shell assignments for a snapshot, for `eval` in scripts.
+
+    VAULT_<FOLDER>=<.md items>, VAULT_<FOLDER>_FILES=<all entries>,
+    VAULT_<FOLDER>_<TYPE>=<count> (always for TRACKED_TYPES, otherwise
+    when present) and VAULT_<FOLDER>_OLDEST_AGE=<seconds> (when tracked
+    and non-empty)
+    """
+    lines = []
+    for name, info in snapshot['folders'].items():
+        key = f"VAULT_{name.upper()}"
+        lines.append(f"{key}={info['md']}")
+        lines.append(f"{key}_FILES={info['count']}")
+        types = {**dict.fromkeys(TRACKED_TYPES, 0), **info['types']}
+        for kind, count in sorted(types.items()):
+            lines.append(f"{key}_{kind.upper()}={count}")
+        if info.get('oldest_age_seconds') is not None:
+            lines.append(f"{key}_OLDEST_AGE={int(info['oldest_age_seconds'])}")
+    return lines
@@ -0,0 +1,184 @@
+"""
+Work Claims - Claim/lease protocol for concurrent Needs_Action workers
+A worker claims an item by atomically renaming it into its own in-progress
+folder, so each item is handed to exactly one worker. Leases of crashed
+workers are detected and their items returned to the queue.
+"""
+
+import os
+import json
+import time
+import socket
+from pathlib import Path
+
+
+CLAIMS_FOLDER = '.in_progress'
+LEASE_FILE = 'lease.json'
+RECLAIM_PREFIX = '.reclaim_'
+DEFAULT_LEASE_SECONDS = 600
+
+
+def pid_alive(pid: int) -> bool:
+    """True if a process with this pid exists on this host"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class ClaimManager:
+    """
+    Per-worker claim folder under Needs_Action/.in_progress/<worker_id>.
+
+    The folder holds a lease file (host, pid, expiry) that the worker renews
+    as it makes progress. On the same host the owning process decides:
+    the folder is reclaimed as soon as it is gone and never while it runs,
+    however long one item takes. Workers on other hosts go by the expiry.
+    """
+
+    def __init__(self, queue_folder: Path, worker_id: str = None,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        self.queue_folder = Path(queue_folder)
+        self.root = self.queue_folder / CLAIMS_FOLDER
+        self.hostname = socket.gethostname()
+        self.worker_id = worker_id or f"{self.hostname}_{os.getpid()}"
+        self.claim_dir = self.root / self.worker_id
+        self.lease_seconds = lease_seconds
+
+    def acquire(self):
+        """Create this worker's claim folder and lease"""
+        self.claim_dir.mkdir(parents=True, exist_ok=True)
+        self.renew()
+        return self
+
+    def renew(self):
+        """Extend the lease (heartbeat)"""
+        self._write_lease(self.claim_dir)
+
+    def _write_lease(self, claim_dir: Path, **extra):
+        lease = {
+            'host': self.hostname,
+            'pid': os.getpid(),
+            'expires': time.time() + self.lease_seconds,
+            **extra,
+        }
+        tmp_file = claim_dir / f'{LEASE_FILE}.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(lease, f)
+        os.replace(tmp_file, claim_dir / LEASE_FILE)
+
+    def claim(self, path: Path):
+        """
+        Claim an item by renaming it into the claim folder.
+
+        Returns: the claimed path, or None if another worker got it first
+        """
+        claimed = self.claim_dir / path.name
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        return claimed
+
+    def claimed(self) -> list:
+        """Items currently held in this worker's claim folder"""
+        return sorted(p for p in self.claim_dir.glob('*.md'))
+
+    def release(self, recover=None):
+        """Return any unfinished items to the queue and drop the lease"""
+        self.reclaim_folder(self.claim_dir, recover)
+
+    def _lease_expired(self, claim_dir: Path) -> bool:
+        try:
+            with open(claim_dir / LEASE_FILE, 'r') as f:
+                lease = json.load(f)
+        except FileNotFoundError:
+            if claim_dir.name.startswith(RECLAIM_PREFIX):
+                return False  # Reclaimed; only items left for review remain
+            # Lease not written yet (worker starting) or lost: fall back to age
+            try:
+                return time.time() - claim_dir.stat().st_mtime > self.lease_seconds
+            except FileNotFoundError:
+                return False
+        except (ValueError, OSError):
+            return True
+
+        if lease.get('host') == self.hostname:
+            return not pid_alive(lease.get('pid', -1))
+        return lease.get('expires', 0) < time.time()
+
+    def _origin(self, claim_dir: Path) -> str:
+        """Worker folder name a claim folder started as (before any reclaim renames)"""
+        if not claim_dir.name.startswith(RECLAIM_PREFIX):
+            return claim_dir.name
+        try:
+            with open(claim_dir / LEASE_FILE, 'r') as f:
+                return json.load(f)['claim']
+        except (OSError, ValueError, KeyError):
+            return claim_dir.name[len(RECLAIM_PREFIX):]
+
+    def _return_items(self, claim_dir: Path) -> int:
+        """Move claimed items from a claim folder back into the queue"""
+        returned = 0
+        for item in claim_dir.glob('*.md'):
+            target = self.queue_folder / item.name
+            if target.exists():
+                continue
+            os.replace(item, target)
+            returned += 1
+        return returned
+
+    def reclaim_expired(self, recover=None) -> int:
+        """
+        Return items held by crashed or expired workers to the queue.
+
+        The stale folder is first renamed to a name unique to this worker,
+        so only one reclaimer ever handles it, and gets this worker's lease.
+        A reclaim that died partway is resumed the same way; a reclaimed
+        folder left holding items for review (no lease) is skipped.
+
+        Args:
+            recover: Optional callback(claim_dir) run before items are
+                     returned, e.g. to finish a half-done batch from a journal
+
+        Returns: number of items returned to the queue
+        """
+        if not self.root.exists():
+            return 0
+
+        returned = 0
+        for claim_dir in self.root.iterdir():
+            if claim_dir == self.claim_dir or not claim_dir.is_dir():
+                continue
+            if not self._lease_expired(claim_dir):
+                continue
+
+            origin = self._origin(claim_dir)
+            reclaiming = self.root / f'{RECLAIM_PREFIX}{self.worker_id}_{origin}'
+            try:
+                os.rename(claim_dir, reclaiming)
+            except OSError:
+                continue  # Another worker is reclaiming it
+            self._write_lease(reclaiming, claim=origin)
+
+            returned += self.reclaim_folder(reclaiming, recover)
+        return returned
+
+    def reclaim_folder(self, claim_dir: Path, recover=None) -> int:
+        """Return a stale claim folder's items to the queue and remove it"""
+        if recover:
+            recover(claim_dir)
+        returned = self._return_items(claim_dir)
+        for leftover in claim_dir.iterdir():
+            if leftover.suffix != '.md':
+                leftover.unlink()
+        try:
+            claim_dir.rmdir()
+        except OSError:
+            pass  # Items whose name is already back in the queue stay for review
+        return returned
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Work Queue - Priority/SLA-aware ordering of vault action items
+Builds a priority queue from each item's `priority` and received/detected
+timestamps so every processing stage takes urgent work first
+"""
+
+import sys
+import heapq
+from pathlib import Path
+from datetime import datetime, timedelta
+
+
+# Response SLAs from the plan urgency rules (High: immediately,
+# Medium: within 24 hours, Low: within 48 hours). "Immediately" is tracked
+# as within the hour (urgent: 15 minutes) so overdue counts stay meaningful.
+PRIORITY_RANK = {'urgent': 0, 'high': 1, 'medium': 2, 'normal': 2, 'low': 3}
+SLA_HOURS = {'urgent': 0.25, 'high': 1, 'medium': 24, 'normal': 24, 'low': 48}
+DEFAULT_PRIORITY = 'medium'
+
+# Frontmatter fields that record when an item entered the vault, by watcher
+TIMESTAMP_FIELDS = ('received', 'detected', 'created')
+
+
+def read_frontmatter(filepath: Path) -> dict:
+    """Read only the frontmatter block of a markdown file"""
+    frontmatter = {}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        if f.readline().strip() != '---':
+            return frontmatter
+        for line in f:
+            if line.strip() == '---':
+                break
+            if ':' in line:
+                key, value = line.split(':', 1)
+                frontmatter[key.strip()] = value.strip()
+    return frontmatter
+
+
+def parse_timestamp(value: str):
+    """Parse an ISO timestamp from frontmatter, or None"""
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+class WorkQueue:
+    """
+    Priority queue of action files.
+
+    Items are ordered by priority class first, then by SLA deadline
+    (arrival time + SLA for the class), then by filename. A high-priority
+    item therefore never waits behind low-priority ones, and within a
+    class the oldest item comes first.
+    """
+
+    def __init__(self, paths: list = None):
+        self._heap = []
+        self.taken = []
+        if paths:
+            for path in paths:
+                self.push(path)
+
+    @classmethod
+    def from_folder(cls, folder: Path, pattern: str = '*.md') -> 'WorkQueue':
+        """Build a queue from every file in a folder matching pattern"""
+        folder = Path(folder)
+        if not folder.exists():
+            return cls()
+        return cls(folder.glob(pattern))
+
+    def push(self, path: Path):
+        """Add an action file to the queue"""
+        path = Path(path)
+        try:
+            mtime = datetime.fromtimestamp(path.stat().st_mtime)
+            metadata = read_frontmatter(path)
+        except FileNotFoundError:
+            return
+        except UnicodeDecodeError:
+            metadata = {}
+
+        priority = metadata.get('priority', DEFAULT_PRIORITY).lower()
+        if priority not in PRIORITY_RANK:
+            priority = DEFAULT_PRIORITY
+
+        arrived = None
+        for field in TIMESTAMP_FIELDS:
+            arrived = parse_timestamp(metadata.get(field))
+            if arrived:
+                break
+        arrived = arrived or mtime
+
+        item = {
+            'path': path,
+            'priority': priority,
+            'arrived': arrived,
+            'deadline': arrived + timedelta(hours=SLA_HOURS[priority]),
+        }
+        heapq.heappush(self._heap, (PRIORITY_RANK[priority], item['deadline'], path.name, item))
+
+    def pop(self) -> dict:
+        """Take the most urgent item, recording how long it waited"""
+        item = heapq.heappop(self._heap)[-1]
+        item['wait'] = (datetime.now() - item['arrived']).total_seconds()
+        self.taken.append(item)
+        return item
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        """Drain the queue in priority order, yielding file paths"""
+        while self._heap:
+            yield self.pop()['path']
+
+    def pending(self) -> list:
+        """Queued items in priority order, without removing them"""
+        return [entry[-1] for entry in sorted(self._heap)]
+
+    def wait_report(self, items: list = None) -> dict:
+        """
+        Per-priority queue wait statistics.
+
+        Args:
+            items: Items to report on (default: items taken so far, or the
+                   pending items if nothing has been taken)
+
+        Returns: {priority: {count, avg_wait, max_wait, overdue}} with waits in seconds
+        """
+        now = datetime.now()
+        if items is None:
+            items = self.taken or self.pending()
+
+        report = {}
+        for item in items:
+            wait = item.get('wait', (now - item['arrived']).total_seconds())
+            stats = report.setdefault(item['priority'], {
+                'count': 0, 'avg_wait': 0.0, 'max_wait': 0.0, 'overdue': 0
+            })
+            stats['count'] += 1
+            stats['avg_wait'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
+            if item['arrived'] + timedelta(seconds=wait) > item['deadline']:
+                stats['overdue'] += 1
+
+        for stats in report.values():
+            stats['avg_wait'] /= stats['count']
+
+        return dict(sorted(report.items(), key=lambda kv: PRIORITY_RANK[kv[0]]))
+
+
+def format_wait(seconds: float) -> str:
+    """Human-readable wait time"""
+    if seconds < 120:
+        return f"{seconds:.0f}s"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def print_wait_report(report: dict):
+    """Print per-priority queue wait times"""
+    if not report:
+        return
+    print("Queue wait by priority:")
+    for priority, stats in report.items():
+        print(f"  {priority:8} {stats['count']:5} item(s)  "
+              f"avg {format_wait(stats['avg_wait']):>6}  max {format_wait(stats['max_wait']):>6}  "
+              f"overdue {stats['overdue']}")
+
+
+if __name__ == '__main__':
+    vault_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent.parent / 'AI_Employee_Vault'
+    queue = WorkQueue.from_folder(vault_path / 'Needs_Action')
+    print(f"Needs_Action queue: {len(queue)} item(s)\n")
+    for item in queue.pending()[:10]:
+        print(f"  [{item['priority']:6}] due {item['deadline'].strftime('%Y-%m-%d %H:%M')}  {item['path'].name}")
+    if len(queue) > 10:
+        print(f"  ... and {len(queue) - 10} more")
+    print()
+    print_wait_report(queue.wait_report())
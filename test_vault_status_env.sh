@@ -0,0 +1,76 @@
+#!/bin/bash
+# Vault Status --env Test - Per-type counts drop back to 0 in a long-lived shell,
+# and Done items (timestamp-prefixed names) are counted by type
+# Mirrors how orchestrator.sh loads the status each iteration
+
+cd "$(dirname "$0")"
+PYTHON=./venv/bin/python3
+[ -x "$PYTHON" ] || PYTHON=python3
+
+VAULT=$(mktemp -d)
+trap 'rm -rf "$VAULT"' EXIT
+mkdir -p "$VAULT/Needs_Action" "$VAULT/Approved" "$VAULT/Done"
+
+# Same as orchestrator.sh
+load_vault_status() {
+    unset $(compgen -v VAULT_)
+    eval "$($PYTHON skills/read_vault_status.py "$VAULT" --env)"
+}
+
+FAILED=0
+check() {
+    local name=$1 expected=$2
+    local actual=${!name}
+    if [ "$actual" = "$expected" ]; then
+        echo "✅ $name=$actual"
+    else
+        echo "❌ $name=${actual:-<unset>} (expected $expected)"
+        FAILED=1
+    fi
+}
+
+echo "Step 1: One email in Needs_Action, one post and one reply in Approved"
+touch "$VAULT/Needs_Action/EMAIL_20260101_120000_a.md"
+touch "$VAULT/Approved/LINKEDIN_POST_20260101_120000_a.md"
+touch "$VAULT/Approved/EMAIL_REPLY_20260101_120000_a.md"
+load_vault_status
+check VAULT_NEEDS_ACTION_EMAIL 1
+check VAULT_APPROVED_LINKEDIN_POST 1
+check VAULT_APPROVED_EMAIL_REPLY 1
+
+echo ""
+echo "Step 2: Email drafted, post published; only the reply is left"
+# The snapshot rescans a folder only once its mtime is past the slack window
+sleep 3
+rm "$VAULT/Needs_Action/EMAIL_20260101_120000_a.md"
+rm "$VAULT/Approved/LINKEDIN_POST_20260101_120000_a.md"
+load_vault_status
+check VAULT_NEEDS_ACTION 0
+check VAULT_NEEDS_ACTION_EMAIL 0
+check VAULT_APPROVED_LINKEDIN_POST 0
+check VAULT_APPROVED_EMAIL_REPLY 1
+
+echo ""
+echo "Step 3: Reply sent; Approved is empty"
+rm "$VAULT/Approved/EMAIL_REPLY_20260101_120000_a.md"
+load_vault_status
+check VAULT_APPROVED 0
+check VAULT_APPROVED_EMAIL_REPLY 0
+check VAULT_APPROVED_OLDEST_AGE ""
+
+echo ""
+echo "Step 4: Done items are filed under a timestamp prefix"
+touch "$VAULT/Done/20260101_120500_EMAIL_20260101_120000_a.md"
+touch "$VAULT/Done/20260101_120500_LINKEDIN_POST_20260101_120000_a.md"
+load_vault_status
+check VAULT_DONE_EMAIL 1
+check VAULT_DONE_LINKEDIN_POST 1
+check VAULT_DONE_OTHER ""
+
+echo ""
+if [ $FAILED -eq 0 ]; then
+    echo "✅ All checks passed"
+else
+    echo "❌ Some checks failed"
+fi
+exit $FAILED
@@ -53,6 +53,22 @@ class BaseWatcher(ABC):
         """
         pass
 
+    def process_items(self, items: list) -> list:
+        """
+        Create action files for a batch of new items.
+        Watchers that can handle a batch at once (e.g. to score it) override this.
+        Returns: List of created file paths
+        """
+        created = []
+        for item in items:
+            try:
+                filepath = self.create_action_file(item)
+                self.logger.info(f'Created action file: {filepath.name}')
+                created.append(filepath)
+            except Exception as e:
+                self.logger.error(f'Error creating action file: {e}')
+        return created
+
     def run(self):
         """Main loop - continuously check for updates"""
         self.logger.info(f'Starting {self.__class__.__name__}')
@@ -65,13 +81,7 @@ class BaseWatcher(ABC):
 
                 if items:
                     self.logger.info(f'Found {len(items)} new item(s) to process')
-
-                for item in items:
-                    try:
-                        filepath = self.create_action_file(item)
-                        self.logger.info(f'Created action file: {filepath.name}')
-                    except Exception as e:
-                        self.logger.error(f'Error creating action file: {e}')
+                    self.process_items(items)
 
             except Exception as e:
                 self.logger.error(f'Error in check loop: {e}')
@@ -6,6 +6,7 @@ Part of Silver Tier implementation
 
 import os
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
 import json
@@ -14,7 +15,12 @@ import pickle
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent / 'skills'))
 from base_watcher import BaseWatcher
+from email_triage import load_triage, RETRAIN_HOURS
+
+# Without a model, how often to check whether one can be loaded or trained now
+TRIAGE_RETRY_MINUTES = 15
 
 # Try to import Gmail API, fall back to mock if not available
 try:
@@ -135,6 +141,12 @@ class GmailWatcher(BaseWatcher):
 
         self.processed_ids = set()
 
+        # Local triage model (None until there is enough Done/Rejected history)
+        self.triage = load_triage(self.vault_path)
+        self.triage_attempted_at = time.time()
+        if self.triage is not None:
+            self.logger.info(f'Email triage model loaded ({self.triage.examples} training examples)')
+
         # Load processed IDs from state file
         self.state_file = Path(__file__).parent / '.gmail_watcher_state.json'
         self._load_state()
@@ -171,31 +183,54 @@ class GmailWatcher(BaseWatcher):
             self.logger.error(f'Error checking Gmail: {e}')
             return []
 
-    def create_action_file(self, message) -> Path:
-        """Create action file for email in Needs_Action folder"""
-        try:
-            message_id = message.get('id', 'unknown')
-            msg_details = self.service.get_message(message_id)
+    def fetch_email(self, message) -> dict:
+        """Fetch a message and extract the fields used in its action file"""
+        message_id = message.get('id', 'unknown')
+        msg_details = self.service.get_message(message_id)
+
+        # Extract headers
+        headers = {h['name']: h['value']
+                  for h in msg_details.get('payload', {}).get('headers', [])}
+
+        # Threading headers (names are case-insensitive: Message-ID / Message-Id)
+        header_map = {name.lower(): value for name, value in headers.items()}
+        references = header_map.get('references', '').split()
+        in_reply_to = header_map.get('in-reply-to', '').strip()
+        if in_reply_to and in_reply_to not in references:
+            references.append(in_reply_to)
+
+        return {
+            'message_id': message_id,
+            'from': headers.get('From', 'Unknown'),
+            'subject': headers.get('Subject', 'No Subject'),
+            'snippet': msg_details.get('snippet', 'No content available'),
+            'thread_id': msg_details.get('threadId', ''),
+            'rfc_message_id': header_map.get('message-id', ''),
+            'references': ' '.join(references),
+        }
 
-            # Extract headers
-            headers = {h['name']: h['value']
-                      for h in msg_details.get('payload', {}).get('headers', [])}
+    def write_action_file(self, email: dict, priority: str = 'high', triage_score=None) -> Path:
+        """Write the action file for a fetched email in Needs_Action folder"""
+        triage_line = f"triage_score: {triage_score}\n" if triage_score is not None else ''
 
-            # Create action file content
-            content = f"""---
+        # Create action file content
+        content = f"""---
 type: email
 source: gmail
-from: {headers.get('From', 'Unknown')}
-subject: {headers.get('Subject', 'No Subject')}
+from: {email['from']}
+subject: {email['subject']}
 received: {datetime.now().isoformat()}
-priority: high
-status: pending
-message_id: {message_id}
+priority: {priority}
+{triage_line}status: pending
+message_id: {email['message_id']}
+thread_id: {email['thread_id']}
+rfc_message_id: {email['rfc_message_id']}
+references: {email['references']}
 ---
 
 ## Email Content
 
-{msg_details.get('snippet', 'No content available')}
+{email['snippet']}
 
 ## Suggested Actions
 
@@ -209,21 +244,69 @@ message_id: {message_id}
 This email was flagged as important. Review and take appropriate action.
 """
 
-            # Create unique filename
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            safe_subject = ''.join(c for c in headers.get('Subject', 'email')[:30]
-                                  if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
-            filename = f'EMAIL_{timestamp}_{safe_subject}.md'
-            filepath = self.needs_action / filename
+        # Create unique filename
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        safe_subject = ''.join(c for c in email['subject'][:30]
+                              if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+        filename = f'EMAIL_{timestamp}_{safe_subject}.md'
+        filepath = self.needs_action / filename
+        if filepath.exists():
+            # Same second and subject prefix (common in a batch): keep both
+            filepath = self.needs_action / f'EMAIL_{timestamp}_{safe_subject}_{email["message_id"]}.md'
+
+        # Write file
+        filepath.write_text(content, encoding='utf-8')
+
+        # Mark as processed
+        self.processed_ids.add(email['message_id'])
+        return filepath
+
+    def triage_emails(self, emails: list) -> list:
+        """(priority, triage_score) per email; score is None without a trained model"""
+        # Retrain a stale model; without one, pick up a model trained (or enough
+        # history gathered) since the watcher started. Attempts are rate-limited
+        now = time.time()
+        stale = self.triage is None or now - self.triage.trained_at > RETRAIN_HOURS * 3600
+        if stale and now - self.triage_attempted_at > TRIAGE_RETRY_MINUTES * 60:
+            self.triage_attempted_at = now
+            had_model = self.triage is not None
+            self.triage = load_triage(self.vault_path)
+            if self.triage is not None and not had_model:
+                self.logger.info(f'Email triage model loaded ({self.triage.examples} training examples)')
+        if self.triage is None:
+            return [('high', None)] * len(emails)
+        return self.triage.triage([(e['from'], e['subject'], e['snippet']) for e in emails])
+
+    def process_items(self, items: list) -> list:
+        """Fetch a batch of messages, score them together and write action files"""
+        emails = []
+        for message in items:
+            try:
+                emails.append(self.fetch_email(message))
+            except Exception as e:
+                self.logger.error(f'Error fetching message {message.get("id")}: {e}')
 
-            # Write file
-            filepath.write_text(content, encoding='utf-8')
+        created = []
+        for email, (priority, score) in zip(emails, self.triage_emails(emails)):
+            try:
+                filepath = self.write_action_file(email, priority, score)
+                created.append(filepath)
+                self.logger.info(f'Created action file: {filepath.name} (priority: {priority})')
+            except Exception as e:
+                self.logger.error(f'Error creating action file: {e}')
 
-            # Mark as processed
-            self.processed_ids.add(message_id)
+        self._save_state()
+        return created
+
+    def create_action_file(self, message) -> Path:
+        """Create action file for email in Needs_Action folder"""
+        try:
+            email = self.fetch_email(message)
+            priority, score = self.triage_emails([email])[0]
+            filepath = self.write_action_file(email, priority, score)
             self._save_state()
 
-            self.logger.info(f'Created action file: {filename}')
+            self.logger.info(f'Created action file: {filepath.name}')
             return filepath
 
         except Exception as e: